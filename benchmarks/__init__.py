@@ -0,0 +1,4 @@
+__all__ = [
+    "columnar_scan",
+    "customer_memory"
+]
@@ -0,0 +1,36 @@
+import argparse
+import time
+
+from benchmarks.customer_memory import customer_values
+from handbook.customer_service import ColumnarStorage, Customer, InMemoryStorage
+
+
+def timed(action) -> float:
+    started = time.perf_counter()
+    action()
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description='Measures full scans of the in-memory storages')
+    arg_parser.add_argument('--count', type=int, default=1_000_000, help='number of customers')
+    args = arg_parser.parse_args()
+
+    columnar_storage = ColumnarStorage()
+    in_memory_storage = InMemoryStorage()
+    for number in range(args.count):
+        columnar_storage.insert_customer(Customer(*customer_values(number)))
+        in_memory_storage.insert_customer(Customer(*customer_values(number)))
+
+    position = customer_values(args.count // 2)[2]
+    print(f"{args.count} customers, times in ms")
+    print(f"columnar equality filter:  {timed(lambda: columnar_storage.filter_rows('position', position)):8.1f}")
+    print(f"columnar prefix filter:    {timed(lambda: columnar_storage.filter_rows('full_name', 'Full Name 9', True)):8.1f}")
+    print(f"columnar encoded prefix:   {timed(lambda: columnar_storage.filter_rows('position', 'position 9', True)):8.1f}")
+    print(f"columnar argsort 2 keys:   {timed(lambda: columnar_storage.argsort(['position', 'full_name'])):8.1f}")
+    print(f"in-memory sorted list:     "
+          f"{timed(lambda: in_memory_storage.list_of_customer(['position', 'full_name'])):8.1f}")
+
+
+if __name__ == '__main__':
+    main()
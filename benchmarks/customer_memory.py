@@ -0,0 +1,75 @@
+import argparse
+import gc
+import tracemalloc
+
+from handbook.customer_service import Customer, InMemoryStorage
+
+
+class DictCustomer:
+    """
+    Customer with a per-instance '__dict__', as 'Customer' was before '__slots__'
+    """
+    def __init__(self, customer_id: str, full_name: str, position: str, name_of_the_organization: str, email: str,
+                 phone: str) -> None:
+        self.customer_id = customer_id
+        self.full_name = full_name
+        self.position = position
+        self.name_of_the_organization = name_of_the_organization
+        self.email = email
+        self.phone = phone
+
+
+def customer_values(number: int) -> tuple:
+    return (f"{number:09d}", f"Full Name {number}", f"position {number % 100}", f"Organization {number % 1000}",
+            f"customer{number}@mail.ru", f"{79000000000 + number}")
+
+
+def measure(customer_class: type, count: int) -> tuple:
+    """
+    Creates 'count' customers with distinct values
+    :return: bytes per customer for the whole record and for the record object without its strings
+    """
+    gc.collect()
+    tracemalloc.start()
+    customers = [customer_class(*customer_values(number)) for number in range(count)]
+    total_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del customers
+
+    values = [customer_values(number) for number in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    customers = [customer_class(*value) for value in values]
+    object_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total_size / count, object_size / count
+
+
+def measure_storage(count: int) -> float:
+    """
+    :return: bytes per customer held by 'InMemoryStorage' and its indexes, without the customers themselves
+    """
+    customers = [Customer(*customer_values(number)) for number in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    storage = InMemoryStorage()
+    for customer in customers:
+        storage.insert_customer(customer)
+    storage_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return storage_size / count
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description='Measures memory used per customer')
+    arg_parser.add_argument('--count', type=int, default=1_000_000, help='number of customers')
+    args = arg_parser.parse_args()
+
+    for customer_class in (DictCustomer, Customer):
+        total, record = measure(customer_class, args.count)
+        print(f"{customer_class.__name__:>12}: {total:6.0f} bytes per customer, {record:4.0f} without strings")
+    print(f"InMemoryStorage indexes: {measure_storage(args.count):6.0f} bytes per customer")
+
+
+if __name__ == '__main__':
+    main()
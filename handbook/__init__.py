@@ -1,6 +1,11 @@
 __all__ = [
+    "async_customer_service",
+    "batch_runner",
     "command_parser",
+    "customer_import",
     "customer_service",
     "database_connection",
+    "database_migrations",
+    "server",
     "validator"
 ]
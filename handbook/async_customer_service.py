@@ -0,0 +1,372 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+import asyncpg
+
+from handbook.customer_service import CUSTOMER_ATTRIBUTES, Customer, CustomerException, page_cursor, \
+    page_sort_params, validate_sort_params
+
+
+class AsyncStorageStrategy(ABC):
+    @abstractmethod
+    async def insert_customer(self, customer: Customer) -> None:
+        pass
+
+    @abstractmethod
+    async def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        pass
+
+    @abstractmethod
+    async def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_customer(self, customer: Customer) -> None:
+        pass
+
+    @abstractmethod
+    async def list_of_customer(self, sort_params: list) -> list:
+        pass
+
+    @abstractmethod
+    def iter_customers(self, sort_params: list) -> AsyncIterator[Customer]:
+        pass
+
+    @abstractmethod
+    async def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        pass
+
+    @abstractmethod
+    async def insert_new_customer(self, customer: Customer) -> bool:
+        pass
+
+    @abstractmethod
+    async def update_customer_by_id(self, updatable_arguments: dict) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete_customer_by_id(self, customer_id: str) -> bool:
+        pass
+
+
+class AsyncDataBaseStorage(AsyncStorageStrategy):
+    def __init__(self, db_name: str, db_user: str, db_password: str, db_host: str, db_port: str,
+                 min_pool_size: int = 1, max_pool_size: int = 10, max_inactive_lifetime: float = 300.0,
+                 prefetch: int = 2000) -> None:
+        """
+        Storage of customers in the database that does not block the event loop.
+        'open' must be awaited before use, or the storage used as 'async with'
+        :param min_pool_size: number of connections opened in advance
+        :param max_pool_size: maximum number of connections, i.e. queries in flight
+        :param max_inactive_lifetime: seconds after which an idle connection is closed
+        :param prefetch: number of rows fetched at a time by 'iter_customers'
+        """
+        self.db_name = db_name
+        self.db_user = db_user
+        self.db_password = db_password
+        self.db_host = db_host
+        self.db_port = db_port
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self.max_inactive_lifetime = max_inactive_lifetime
+        self.prefetch = prefetch
+        self.pool = None
+
+    async def open(self) -> None:
+        """
+        Creates the connection pool
+        """
+        self.pool = await asyncpg.create_pool(
+            database=self.db_name,
+            user=self.db_user,
+            password=self.db_password,
+            host=self.db_host,
+            port=int(self.db_port) if self.db_port is not None else None,
+            min_size=self.min_pool_size,
+            max_size=self.max_pool_size,
+            max_inactive_connection_lifetime=self.max_inactive_lifetime
+        )
+
+    async def close(self) -> None:
+        """
+        Waits for the borrowed connections to be returned and closes the pool
+        """
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def __aenter__(self) -> "AsyncDataBaseStorage":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def insert_customer(self, customer: Customer) -> None:
+        """
+        Inserts a customer instance into the storage
+        :param customer: Customer
+        :return: None
+        """
+        query = """
+        INSERT INTO
+            customers (customer_id, full_name, position, name_of_the_organization, email, phone)
+        VALUES ($1, $2, $3, $4, $5, $6);
+        """
+        await self.pool.execute(query, *self._values(customer))
+
+    async def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Searches for a customer in the storage by argument name and value
+        and returns the result
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        validate_sort_params([argument_name])
+        query = f"""
+        SELECT *
+        FROM customers
+        WHERE
+            {argument_name} = $1
+        LIMIT 1;
+        """
+        row = await self.pool.fetchrow(query, argument_value)
+        if row is not None:
+            return Customer(*row)
+
+    async def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        """
+        Updates the customer instance in the storage
+        :param customer: Customer
+        :param updatable_arguments: dict with updatable arguments
+        :return: None
+        """
+        query = """
+        UPDATE customers
+        SET
+            full_name = $2,
+            position = $3,
+            name_of_the_organization = $4,
+            email = $5,
+            phone = $6
+        WHERE
+            customer_id = $1;
+        """
+        values = [updatable_arguments.get(attribute_name, getattr(customer, attribute_name))
+                  for attribute_name in CUSTOMER_ATTRIBUTES]
+        values[0] = customer.customer_id
+        await self.pool.execute(query, *values)
+
+    async def delete_customer(self, customer: Customer) -> None:
+        """
+        Remove the customer instance in the storage
+        :param customer: Customer
+        :return: None
+        """
+        await self.delete_customer_by_id(customer.customer_id)
+
+    async def list_of_customer(self, sort_params: list) -> list:
+        """
+        Searches for all customers in the storage
+        and returns the result
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        rows = await self.pool.fetch(self._list_query(sort_params))
+        return [Customer(*row) for row in rows]
+
+    async def iter_customers(self, sort_params: list) -> AsyncIterator[Customer]:
+        """
+        Yields all customers in the storage one by one,
+        rows are fetched 'prefetch' at a time with a server-side cursor
+        :param sort_params: list of parameters for sorting
+        :return: AsyncIterator
+        """
+        async with self.pool.acquire() as connection:
+            async with connection.transaction():
+                async for row in connection.cursor(self._list_query(sort_params), prefetch=self.prefetch):
+                    yield Customer(*row)
+
+    async def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns at most 'limit' customers ordered by the sort parameters and 'customer_id'
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the page cursor, values of 'page_sort_params' of the last customer of the previous page
+        :return: List
+        """
+        page_params = page_sort_params(sort_params)
+        columns = ", ".join(page_params)
+        values = []
+        condition = ""
+        if after is not None:
+            placeholders = ", ".join(f"${number}" for number in range(1, len(page_params) + 1))
+            condition = f"WHERE ({columns}) > ({placeholders})"
+            values.extend(after)
+        query = f"""
+        SELECT *
+        FROM customers
+        {condition}
+        ORDER BY
+            {columns}
+        LIMIT ${len(values) + 1} OFFSET ${len(values) + 2};
+        """
+        rows = await self.pool.fetch(query, *values, limit, offset)
+        return [Customer(*row) for row in rows]
+
+    async def insert_new_customer(self, customer: Customer) -> bool:
+        """
+        Inserts the customer with a single statement that skips an existing 'customer_id'
+        :param customer: Customer
+        :return: True if the customer was inserted, False if it already exists
+        """
+        query = """
+        INSERT INTO
+            customers (customer_id, full_name, position, name_of_the_organization, email, phone)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (customer_id) DO NOTHING
+        RETURNING customer_id;
+        """
+        return await self.pool.fetchval(query, *self._values(customer)) is not None
+
+    async def update_customer_by_id(self, updatable_arguments: dict) -> bool:
+        """
+        Updates the customer with a single statement that reports whether the customer exists
+        :param updatable_arguments: dict with updatable arguments and 'customer_id'
+        :return: True if the customer was updated, False if it does not exist
+        """
+        columns = [attribute_name for attribute_name in CUSTOMER_ATTRIBUTES
+                   if attribute_name != "customer_id" and attribute_name in updatable_arguments]
+        if columns:
+            assignments = ", ".join(f"{column} = ${number}" for number, column in enumerate(columns, 2))
+            query = f"""
+            UPDATE customers
+            SET
+                {assignments}
+            WHERE
+                customer_id = $1
+            RETURNING customer_id;
+            """
+        else:
+            query = """
+            SELECT customer_id
+            FROM customers
+            WHERE
+                customer_id = $1;
+            """
+        values = [updatable_arguments["customer_id"]] + [updatable_arguments[column] for column in columns]
+        return await self.pool.fetchval(query, *values) is not None
+
+    async def delete_customer_by_id(self, customer_id: str) -> bool:
+        """
+        Removes the customer with a single statement that reports whether the customer exists
+        :param customer_id: customer ID
+        :return: True if the customer was removed, False if it does not exist
+        """
+        query = """
+        DELETE
+        FROM customers
+        WHERE
+            customer_id = $1
+        RETURNING customer_id;
+        """
+        return await self.pool.fetchval(query, customer_id) is not None
+
+    @staticmethod
+    def _values(customer: Customer) -> list:
+        return [getattr(customer, attribute_name) for attribute_name in CUSTOMER_ATTRIBUTES]
+
+    @staticmethod
+    def _list_query(sort_params: list) -> str:
+        validate_sort_params(sort_params)
+        if len(sort_params) == 0:
+            return """
+            SELECT *
+            FROM customers;
+            """
+        return f"""
+            SELECT *
+            FROM customers
+            ORDER BY
+                {", ".join(sort_params)};
+            """
+
+
+class AsyncCustomerService:
+    def __init__(self, storage: AsyncStorageStrategy) -> None:
+        self._storage = storage
+
+    async def create_customer(self, customer_id: str, full_name: str, position: str, name_of_the_organization: str,
+                              email: str, phone: str) -> None:
+        """
+        Calls the 'insert_new_customer' command to insert the customer into the storage
+        Raises 'CustomerException' exception if the customer exists
+        :return: None
+        """
+        customer = Customer(customer_id, full_name, position, name_of_the_organization, email, phone)
+        if not await self._storage.insert_new_customer(customer):
+            raise CustomerException("Customer already exists")
+
+    async def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Calls the 'find_customer' command to find the customer into the storage
+        and return result
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        return await self._storage.find_customer(argument_name, argument_value)
+
+    async def update_customer(self, updatable_arguments: dict) -> None:
+        """
+        Calls the 'update_customer_by_id' command to update the customer into the storage
+        Raises 'CustomerException' exception if the customer does not exist
+        :return: None
+        """
+        if not await self._storage.update_customer_by_id(updatable_arguments):
+            raise CustomerException("Customer does not exist")
+
+    async def remove_customer(self, customer_id: str) -> None:
+        """
+        Calls the 'delete_customer_by_id' command to remove the customer from the storage
+        Raises 'CustomerException' exception if the customer does not exist
+        :param customer_id: customer ID
+        :return: None
+        """
+        if not await self._storage.delete_customer_by_id(customer_id):
+            raise CustomerException("Customer does not exist")
+
+    async def get_list_of_customers(self, sort_params: list) -> list:
+        """
+        Calls the 'list_of_customer' command to find the customer into the storage
+        and return result
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        return await self._storage.list_of_customer(sort_params)
+
+    def iter_customers(self, sort_params: list) -> AsyncIterator[Customer]:
+        """
+        Calls the 'iter_customers' command to get customers from the storage one by one
+        :param sort_params: list of parameters for sorting
+        :return: AsyncIterator
+        """
+        return self._storage.iter_customers(sort_params)
+
+    async def get_page_of_customers(self, sort_params: list, limit: int, offset: int = 0,
+                                    after: tuple = None) -> tuple:
+        """
+        Calls the 'list_page' command to get a page of customers ordered by the sort parameters and 'customer_id'
+        Raises 'CustomerException' if the page size is not positive
+        :return: tuple of the list of customers and the cursor of the next page, None if it is the last page
+        """
+        if limit < 1:
+            raise CustomerException("Page size must be positive")
+        if offset < 0:
+            raise CustomerException("Offset must not be negative")
+        customers = await self._storage.list_page(sort_params, limit, offset, after)
+        if len(customers) < limit:
+            return customers, None
+        return customers, page_cursor(customers[-1], sort_params)
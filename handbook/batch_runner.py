@@ -0,0 +1,64 @@
+import json
+from typing import TextIO
+
+from handbook.command_parser import CommandException, StopBatch
+from handbook.customer_service import CustomerService
+from handbook.validator import Validator
+
+
+def run_batch(input_file: TextIO, output_file: TextIO, customer_service: CustomerService, commands: dict,
+              validator=Validator) -> int:
+    """
+    Executes commands from JSON Lines without prompting for arguments.
+    Each line is an object with 'command', 'arguments' and an optional 'id' that is copied to the result.
+    Writes one JSON object per command with 'status' - 'ok' and 'result' or 'error' and 'error'.
+    The 'exit' command stops the batch.
+    :param input_file: file with commands
+    :param output_file: file for the results
+    :param customer_service: CustomerService
+    :param commands: dict of command classes by command name
+    :return: number of failed commands
+    """
+    failed = 0
+    for line_number, line in enumerate(input_file, 1):
+        if line.strip() == "":
+            continue
+        try:
+            response = execute_request(line, customer_service, commands, validator)
+        except StopBatch:
+            break
+        response = dict(line=line_number, **response)
+        if response["status"] == "error":
+            failed += 1
+        output_file.write(json.dumps(response, ensure_ascii=False) + "\n")
+    output_file.flush()
+    return failed
+
+
+def execute_request(line: str, customer_service: CustomerService, commands: dict, validator=Validator) -> dict:
+    """
+    Executes one JSON command
+    :param line: JSON object with 'command', 'arguments' and an optional 'id'
+    :return: dict with 'status' - 'ok' and 'result' or 'error' and 'error', and the 'id' of the request
+    Raises StopBatch for the 'exit' command.
+    """
+    response = dict()
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise CommandException("Command must be a JSON object")
+        if "id" in request:
+            response["id"] = request["id"]
+        command_name = request.get("command")
+        if command_name not in commands:
+            raise CommandException(f"Invalid command: {command_name}")
+        command = commands[command_name]()
+        response["result"] = command.execute_batch(customer_service, request.get("arguments", {}), validator)
+        response["status"] = "ok"
+    except StopBatch:
+        raise
+    except json.JSONDecodeError as e:
+        response.update(status="error", error=f"Invalid JSON: {e}")
+    except Exception as e:
+        response.update(status="error", error=str(e))
+    return response
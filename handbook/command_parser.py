@@ -1,8 +1,10 @@
+import time
 from abc import ABC, abstractmethod
 from collections import namedtuple
 
-from handbook.customer_service import CustomerService
-from handbook.validator import Validator
+from handbook.customer_import import read_customers
+from handbook.customer_service import CUSTOMER_ATTRIBUTES, Customer, CustomerService, Predicate
+from handbook.validator import ValidateException, Validator
 
 
 class Command(ABC):
@@ -10,6 +12,39 @@ class Command(ABC):
     def execute(self, customer_service: CustomerService, validator=Validator) -> None:
         pass
 
+    def execute_batch(self, customer_service: CustomerService, arguments: dict, validator=Validator):
+        """
+        Executes the command with the arguments given in advance instead of prompting for them
+        Raises CommandException if the command can not be used in batch mode.
+        :return: result of the command that can be serialized to JSON
+        """
+        raise CommandException("Command is not available in batch mode.")
+
+    @staticmethod
+    def validate_batch_arguments(arguments: dict, validator, required_arguments: list,
+                                 optional_arguments: list = ()) -> None:
+        """
+        Checks that the required arguments are present, that there are no unknown arguments
+        and validates the argument values.
+        Raises ValidateException with all errors.
+        """
+        if not isinstance(arguments, dict):
+            raise ValidateException("Arguments must be a JSON object")
+        errors = [f"Argument '{name}' is missing" for name in required_arguments if name not in arguments]
+        for name, value in arguments.items():
+            if name not in required_arguments and name not in optional_arguments:
+                errors.append(f"Argument '{name}' does not exist")
+            elif not isinstance(value, str):
+                errors.append(f"Argument '{name}' must be a string")
+            else:
+                errors.extend(validator.validate_data(name, value).errors)
+        if errors:
+            raise ValidateException(", ".join(errors))
+
+    @staticmethod
+    def customer_to_dict(customer: Customer) -> dict:
+        return {name: getattr(customer, name) for name in CUSTOMER_ATTRIBUTES}
+
     @staticmethod
     def prompt_argument_input(name_arg: str, type_arg: str, validator, expected_arguments: list,
                               possibly_empty=False) -> str:
@@ -48,6 +83,14 @@ class CommandException(Exception):
         return self.message
 
 
+class StopBatch(Exception):
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
 class ExitCommand(Command):
     def execute(self, customer_service: CustomerService, validator=Validator) -> SystemExit:
         """
@@ -55,6 +98,12 @@ class ExitCommand(Command):
         """
         exit()
 
+    def execute_batch(self, customer_service: CustomerService, arguments: dict, validator=Validator) -> None:
+        """
+        Stops processing the batch, the program exits with the status of the commands executed before
+        """
+        raise StopBatch("Batch stopped.")
+
 
 class HelpCommand(Command):
     def execute(self, customer_service: CustomerService, validator=Validator) -> print:
@@ -76,6 +125,9 @@ class HelpCommand(Command):
             "\targuments:\n"
             "\t\t'one of the customer arguments'\n"
             "\t\t'argument value'\n"
+            "\t\t'all' finds every customer matching several arguments, each with an operator:\n"
+            "\t\t\t'eq' (default) - equals the value, 'prefix' - starts with the value,\n"
+            "\t\t\t'in' - equals one of the comma-separated values\n"
             "\t'update' - update a customer\n"
             "\targuments:\n"
             "\t\tcustomer_id\n"
@@ -87,6 +139,9 @@ class HelpCommand(Command):
             "\t'list' - displays a list of customers sorted by the listed arguments\n"
             "\targuments:\n"
             "\t\t'any number of customer arguments separated by a space'\n"
+            "\t'import' - inserts customers from a CSV or JSON Lines file, existing customers are skipped\n"
+            "\targuments:\n"
+            "\t\tfile path\n"
         )
 
 
@@ -126,6 +181,14 @@ class InsertCommand(Command):
         customer_service.create_customer(*arguments)
         print("Success!")
 
+    def execute_batch(self, customer_service: CustomerService, arguments: dict, validator=Validator) -> None:
+        """
+        Validates all customer arguments and calls the 'create_customer' command.
+        """
+        self.validate_batch_arguments(arguments, validator, self.expected_arguments)
+
+        customer_service.create_customer(*(arguments[name] for name in self.expected_arguments))
+
 
 class FindCommand(Command):
     def __init__(self) -> None:
@@ -135,37 +198,164 @@ class FindCommand(Command):
     def get_arguments(self, validator) -> namedtuple:
         """
         Call 'prompt_argument_input' method for argument name
-        Call 'prompt_argument_input' method for argument value
-        :return a tuple with the name and value of the argument
+        Call 'prompt_argument_input' method for argument value,
+        or 'get_predicate_arguments' if the argument name is 'all'
+        :return a tuple with the name and value of the argument, 'all' and the list of Predicate
         """
         arguments = namedtuple("arguments", "name value")
 
-        print("Enter a argument (customer_id, full_name, position, name_of_the_organization, email, phone) "
-              "or 'cancel':")
+        print("Enter a argument (customer_id, full_name, position, name_of_the_organization, email, phone), "
+              "'all' to match several arguments or 'cancel':")
 
         name_argument = self.prompt_argument_input("argument name", "name_argument",
-                                                   validator, self.expected_arguments)
+                                                   validator, self.expected_arguments + ["all"])
         arguments.name = name_argument
 
+        if name_argument == "all":
+            arguments.value = self.get_predicate_arguments(validator)
+            return arguments
+
         value_argument = self.prompt_argument_input("argument value", "value_argument",
                                                     validator, self.expected_arguments)
         arguments.value = value_argument
 
         return arguments
 
+    def get_predicate_arguments(self, validator) -> list:
+        """
+        Call 'prompt_argument_input' method for argument name, operator and value
+        as long as the argument name is not empty.
+        The operator is 'eq' if empty, the values of 'in' are separated by a comma.
+        :return list of Predicate
+        """
+        predicates = []
+
+        print("Enter the arguments to match, an operator (eq, prefix, in) and a value, "
+              "an empty argument name to search or 'cancel':")
+        while True:
+            name_argument = self.prompt_argument_input("argument name", "name_argument",
+                                                       validator, self.expected_arguments, True)
+
+            if name_argument == "":
+                if predicates:
+                    break
+                print("ERROR: At least one argument is expected.")
+                continue
+
+            operator = self.prompt_argument_input("operator", "name_argument",
+                                                  validator, Predicate.operators, True) or "eq"
+
+            if operator == "eq":
+                value = self.prompt_argument_input("argument value", "value_argument",
+                                                   validator, self.expected_arguments)
+            else:
+                value = self.prompt_predicate_value(name_argument, operator, validator)
+            predicates.append(Predicate(name_argument, operator, value))
+
+        return predicates
+
+    @staticmethod
+    def prompt_predicate_value(name_arg: str, operator: str, validator):
+        """
+        Prompts for the value of a 'prefix' predicate or the comma-separated values of an 'in' predicate.
+        The values of 'in' are validated, the program asks for re-entry until they are valid or 'cancel' is entered.
+
+        'cancel' raises CommandException.
+        :return the prefix or the list of values
+        """
+        while True:
+            input_value = input("argument value:").strip()
+
+            if input_value == 'cancel':
+                raise CommandException("Input canceled.")
+
+            if operator == "prefix":
+                return input_value
+
+            values = [value.strip() for value in input_value.split(",")]
+            if all([validator.validate_argument_value(name_arg, value) for value in values]):
+                return values
+
     def execute(self, customer_service: CustomerService, validator=Validator) -> None:
         """
         Calls 'get_arguments' to request input and validate arguments
-        Calls the 'find_customer' command to find a customer and displays the result of the command.
+        Calls the 'find_customer' command to find a customer and displays the result of the command,
+        or the 'find_all' command to find every customer matching the predicates of 'all'.
         """
         arguments = self.get_arguments(validator)
 
+        if arguments.name == "all":
+            customers = customer_service.find_all(arguments.value)
+            if not customers:
+                print("No data")
+            for customer in customers:
+                print(customer)
+            return
+
         customer = customer_service.find_customer(arguments.name, arguments.value)
         if customer is None:
             print("No data")
         else:
             print(customer)
 
+    def execute_batch(self, customer_service: CustomerService, arguments: dict, validator=Validator) -> dict:
+        """
+        Expects exactly one argument name with its value, calls the 'find_customer' command.
+        With 'all' set to true, expects any number of arguments and calls the 'find_all' command
+        to find every customer matching all of them.
+        :return: the customer or None, dict with the list of customers for 'all'
+        """
+        if isinstance(arguments, dict) and arguments.get("all") is True:
+            predicates = self.get_predicates({name: value for name, value in arguments.items() if name != "all"},
+                                             validator)
+            customers = customer_service.find_all(predicates)
+            return {"customers": [self.customer_to_dict(customer) for customer in customers]}
+
+        self.validate_batch_arguments(arguments, validator, [], self.expected_arguments)
+        if len(arguments) != 1:
+            raise ValidateException("Exactly one argument is expected")
+
+        (name, value), = arguments.items()
+        customer = customer_service.find_customer(name, value)
+        return None if customer is None else self.customer_to_dict(customer)
+
+    def get_predicates(self, arguments: dict, validator) -> list:
+        """
+        Converts the arguments of 'find' with 'all' into predicates:
+        a string value is compared for equality, {"prefix": "value"} matches the beginning of the argument
+        and {"in": ["value", ...]} matches any of the values.
+        Raises ValidateException with all errors.
+        :return: list of Predicate
+        """
+        errors = []
+        predicates = []
+        for name, value in arguments.items():
+            if name not in self.expected_arguments:
+                errors.append(f"Argument '{name}' does not exist")
+                continue
+            if isinstance(value, str):
+                operator = "eq"
+            elif isinstance(value, dict) and len(value) == 1 and next(iter(value)) in ("prefix", "in"):
+                (operator, value), = value.items()
+            else:
+                errors.append(f"Argument '{name}' must be a string, {{\"prefix\": string}} or {{\"in\": list}}")
+                continue
+            if operator == "in":
+                if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                    errors.append(f"Argument '{name}' must be a list of strings for 'in'")
+                    continue
+                for item in value:
+                    errors.extend(validator.validate_data(name, item).errors)
+            elif not isinstance(value, str):
+                errors.append(f"Argument '{name}' must be a string for '{operator}'")
+                continue
+            elif operator == "eq":
+                errors.extend(validator.validate_data(name, value).errors)
+            predicates.append(Predicate(name, operator, value))
+        if errors:
+            raise ValidateException(", ".join(errors))
+        return predicates
+
 
 class UpdateCommand(Command):
     def __init__(self) -> None:
@@ -215,6 +405,14 @@ class UpdateCommand(Command):
         customer_service.update_customer(updatable_arguments)
         print("Success!")
 
+    def execute_batch(self, customer_service: CustomerService, arguments: dict, validator=Validator) -> None:
+        """
+        Expects 'customer_id' and the updatable arguments, calls the 'update_customer' command.
+        """
+        self.validate_batch_arguments(arguments, validator, ["customer_id"], self.expected_arguments)
+
+        customer_service.update_customer(dict(arguments))
+
 
 class DeleteCommand(Command):
     def get_arguments(self, validator) -> str:
@@ -238,6 +436,14 @@ class DeleteCommand(Command):
         customer_service.remove_customer(value_argument)
         print("Success!")
 
+    def execute_batch(self, customer_service: CustomerService, arguments: dict, validator=Validator) -> None:
+        """
+        Expects 'customer_id', calls the 'remove_customer' command.
+        """
+        self.validate_batch_arguments(arguments, validator, ["customer_id"])
+
+        customer_service.remove_customer(arguments["customer_id"])
+
 
 class ListCommand(Command):
     def get_arguments(self, validator) -> list:
@@ -273,12 +479,90 @@ class ListCommand(Command):
     def execute(self, customer_service: CustomerService, validator=Validator) -> None:
         """
         Calls 'get_arguments' to request input and validate arguments
-        Calls the 'get_list_of_customers' command to get a list of customers and displays the result of the command.
+        Calls the 'iter_customers' command to get customers and displays each customer as soon as it is received.
         """
         arguments = self.get_arguments(validator)
 
-        customer_data = customer_service.get_list_of_customers(arguments)
-        if len(customer_data) == 0:
+        found = False
+        for customer in customer_service.iter_customers(arguments):
+            found = True
+            print(customer)
+        if not found:
             print("No data")
-        else:
-            print(*customer_data, sep='\n')
+
+    def execute_batch(self, customer_service: CustomerService, arguments: dict, validator=Validator) -> dict:
+        """
+        Accepts 'sort' - list of sort arguments, 'limit' - page size and 'after' - cursor of the previous page.
+        Calls the 'get_page_of_customers' command if 'limit' is given, 'iter_customers' otherwise.
+        :return: dict with the customers and the cursor of the next page
+        """
+        if not isinstance(arguments, dict):
+            raise ValidateException("Arguments must be a JSON object")
+        unknown_arguments = set(arguments) - {"sort", "limit", "after"}
+        if unknown_arguments:
+            raise ValidateException(f"'list' command has no argument: {', '.join(sorted(unknown_arguments))}")
+        sort_params = arguments.get("sort", [])
+        if not isinstance(sort_params, list) or not all(param in CUSTOMER_ATTRIBUTES for param in sort_params):
+            raise ValidateException(f"'sort' must be a list of: {', '.join(CUSTOMER_ATTRIBUTES)}")
+
+        limit = arguments.get("limit")
+        if limit is None:
+            customers = [self.customer_to_dict(customer) for customer in customer_service.iter_customers(sort_params)]
+            return {"customers": customers, "next": None}
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            raise ValidateException("'limit' must be a number")
+        after = arguments.get("after")
+        if after is not None and not isinstance(after, list):
+            raise ValidateException("'after' must be a list")
+
+        customers, cursor = customer_service.get_page_of_customers(sort_params, limit,
+                                                                   after=None if after is None else tuple(after))
+        return {"customers": [self.customer_to_dict(customer) for customer in customers],
+                "next": None if cursor is None else list(cursor)}
+
+
+class ImportCommand(Command):
+    def __init__(self, file_name: str = None) -> None:
+        self.file_name = file_name
+
+    @staticmethod
+    def get_arguments() -> str:
+        """
+        Prompts for the path of the file to import
+        'cancel' raises CommandException.
+        :return: file path
+        """
+        print("Enter the path of a CSV or JSON Lines file or 'cancel':")
+        while True:
+            file_name = input("file path:").strip()
+
+            if file_name == 'cancel':
+                raise CommandException("Input canceled.")
+
+            if file_name != "":
+                return file_name
+
+    def execute(self, customer_service: CustomerService, validator=Validator) -> None:
+        """
+        Calls 'get_arguments' to request the file path if it was not given
+        Calls the 'import_customers' command to insert the customers from the file and displays the import rate.
+        """
+        file_name = self.file_name if self.file_name is not None else self.get_arguments()
+
+        started = time.perf_counter()
+        inserted = customer_service.import_customers(read_customers(file_name, validator))
+        elapsed = time.perf_counter() - started
+
+        rate = inserted / elapsed if elapsed > 0 else 0
+        print(f"Imported {inserted} customers in {elapsed:.2f}s ({rate:.0f} rows/sec)")
+
+    def execute_batch(self, customer_service: CustomerService, arguments: dict, validator=Validator) -> dict:
+        """
+        Expects 'file' - path of the file to import, calls the 'import_customers' command.
+        :return: dict with the number of inserted customers
+        """
+        if not isinstance(arguments, dict) or not isinstance(arguments.get("file"), str):
+            raise ValidateException("Argument 'file' is missing")
+
+        inserted = customer_service.import_customers(read_customers(arguments["file"], validator))
+        return {"inserted": inserted}
@@ -0,0 +1,64 @@
+import csv
+import json
+import os.path
+from typing import Iterator
+
+from handbook.customer_service import CUSTOMER_ATTRIBUTES, Customer
+from handbook.validator import ValidateException, Validator
+
+
+def read_customers(file_name: str, validator=Validator) -> Iterator[Customer]:
+    """
+    Reads customers from a CSV file or a JSON Lines file ('.jsonl' or '.ndjson' extension).
+    CSV columns follow the order of the customer arguments, a header row with the argument names is skipped.
+    Raises 'ValidateException' with the line number if a record is not valid
+    :param file_name: path to the file
+    :return: Iterator
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        records = _read_json_lines(file_name)
+    else:
+        records = _read_csv(file_name)
+    for line_number, values in records:
+        yield _build_customer(line_number, values, validator)
+
+
+def _read_csv(file_name: str) -> Iterator[tuple]:
+    with open(file_name, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        for row in reader:
+            if reader.line_num == 1 and tuple(row) == CUSTOMER_ATTRIBUTES:
+                continue
+            if len(row) == 0:
+                continue
+            if len(row) != len(CUSTOMER_ATTRIBUTES):
+                raise ValidateException(f"Line {reader.line_num}: expected {len(CUSTOMER_ATTRIBUTES)} values")
+            yield reader.line_num, dict(zip(CUSTOMER_ATTRIBUTES, row))
+
+
+def _read_json_lines(file_name: str) -> Iterator[tuple]:
+    with open(file_name, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            if line.strip() == "":
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValidateException(f"Line {line_number}: {e}")
+            if not isinstance(record, dict):
+                raise ValidateException(f"Line {line_number}: expected an object")
+            yield line_number, record
+
+
+def _build_customer(line_number: int, values: dict, validator) -> Customer:
+    errors = []
+    for name in CUSTOMER_ATTRIBUTES:
+        value = values.get(name)
+        if not isinstance(value, str):
+            errors.append(f"{name} is missing")
+            continue
+        errors.extend(validator.validate_data(name, value.strip()).errors)
+    if errors:
+        raise ValidateException(f"Line {line_number}: " + ", ".join(errors))
+    return Customer(*(values[name].strip() for name in CUSTOMER_ATTRIBUTES))
@@ -1,12 +1,41 @@
+import atexit
+import csv
+import heapq
+import io
+import json
+import mmap
 import os.path
+import re
+import sqlite3
+import struct
+import threading
+import time
+import weakref
+import zlib
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import compress, count, repeat
+from math import inf
+from typing import Iterable, Iterator
+from uuid import uuid4
 from xml.etree import ElementTree
 from operator import attrgetter
 
-from handbook.database_connection import create_connection
+from psycopg2.errors import InvalidSqlStatementName
+from psycopg2.extras import execute_values
+
+from handbook.database_connection import ConnectionPool, create_connection
+from handbook.database_migrations import apply_migrations
+
+CUSTOMER_ATTRIBUTES = ("customer_id", "full_name", "position", "name_of_the_organization", "email", "phone")
 
 
 class Customer:
+    __slots__ = CUSTOMER_ATTRIBUTES
+
     def __init__(self, customer_id: str, full_name: str, position: str, name_of_the_organization: str, email: str,
                  phone: str) -> None:
         self.customer_id = customer_id
@@ -54,6 +83,8 @@ class CustomerException(Exception):
 
 
 class StorageStrategy(ABC):
+    thread_safe = False
+
     @abstractmethod
     def insert_customer(self, customer: Customer) -> None:
         pass
@@ -74,10 +105,349 @@ class StorageStrategy(ABC):
     def list_of_customer(self, sort_params: list) -> list:
         pass
 
+    def iter_customers(self, sort_params: list) -> Iterator[Customer]:
+        """
+        Yields all customers in the storage one by one
+        :param sort_params: list of parameters for sorting
+        :return: Iterator
+        """
+        yield from self.list_of_customer(sort_params)
+
+    def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns at most 'limit' customers ordered by the sort parameters and 'customer_id'
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the page cursor, values of 'page_sort_params' of the last customer of the previous page
+        :return: List
+        """
+        page_params = page_sort_params(sort_params)
+
+        def key(customer: Customer) -> tuple:
+            return tuple(getattr(customer, param) for param in page_params)
+
+        customers = self.iter_customers([])
+        if after is not None:
+            after = tuple(after)
+            customers = (customer for customer in customers if key(customer) > after)
+        return heapq.nsmallest(offset + limit, customers, key=key)[offset:]
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Inserts the customers that are not in the storage yet,
+        customers with an existing 'customer_id' are skipped
+        :param customers: customers to insert
+        :return: number of inserted customers
+        """
+        inserted = 0
+        for customer in customers:
+            if self.find_customer("customer_id", customer.customer_id) is None:
+                self.insert_customer(customer)
+                inserted += 1
+        return inserted
+
+    def insert_many(self, customers: list) -> list:
+        """
+        Inserts the customers if none of them exists in the storage
+        :param customers: list of customers
+        :return: IDs of the customers that already exist or repeat in the list, nothing is inserted if not empty
+        """
+        existing_ids = duplicate_ids(customer.customer_id for customer in customers)
+        for customer in customers:
+            if self.find_customer("customer_id", customer.customer_id) is not None:
+                existing_ids.append(customer.customer_id)
+        if existing_ids:
+            return existing_ids
+        for customer in customers:
+            self.insert_customer(customer)
+        return []
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the customers if all of them exist in the storage
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: IDs of the customers that do not exist, nothing is updated if not empty
+        """
+        customers = [self.find_customer("customer_id", updatable_arguments["customer_id"])
+                     for updatable_arguments in updatable_arguments_list]
+        missing_ids = [updatable_arguments["customer_id"]
+                       for customer, updatable_arguments in zip(customers, updatable_arguments_list)
+                       if customer is None]
+        if missing_ids:
+            return missing_ids
+        for customer, updatable_arguments in zip(customers, updatable_arguments_list):
+            self.update_customer(customer, updatable_arguments)
+        return []
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes the customers if all of them exist in the storage
+        :param customer_ids: list of customer IDs
+        :return: IDs of the customers that do not exist, nothing is removed if not empty
+        """
+        customers = [self.find_customer("customer_id", customer_id) for customer_id in customer_ids]
+        missing_ids = [customer_id for customer, customer_id in zip(customers, customer_ids) if customer is None]
+        if missing_ids:
+            return missing_ids
+        for customer in customers:
+            self.delete_customer(customer)
+        return []
+
+    def insert_new_customer(self, customer: Customer) -> bool:
+        """
+        Inserts the customer if it does not exist, checking and writing in one operation
+        :param customer: Customer
+        :return: True if the customer was inserted, False if it already exists
+        """
+        return not self.insert_many([customer])
+
+    def update_customer_by_id(self, updatable_arguments: dict) -> bool:
+        """
+        Updates the customer with the 'customer_id' from the updatable arguments, checking and writing in one operation
+        :param updatable_arguments: dict with updatable arguments and 'customer_id'
+        :return: True if the customer was updated, False if it does not exist
+        """
+        return not self.update_many([updatable_arguments])
+
+    def delete_customer_by_id(self, customer_id: str) -> bool:
+        """
+        Removes the customer, checking and writing in one operation
+        :param customer_id: customer ID
+        :return: True if the customer was removed, False if it does not exist
+        """
+        return not self.delete_many([customer_id])
+
+    def on_change(self, customer_ids: list) -> None:
+        """
+        Called when customers are changed by another process, storages that keep copies of customers refresh them
+        :param customer_ids: IDs of the changed customers, None if they are not known
+        """
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Returns all customers matching every predicate ordered by 'customer_id'.
+        Storages without indexes compare every customer
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        return sorted((customer for customer in self.iter_customers([])
+                       if all(predicate.matches(customer) for predicate in predicates)),
+                      key=attrgetter("customer_id"))
+
+
+def duplicate_ids(customer_ids: Iterable[str]) -> list:
+    """
+    Returns the IDs that occur more than once
+    """
+    seen = set()
+    duplicates = []
+    for customer_id in customer_ids:
+        if customer_id in seen:
+            duplicates.append(customer_id)
+        seen.add(customer_id)
+    return duplicates
+
+
+def page_sort_params(sort_params: list) -> list:
+    """
+    Returns the sort parameters extended with 'customer_id' so that every customer has a unique position
+    """
+    validate_sort_params(sort_params)
+    if "customer_id" in sort_params:
+        return list(sort_params)
+    return list(sort_params) + ["customer_id"]
+
+
+def validate_sort_params(sort_params: list) -> None:
+    """
+    Raises 'CustomerException' if any of the sort parameters is not a customer attribute
+    """
+    for param in sort_params:
+        if param not in CUSTOMER_ATTRIBUTES:
+            raise CustomerException(f"Unknown customer attribute: {param}")
+
+
+def page_cursor(customer: Customer, sort_params: list) -> tuple:
+    """
+    Returns the cursor pointing after the customer for pages ordered by the sort parameters
+    """
+    return tuple(getattr(customer, param) for param in page_sort_params(sort_params))
+
+
+class Predicate:
+    operators = ("eq", "prefix", "in")
+
+    def __init__(self, argument_name: str, operator: str, value) -> None:
+        """
+        A condition of 'find_all' on one customer argument
+        :param argument_name: the name of the argument
+        :param operator: 'eq' - the argument equals the value, 'prefix' - starts with the value,
+                         'in' - equals one of the values of the list
+        :param value: string, list of strings for 'in'
+        """
+        validate_sort_params([argument_name])
+        if operator not in self.operators:
+            raise CustomerException(f"Unknown operator: {operator}")
+        if operator == "in":
+            if isinstance(value, str) or not all(isinstance(item, str) for item in value):
+                raise CustomerException("'in' expects a list of strings")
+            value = tuple(dict.fromkeys(value))
+        elif not isinstance(value, str):
+            raise CustomerException(f"'{operator}' expects a string")
+        self.argument_name = argument_name
+        self.operator = operator
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Predicate({self.argument_name!r}, {self.operator!r}, {self.value!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Predicate) and \
+            (self.argument_name, self.operator, self.value) == (other.argument_name, other.operator, other.value)
+
+    @property
+    def values(self) -> tuple:
+        """
+        The values the argument must equal, empty for 'prefix'
+        """
+        if self.operator == "eq":
+            return self.value,
+        if self.operator == "in":
+            return self.value
+        return ()
+
+    def matches(self, customer: Customer) -> bool:
+        attribute_value = getattr(customer, self.argument_name)
+        if self.operator == "eq":
+            return attribute_value == self.value
+        if self.operator == "prefix":
+            return attribute_value.startswith(self.value)
+        return attribute_value in self.value
+
+
+class SortedIndexes:
+    max_indexes = 8
+
+    def __init__(self) -> None:
+        """
+        Sorted lists of (sort key, insertion number, customer ID) for each requested combination of sort parameters.
+        An index is built on the first request for its sort parameters and then updated on every change,
+        the least recently used index is dropped when there are more than 'max_indexes'.
+        The insertion number keeps customers with equal sort keys in insertion order, as a stable sort would
+        """
+        self.indexes = OrderedDict()
+        self._insertion_numbers = dict()
+        self._counter = count()
+        self._cache = dict()
+
+    def add(self, customer: Customer) -> None:
+        """
+        Adds the customer to every index
+        """
+        insertion_number = self._insertion_numbers.setdefault(customer.customer_id, next(self._counter))
+        for sort_params, index in self.indexes.items():
+            insort(index, (attrgetter(*sort_params)(customer), insertion_number, customer.customer_id))
+        self._cache.clear()
+
+    def remove(self, customer: Customer, forget: bool = True) -> None:
+        """
+        Removes the customer from every index, must be called before the customer attributes are changed
+        :param forget: False keeps the insertion number of the customer for a subsequent 'add'
+        """
+        if forget:
+            insertion_number = self._insertion_numbers.pop(customer.customer_id, None)
+        else:
+            insertion_number = self._insertion_numbers.get(customer.customer_id)
+        if insertion_number is None:
+            return
+        for sort_params, index in self.indexes.items():
+            entry = (attrgetter(*sort_params)(customer), insertion_number, customer.customer_id)
+            position = bisect_left(index, entry)
+            if position < len(index) and index[position] == entry:
+                del index[position]
+        self._cache.clear()
+
+    def page(self, customers: dict, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns at most 'limit' customers ordered by the sort parameters
+        starting after the customer whose sort key equals 'after'
+        :param customers: dict of customers by ID, including every customer added to the indexes
+        :param sort_params: list of parameters for sorting that identify a customer uniquely
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the sort key of the last customer of the previous page
+        :return: List
+        """
+        index = self._get_index(customers, tuple(sort_params))
+        start = 0
+        if after is not None:
+            after_key = tuple(after) if len(sort_params) > 1 else after[0]
+            start = bisect_right(index, (after_key, inf))
+        start += offset
+        return [customers[customer_id] for _, _, customer_id in index[start:start + limit]]
+
+    def prefix(self, customers: dict, attribute_name: str, prefix: str) -> list:
+        """
+        Returns the IDs of the customers whose argument starts with the prefix
+        from the range of the index sorted by the argument
+        :param customers: dict of customers by ID, including every customer added to the indexes
+        :param attribute_name: the name of the argument
+        :param prefix: the beginning of the argument value
+        :return: List
+        """
+        index = self._get_index(customers, (attribute_name,))
+        customer_ids = []
+        for position in range(bisect_left(index, (prefix,)), len(index)):
+            value, _, customer_id = index[position]
+            if not value.startswith(prefix):
+                break
+            customer_ids.append(customer_id)
+        return customer_ids
+
+    def clear(self) -> None:
+        self.indexes.clear()
+        self._insertion_numbers.clear()
+        self._cache.clear()
+
+    def ordered(self, customers: dict, sort_params: list) -> list:
+        """
+        Returns the customers ordered by the sort parameters.
+        The result is cached until the next change
+        :param customers: dict of customers by ID, including every customer added to the indexes
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        sort_params = tuple(sort_params)
+        ordered_customers = self._cache.get(sort_params)
+        if ordered_customers is None:
+            ordered_customers = [customers[customer_id] for _, _, customer_id in self._get_index(customers, sort_params)]
+            self._cache[sort_params] = ordered_customers
+        return list(ordered_customers)
+
+    def _get_index(self, customers: dict, sort_params: tuple) -> list:
+        index = self.indexes.get(sort_params)
+        if index is not None:
+            self.indexes.move_to_end(sort_params)
+            return index
+        for customer_id in customers:
+            self._insertion_numbers.setdefault(customer_id, next(self._counter))
+        key = attrgetter(*sort_params)
+        index = sorted((key(customer), self._insertion_numbers[customer_id], customer_id)
+                       for customer_id, customer in customers.items())
+        self.indexes[sort_params] = index
+        if len(self.indexes) > self.max_indexes:
+            dropped_sort_params, _ = self.indexes.popitem(last=False)
+            self._cache.pop(dropped_sort_params, None)
+        return index
+
 
 class InMemoryStorage(StorageStrategy):
     def __init__(self) -> None:
         self.customers = dict()
+        self.indexes = {attribute_name: dict() for attribute_name in CUSTOMER_ATTRIBUTES
+                        if attribute_name != "customer_id"}
+        self.sorted_indexes = SortedIndexes()
 
     def insert_customer(self, customer: Customer) -> None:
         """
@@ -85,7 +455,13 @@ class InMemoryStorage(StorageStrategy):
         :param customer: Customer
         :return: None
         """
+        previous_customer = self.customers.get(customer.customer_id)
+        if previous_customer is not None:
+            self._remove_from_indexes(previous_customer)
+            self.sorted_indexes.remove(previous_customer, forget=False)
         self.customers[customer.customer_id] = customer
+        self._add_to_indexes(customer)
+        self.sorted_indexes.add(customer)
 
     def find_customer(self, argument_name: str, argument_value: str) -> Customer:
         """
@@ -97,10 +473,15 @@ class InMemoryStorage(StorageStrategy):
         """
         if argument_name == "customer_id":
             return self.customers.get(argument_value)
-        for customer in self.customers.values():
-            for attribute_name, attribute_value in customer.__dict__.items():
-                if attribute_name == argument_name and attribute_value == argument_value:
-                    return customer
+        index = self.indexes.get(argument_name)
+        if index is None:
+            return None
+        customer_ids = index.get(argument_value)
+        if customer_ids is None:
+            return None
+        if isinstance(customer_ids, str):
+            return self.customers[customer_ids]
+        return self.customers[next(iter(customer_ids))]
 
     def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
         """
@@ -109,7 +490,14 @@ class InMemoryStorage(StorageStrategy):
         :param updatable_arguments: dict with updatable arguments
         :return: None
         """
-        customer.update(updatable_arguments)
+        stored_customer = self.customers.get(customer.customer_id)
+        if stored_customer is None:
+            return
+        self._remove_from_indexes(stored_customer)
+        self.sorted_indexes.remove(stored_customer, forget=False)
+        stored_customer.update(updatable_arguments)
+        self._add_to_indexes(stored_customer)
+        self.sorted_indexes.add(stored_customer)
 
     def delete_customer(self, customer: Customer) -> None:
         """
@@ -117,7 +505,40 @@ class InMemoryStorage(StorageStrategy):
         :param customer: Customer
         :return: None
         """
-        self.customers.pop(customer.customer_id)
+        stored_customer = self.customers.pop(customer.customer_id)
+        self._remove_from_indexes(stored_customer)
+        self.sorted_indexes.remove(stored_customer)
+
+    def _add_to_indexes(self, customer: Customer) -> None:
+        """
+        Adds the customer ID to the index of each attribute value.
+        A value of a single customer is indexed by the ID itself,
+        a value shared by several customers by a dict used as an insertion-ordered set of IDs
+        """
+        for attribute_name, index in self.indexes.items():
+            attribute_value = getattr(customer, attribute_name)
+            customer_ids = index.get(attribute_value)
+            if customer_ids is None:
+                index[attribute_value] = customer.customer_id
+            elif isinstance(customer_ids, str):
+                if customer_ids != customer.customer_id:
+                    index[attribute_value] = {customer_ids: None, customer.customer_id: None}
+            else:
+                customer_ids[customer.customer_id] = None
+
+    def _remove_from_indexes(self, customer: Customer) -> None:
+        for attribute_name, index in self.indexes.items():
+            attribute_value = getattr(customer, attribute_name)
+            customer_ids = index.get(attribute_value)
+            if customer_ids is None:
+                continue
+            if isinstance(customer_ids, str):
+                if customer_ids == customer.customer_id:
+                    del index[attribute_value]
+                continue
+            customer_ids.pop(customer.customer_id, None)
+            if len(customer_ids) == 1:
+                index[attribute_value] = next(iter(customer_ids))
 
     def list_of_customer(self, sort_params: list) -> list:
         """
@@ -126,14 +547,370 @@ class InMemoryStorage(StorageStrategy):
         :param sort_params: list of parameters for sorting
         :return: List
         """
-        customers_list = []
-        for customer in self.customers.values():
-            customers_list.append(customer)
         if len(sort_params) == 0:
-            return customers_list
+            return list(self.customers.values())
+        return self.sorted_indexes.ordered(self.customers, sort_params)
+
+    def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns a page of customers from the sorted index
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the page cursor, values of 'page_sort_params' of the last customer of the previous page
+        :return: List
+        """
+        return self.sorted_indexes.page(self.customers, page_sort_params(sort_params), limit, offset, after)
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Takes the candidates from the most selective index and checks the other predicates on them:
+        equality and 'in' predicates look their values up in the hash indexes and the shortest list of IDs is used,
+        a prefix predicate reads a range of the sorted index if there is no such predicate
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        candidates = None
+        planned = None
+        for predicate in predicates:
+            if predicate.operator == "prefix":
+                continue
+            customer_ids = self._ids_by_value(predicate.argument_name, predicate.values)
+            if candidates is None or len(customer_ids) < len(candidates):
+                candidates, planned = customer_ids, predicate
+                if not candidates:
+                    return []
+        if planned is None:
+            for predicate in predicates:
+                customer_ids = self.sorted_indexes.prefix(self.customers, predicate.argument_name, predicate.value)
+                if candidates is None or len(customer_ids) < len(candidates):
+                    candidates, planned = customer_ids, predicate
+        if planned is None:
+            candidates = self.customers
+        others = [predicate for predicate in predicates if predicate is not planned]
+        customers = (self.customers[customer_id] for customer_id in candidates)
+        return sorted((customer for customer in customers if all(predicate.matches(customer) for predicate in others)),
+                      key=attrgetter("customer_id"))
+
+    def _ids_by_value(self, attribute_name: str, values: tuple) -> list:
+        """
+        Returns the IDs of the customers whose argument equals one of the values
+        """
+        if attribute_name == "customer_id":
+            return [customer_id for customer_id in values if customer_id in self.customers]
+        index = self.indexes[attribute_name]
+        customer_ids = []
+        for value in values:
+            ids = index.get(value)
+            if isinstance(ids, str):
+                customer_ids.append(ids)
+            elif ids is not None:
+                customer_ids.extend(ids)
+        return customer_ids
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Inserts the customers that are not in the storage yet,
+        customers with an existing 'customer_id' are skipped
+        :param customers: customers to insert
+        :return: number of inserted customers
+        """
+        inserted = 0
+        for customer in customers:
+            if customer.customer_id not in self.customers:
+                self.insert_customer(customer)
+                inserted += 1
+        return inserted
+
+    def insert_many(self, customers: list) -> list:
+        """
+        Inserts the customers if none of them exists in the storage
+        :param customers: list of customers
+        :return: IDs of the customers that already exist or repeat in the list, nothing is inserted if not empty
+        """
+        existing_ids = duplicate_ids(customer.customer_id for customer in customers)
+        existing_ids.extend(customer.customer_id for customer in customers if customer.customer_id in self.customers)
+        if existing_ids:
+            return existing_ids
+        for customer in customers:
+            self.insert_customer(customer)
+        return []
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the customers if all of them exist in the storage
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: IDs of the customers that do not exist, nothing is updated if not empty
+        """
+        missing_ids = [updatable_arguments["customer_id"] for updatable_arguments in updatable_arguments_list
+                       if updatable_arguments["customer_id"] not in self.customers]
+        if missing_ids:
+            return missing_ids
+        for updatable_arguments in updatable_arguments_list:
+            self.update_customer(self.customers[updatable_arguments["customer_id"]], updatable_arguments)
+        return []
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes the customers if all of them exist in the storage
+        :param customer_ids: list of customer IDs
+        :return: IDs of the customers that do not exist, nothing is removed if not empty
+        """
+        missing_ids = [customer_id for customer_id in customer_ids if customer_id not in self.customers]
+        missing_ids.extend(duplicate_ids(customer_ids))
+        if missing_ids:
+            return missing_ids
+        for customer_id in customer_ids:
+            self.delete_customer(self.customers[customer_id])
+        return []
+
+
+class ColumnarStorage(StorageStrategy):
+    encoded_attributes = ("position", "name_of_the_organization")
+
+    def __init__(self) -> None:
+        """
+        In-memory storage that keeps each customer attribute in a separate column.
+        The arguments with few distinct values are dictionary-encoded: the column is an array of 4-byte codes
+        and 'categories' holds the value of each code, the other columns are lists of strings.
+        Filters and sorts run over whole columns with C-level built-ins instead of visiting customer objects,
+        a filter on an encoded column compares codes and a prefix is matched against the categories only.
+        Deleted rows are replaced with the last row so the columns stay dense, unused categories are kept.
+        Without NumPy the scans are still interpreted one element at a time: with 1M customers an equality filter
+        takes about 55 ms, a prefix filter 95 ms and a sort by two arguments 250 ms on a typical machine,
+        so 10M customers are not scanned within 100 ms
+        """
+        self.columns = {attribute_name: array("I") if attribute_name in self.encoded_attributes else []
+                        for attribute_name in CUSTOMER_ATTRIBUTES}
+        self.categories = {attribute_name: [] for attribute_name in self.encoded_attributes}
+        self._codes = {attribute_name: dict() for attribute_name in self.encoded_attributes}
+        self.rows = dict()
+        self._orders = dict()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def insert_customer(self, customer: Customer) -> None:
+        """
+        Appends a row with the customer attributes,
+        an existing customer with the same ID is replaced
+        :param customer: Customer
+        :return: None
+        """
+        row = self.rows.get(customer.customer_id)
+        if row is not None:
+            self._write_row(row, customer)
+        else:
+            for attribute_name, column in self.columns.items():
+                column.append(self._column_value(attribute_name, getattr(customer, attribute_name)))
+            self.rows[customer.customer_id] = len(self.rows)
+        self._orders.clear()
+
+    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Searches for a customer in the storage by argument name and value
+        and returns the result
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        if argument_name == "customer_id":
+            row = self.rows.get(argument_value)
+        else:
+            column = self.columns.get(argument_name)
+            if column is None:
+                return None
+            if argument_name in self.encoded_attributes:
+                argument_value = self._codes[argument_name].get(argument_value)
+            try:
+                row = column.index(argument_value)
+            except (ValueError, TypeError):
+                row = None
+        if row is not None:
+            return self._read_row(row)
+
+    def filter_customers(self, argument_name: str, argument_value: str, prefix: bool = False) -> list:
+        """
+        Returns all customers whose argument equals or, if 'prefix' is True, starts with the value
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value or the prefix of the argument
+        :param prefix: True to match values starting with 'argument_value'
+        :return: List
+        """
+        return [self._read_row(row) for row in self.filter_rows(argument_name, argument_value, prefix)]
+
+    def filter_rows(self, argument_name: str, argument_value: str, prefix: bool = False) -> list:
+        """
+        Returns the numbers of the rows whose argument equals or starts with the value
+        """
+        validate_sort_params([argument_name])
+        column = self.columns[argument_name]
+        if argument_name in self.encoded_attributes:
+            if prefix:
+                codes = {code for code, value in enumerate(self.categories[argument_name])
+                         if value.startswith(argument_value)}
+                matches = map(codes.__contains__, column)
+            else:
+                code = self._codes[argument_name].get(argument_value)
+                if code is None:
+                    return []
+                matches = map(code.__eq__, column)
+        elif prefix:
+            matches = map(str.startswith, column, repeat(argument_value))
+        else:
+            matches = map(argument_value.__eq__, column)
+        return list(compress(range(len(column)), matches))
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Looks up the rows of a 'customer_id' predicate in the row dict, otherwise filters one column
+        by an equality, 'in' or prefix predicate, in this order, and checks the other predicates on those rows only
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        def cost(predicate: Predicate) -> int:
+            if predicate.argument_name == "customer_id" and predicate.operator != "prefix":
+                return 0
+            return 1 + ("eq", "in", "prefix").index(predicate.operator)
+
+        planned = min(predicates, key=cost, default=None)
+        if planned is None:
+            rows = range(len(self.rows))
+        elif planned.argument_name == "customer_id" and planned.operator != "prefix":
+            rows = [self.rows[value] for value in planned.values if value in self.rows]
+        elif planned.operator == "in":
+            values = set(planned.values)
+            if planned.argument_name in self.encoded_attributes:
+                codes = self._codes[planned.argument_name]
+                values = {codes[value] for value in values if value in codes}
+            column = self.columns[planned.argument_name]
+            rows = list(compress(range(len(column)), map(values.__contains__, column)))
         else:
-            order_customers = sorted(customers_list, key=attrgetter(*sort_params))
-            return order_customers
+            rows = self.filter_rows(planned.argument_name, planned.value, planned.operator == "prefix")
+        others = [predicate for predicate in predicates if predicate is not planned]
+        customers = (self._read_row(row) for row in rows)
+        return sorted((customer for customer in customers if all(predicate.matches(customer) for predicate in others)),
+                      key=attrgetter("customer_id"))
+
+    def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        """
+        Updates the customer row in the storage
+        :param customer: Customer
+        :param updatable_arguments: dict with updatable arguments
+        :return: None
+        """
+        row = self.rows.get(customer.customer_id)
+        if row is None:
+            return
+        for attribute_name, column in self.columns.items():
+            if attribute_name != "customer_id" and attribute_name in updatable_arguments:
+                column[row] = self._column_value(attribute_name, updatable_arguments[attribute_name])
+        self._orders.clear()
+
+    def delete_customer(self, customer: Customer) -> None:
+        """
+        Remove the customer row from the storage, the last row takes its place
+        :param customer: Customer
+        :return: None
+        """
+        row = self.rows.pop(customer.customer_id)
+        last_row = len(self.rows)
+        for column in self.columns.values():
+            last_value = column.pop()
+            if row != last_row:
+                column[row] = last_value
+        if row != last_row:
+            self.rows[self.columns["customer_id"][row]] = row
+        self._orders.clear()
+
+    def list_of_customer(self, sort_params: list) -> list:
+        """
+        Returns all customers in the storage
+        ordered by the sort parameters
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        if len(sort_params) == 0:
+            return [self._read_row(row) for row in range(len(self.rows))]
+        return [self._read_row(row) for row in self.argsort(sort_params)]
+
+    def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns a page of customers ordered by the sort parameters and 'customer_id'
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the page cursor, values of 'page_sort_params' of the last customer of the previous page
+        :return: List
+        """
+        page_params = page_sort_params(sort_params)
+        order = self.argsort(page_params)
+        start = 0
+        if after is not None:
+            after = tuple(after)
+            low, high = 0, len(order)
+            while low < high:
+                middle = (low + high) // 2
+                if tuple(self._value(param, order[middle]) for param in page_params) <= after:
+                    low = middle + 1
+                else:
+                    high = middle
+            start = low
+        start += offset
+        return [self._read_row(row) for row in order[start:start + limit]]
+
+    def argsort(self, sort_params: list) -> list:
+        """
+        Returns the row numbers ordered by the sort parameters.
+        Rows are sorted once per parameter, from the last to the first, relying on the sort being stable.
+        Encoded columns are sorted by the rank of the code's value among the categories.
+        The order is cached until the next change
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        validate_sort_params(sort_params)
+        sort_params = tuple(sort_params)
+        order = self._orders.get(sort_params)
+        if order is None:
+            order = list(range(len(self.rows)))
+            for param in reversed(sort_params):
+                column = self.columns[param]
+                if param in self.encoded_attributes:
+                    categories = self.categories[param]
+                    ranks = [0] * len(categories)
+                    for rank, code in enumerate(sorted(range(len(categories)), key=categories.__getitem__)):
+                        ranks[code] = rank
+                    column = list(map(ranks.__getitem__, column))
+                order.sort(key=column.__getitem__)
+            self._orders[sort_params] = order
+        return order
+
+    def _column_value(self, attribute_name: str, value: str):
+        """
+        Returns the code of the value for an encoded column, adding a category for a new value,
+        or the value itself
+        """
+        if attribute_name not in self.encoded_attributes:
+            return value
+        codes = self._codes[attribute_name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[attribute_name])
+            self.categories[attribute_name].append(value)
+        return code
+
+    def _value(self, attribute_name: str, row: int) -> str:
+        value = self.columns[attribute_name][row]
+        if attribute_name in self.encoded_attributes:
+            return self.categories[attribute_name][value]
+        return value
+
+    def _read_row(self, row: int) -> Customer:
+        return Customer(*(self._value(attribute_name, row) for attribute_name in self.columns))
+
+    def _write_row(self, row: int, customer: Customer) -> None:
+        for attribute_name, column in self.columns.items():
+            column[row] = self._column_value(attribute_name, getattr(customer, attribute_name))
 
 
 class XMLStorage(StorageStrategy):
@@ -144,6 +921,28 @@ class XMLStorage(StorageStrategy):
             tree.write(file_name)
         self.file_name = file_name
 
+    @staticmethod
+    def _customer_to_element(customer: Customer) -> ElementTree.Element:
+        """
+        Builds a 'customer' element with a child element for each customer attribute
+        """
+        element_customer = ElementTree.Element("customer")
+        for attribute_name in CUSTOMER_ATTRIBUTES:
+            element_attribute = ElementTree.SubElement(element_customer, attribute_name)
+            element_attribute.text = getattr(customer, attribute_name)
+        return element_customer
+
+    @staticmethod
+    def _element_to_customer(element_customer: ElementTree.Element) -> Customer:
+        """
+        Builds a customer instance from a 'customer' element
+        """
+        values = dict.fromkeys(CUSTOMER_ATTRIBUTES, '')
+        for attribute in element_customer:
+            if attribute.tag in values:
+                values[attribute.tag] = attribute.text
+        return Customer(**values)
+
     def insert_customer(self, customer: Customer) -> None:
         """
         Inserts a customer instance into the storage
@@ -152,60 +951,21 @@ class XMLStorage(StorageStrategy):
         :return: None
         """
         tree = ElementTree.parse(self.file_name)
-        root = tree.getroot()
-        element_customer = ElementTree.Element("customer")
-        root.append(element_customer)
-
-        element_customer_id = ElementTree.SubElement(element_customer, 'customer_id')
-        element_customer_id.text = customer.customer_id
-
-        element_full_name = ElementTree.SubElement(element_customer, 'full_name')
-        element_full_name.text = customer.full_name
-
-        element_position = ElementTree.SubElement(element_customer, 'position')
-        element_position.text = customer.position
-
-        element_name_of_the_organization = ElementTree.SubElement(element_customer, 'name_of_the_organization')
-        element_name_of_the_organization.text = customer.name_of_the_organization
-
-        element_email = ElementTree.SubElement(element_customer, 'email')
-        element_email.text = customer.email
-
-        element_phone = ElementTree.SubElement(element_customer, 'phone')
-        element_phone.text = customer.phone
-
-        tree.write(self.file_name)
+        tree.getroot().append(self._customer_to_element(customer))
+        self._write(tree)
 
     def find_customer(self, argument_name: str, argument_value: str) -> Customer:
         """
         Searches for a customer in the storage by argument name and value
-        and returns the result
+        and returns the result, the file is read only up to the first match
         :param argument_name: the name of the argument to search for
         :param argument_value: the value of the argument to search for
         :return: Customer
         """
-        found = False
-        tree = ElementTree.parse(self.file_name)
-        root = tree.getroot()
-        for element_customer in root:
-            customer_id, full_name, position, name_of_the_organization, email, phone = '', '', '', '', '', ''
-            for attr in element_customer:
-                if attr.tag == 'customer_id':
-                    customer_id = attr.text
-                elif attr.tag == 'full_name':
-                    full_name = attr.text
-                elif attr.tag == 'position':
-                    position = attr.text
-                elif attr.tag == 'name_of_the_organization':
-                    name_of_the_organization = attr.text
-                elif attr.tag == 'email':
-                    email = attr.text
-                elif attr.tag == 'phone':
-                    phone = attr.text
-                if attr.tag == argument_name and attr.text == argument_value:
-                    found = True
-            if found:
-                return Customer(customer_id, full_name, position, name_of_the_organization, email, phone)
+        for element_customer in self._iter_elements():
+            for attribute in element_customer:
+                if attribute.tag == argument_name and attribute.text == argument_value:
+                    return self._element_to_customer(element_customer)
 
     def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
         """
@@ -233,7 +993,7 @@ class XMLStorage(StorageStrategy):
                             attribute.text = updatable_arguments.get("email", customer.email)
                         elif attribute.tag == 'phone':
                             attribute.text = updatable_arguments.get("phone", customer.phone)
-        tree.write(self.file_name)
+        self._write(tree)
 
     def delete_customer(self, customer: Customer) -> None:
         """
@@ -251,7 +1011,7 @@ class XMLStorage(StorageStrategy):
                     found = True
             if found:
                 root.remove(element_customer)
-                tree.write(self.file_name)
+                self._write(tree)
                 return
 
     def list_of_customer(self, sort_params: list) -> list:
@@ -261,64 +1021,1668 @@ class XMLStorage(StorageStrategy):
         :param sort_params: list of parameters for sorting
         :return: List
         """
-        customers_all = []
-        customer_id, full_name, position, name_of_the_organization, email, phone = '', '', '', '', '', ''
-        tree = ElementTree.parse(self.file_name)
-        root = tree.getroot()
-        for element_customer in root:
-            for attribute in element_customer:
-                if attribute.tag == 'customer_id':
-                    customer_id = attribute.text
-                elif attribute.tag == 'full_name':
-                    full_name = attribute.text
-                elif attribute.tag == 'position':
-                    position = attribute.text
-                elif attribute.tag == 'name_of_the_organization':
-                    name_of_the_organization = attribute.text
-                elif attribute.tag == 'email':
-                    email = attribute.text
-                elif attribute.tag == 'phone':
-                    phone = attribute.text
-            customers_all.append(Customer(customer_id, full_name, position, name_of_the_organization, email, phone))
+        customers_all = [self._element_to_customer(element_customer) for element_customer in self._iter_elements()]
         if len(sort_params) > 0:
             customers_all.sort(key=attrgetter(*sort_params))
-            return customers_all
-        else:
-            return customers_all
+        return customers_all
 
+    def iter_customers(self, sort_params: list) -> Iterator[Customer]:
+        """
+        Yields all customers in the storage one by one,
+        unsorted customers are read from the file as they are yielded, so memory use does not depend on its size
+        :param sort_params: list of parameters for sorting
+        :return: Iterator
+        """
+        if len(sort_params) > 0:
+            yield from self.list_of_customer(sort_params)
+            return
+        for element_customer in self._iter_elements():
+            yield self._element_to_customer(element_customer)
 
-class DataBaseStorage(StorageStrategy):
-    def __init__(self, db_name: str, db_user: str, db_password: str, db_host: str, db_port: str) -> None:
-        self.db_name = db_name
-        self.db_user = db_user
-        self.db_password = db_password
-        self.db_host = db_host
-        self.db_port = db_port
-
-    def insert_customer(self, customer: Customer) -> None:
+    def import_customers(self, customers: Iterable[Customer]) -> int:
         """
-        Inserts a customer instance into the storage
-        :param customer: Customer
-        :return: None
+        Appends the customers that are not in the storage yet with a single parse and write of the file,
+        customers with an existing 'customer_id' are skipped
+        :param customers: customers to insert
+        :return: number of inserted customers
         """
-        query = f"""
-        INSERT INTO 
-            customers (customer_id, full_name, position, name_of_the_organization, email, phone) 
-        VALUES (
-            '{customer.customer_id}', 
-            '{customer.full_name}',
-            '{customer.position}',
-            '{customer.name_of_the_organization}',
-            '{customer.email}',
-            '{customer.phone}'
-            );
-        """
-        with create_connection(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port) as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                connection.commit()
+        tree = ElementTree.parse(self.file_name)
+        root = tree.getroot()
+        customer_ids = {element.text for element in root.iterfind("customer/customer_id")}
+        inserted = 0
+        for customer in customers:
+            if customer.customer_id in customer_ids:
+                continue
+            customer_ids.add(customer.customer_id)
+            root.append(self._customer_to_element(customer))
+            inserted += 1
+        if inserted > 0:
+            self._write(tree)
+        return inserted
 
-    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+    def insert_many(self, customers: list) -> list:
+        """
+        Inserts the customers with a single parse and write of the file if none of them exists in the storage
+        :param customers: list of customers
+        :return: IDs of the customers that already exist or repeat in the list, nothing is inserted if not empty
+        """
+        tree = ElementTree.parse(self.file_name)
+        root = tree.getroot()
+        customer_ids = {element.text for element in root.iterfind("customer/customer_id")}
+        existing_ids = duplicate_ids(customer.customer_id for customer in customers)
+        existing_ids.extend(customer.customer_id for customer in customers if customer.customer_id in customer_ids)
+        if existing_ids:
+            return existing_ids
+        for customer in customers:
+            root.append(self._customer_to_element(customer))
+        self._write(tree)
+        return []
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the customers with a single parse and write of the file if all of them exist in the storage
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: IDs of the customers that do not exist, nothing is updated if not empty
+        """
+        tree = ElementTree.parse(self.file_name)
+        elements = self._elements_by_id(tree.getroot())
+        missing_ids = [updatable_arguments["customer_id"] for updatable_arguments in updatable_arguments_list
+                       if updatable_arguments["customer_id"] not in elements]
+        if missing_ids:
+            return missing_ids
+        for updatable_arguments in updatable_arguments_list:
+            for attribute in elements[updatable_arguments["customer_id"]]:
+                if attribute.tag != "customer_id" and attribute.tag in updatable_arguments:
+                    attribute.text = updatable_arguments[attribute.tag]
+        self._write(tree)
+        return []
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes the customers with a single parse and write of the file if all of them exist in the storage
+        :param customer_ids: list of customer IDs
+        :return: IDs of the customers that do not exist, nothing is removed if not empty
+        """
+        tree = ElementTree.parse(self.file_name)
+        root = tree.getroot()
+        elements = self._elements_by_id(root)
+        missing_ids = [customer_id for customer_id in customer_ids if customer_id not in elements]
+        missing_ids.extend(duplicate_ids(customer_ids))
+        if missing_ids:
+            return missing_ids
+        for customer_id in customer_ids:
+            root.remove(elements[customer_id])
+        self._write(tree)
+        return []
+
+    def _iter_elements(self) -> Iterator[ElementTree.Element]:
+        """
+        Parses the file incrementally and yields each 'customer' element once it is complete.
+        Yielded elements are removed from the document, so only one customer is kept in memory
+        """
+        with open(self.file_name, "rb") as file:
+            root = None
+            for event, element in ElementTree.iterparse(file, events=("start", "end")):
+                if root is None:
+                    root = element
+                elif event == "end" and element.tag == "customer":
+                    yield element
+                    root.clear()
+
+    def _write(self, tree: ElementTree.ElementTree) -> None:
+        tree.write(self.file_name)
+
+    def _stat_file(self) -> tuple:
+        file_stat = os.stat(self.file_name)
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    @staticmethod
+    def _elements_by_id(root: ElementTree.Element) -> dict:
+        """
+        Returns the 'customer' elements by customer ID
+        """
+        return {element_customer.findtext("customer_id"): element_customer
+                for element_customer in root.iterfind("customer")}
+
+
+class IndexedXMLStorage(XMLStorage):
+    index_version = 2
+    customer_pattern = re.compile(rb"<customer[\s>].*?</customer>", re.S)
+
+    def __init__(self, file_name: str, index_attributes: tuple = ("customer_id",)) -> None:
+        """
+        XML storage with an index of the byte offsets of the 'customer' elements in the '<file_name>.index' file.
+        The index is rewritten with the XML file and rebuilt on open or before a search
+        if the XML file has been changed without it
+        :param file_name: XML file path
+        :param index_attributes: indexed arguments, 'customer_id' is always indexed
+        """
+        super().__init__(file_name)
+        validate_sort_params(index_attributes)
+        self.index_attributes = tuple(dict.fromkeys(("customer_id",) + tuple(index_attributes)))
+        self.index_file_name = f"{file_name}.index"
+        self.index = None
+        self._file_stamp = None
+        if not self._read_index():
+            self._write_index(ElementTree.parse(self.file_name).getroot())
+
+    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Reads only the element of the customer at the indexed offset if the argument is indexed,
+        other arguments are searched for in the whole file
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        if argument_name not in self.index_attributes or not self._index_is_current():
+            return super().find_customer(argument_name, argument_value)
+        positions = self.index[argument_name].get(argument_value)
+        if positions is None:
+            return None
+        with open(self.file_name, "rb") as file:
+            return self._read_element(file, positions[0])
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Reads only the elements at the offsets of the indexed equality or 'in' predicate with the fewest matches
+        and checks the other predicates on them, the whole file is read if no such predicate is indexed
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        indexed_predicates = [predicate for predicate in predicates
+                              if predicate.operator != "prefix" and predicate.argument_name in self.index_attributes]
+        if not indexed_predicates or not self._index_is_current():
+            return super().find_all(predicates)
+        planned, positions = None, None
+        for predicate in indexed_predicates:
+            index = self.index[predicate.argument_name]
+            predicate_positions = [position for value in predicate.values for position in index.get(value, ())]
+            if positions is None or len(predicate_positions) < len(positions):
+                planned, positions = predicate, predicate_positions
+        others = [predicate for predicate in predicates if predicate is not planned]
+        with open(self.file_name, "rb") as file:
+            customers = [self._read_element(file, position) for position in sorted(positions)]
+        return sorted((customer for customer in customers if all(predicate.matches(customer) for predicate in others)),
+                      key=attrgetter("customer_id"))
+
+    def _index_is_current(self) -> bool:
+        """
+        Rebuilds the index if the XML file has been changed without it
+        :return: True if the index can be used
+        """
+        if self._stat_file() != self._file_stamp:
+            self._write_index(ElementTree.parse(self.file_name).getroot())
+        return self.index is not None
+
+    def _read_element(self, file, position: list) -> Customer:
+        offset, length = position
+        file.seek(offset)
+        return self._element_to_customer(ElementTree.fromstring(file.read(length)))
+
+    def _write(self, tree: ElementTree.ElementTree) -> None:
+        super()._write(tree)
+        self._write_index(tree.getroot())
+
+    def _read_index(self) -> bool:
+        """
+        Loads the index file if it was written for the current XML file and the same arguments
+        :return: True if the index can be used
+        """
+        try:
+            with open(self.index_file_name, encoding="utf-8") as file:
+                index_data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        file_stamp = self._stat_file()
+        if index_data.get("version") != self.index_version \
+                or index_data.get("attributes") != list(self.index_attributes) \
+                or tuple(index_data.get("file_stamp", ())) != file_stamp:
+            return False
+        self.index = index_data["records"]
+        self._file_stamp = file_stamp
+        return True
+
+    def _write_index(self, root: ElementTree.Element) -> None:
+        """
+        Finds the byte range of every 'customer' element of the XML file and writes the index file.
+        The index is not used if the elements can not be matched to the ranges
+        """
+        with open(self.file_name, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            spans = [match.span() for match in self.customer_pattern.finditer(content)]
+        elements = root.findall("customer")
+        self._file_stamp = self._stat_file()
+        if len(spans) != len(elements):
+            self.index = None
+            return
+        index = {attribute_name: dict() for attribute_name in self.index_attributes}
+        for element_customer, (start, end) in zip(elements, spans):
+            for attribute_name in self.index_attributes:
+                value = element_customer.findtext(attribute_name)
+                if value is not None:
+                    index[attribute_name].setdefault(value, []).append([start, end - start])
+        self.index = index
+        index_data = dict(version=self.index_version, attributes=list(self.index_attributes),
+                          file_stamp=list(self._file_stamp), records=index)
+        temp_file_name = f"{self.index_file_name}.tmp"
+        with open(temp_file_name, "w", encoding="utf-8") as file:
+            json.dump(index_data, file, ensure_ascii=False)
+        os.replace(temp_file_name, self.index_file_name)
+
+
+class FixedRecordStorage(StorageStrategy):
+    field_widths = {
+        "customer_id": 9,
+        "full_name": 240,
+        "position": 240,
+        "name_of_the_organization": 240,
+        "email": 160,
+        "phone": 11
+    }
+    magic = b"HBKREC01"
+    index_magic = b"HBKIDX01"
+    header = struct.Struct("<8sIqqq")
+    header_size = 64
+    index_header = struct.Struct("<8sqqq")
+    index_slot = struct.Struct("<B9sq")
+    free, used = 0, 1
+    slot_empty, slot_used, slot_deleted = 0, 1, 2
+    max_index_load = 0.7
+    _open_storages = weakref.WeakSet()
+
+    def __init__(self, file_name: str, initial_capacity: int = 1024) -> None:
+        """
+        Storage of fixed-width records in a memory-mapped file.
+        Field widths are the column sizes from 'docker/init.sql' in UTF-8 bytes, twice the size for text columns.
+        Deleted records are linked into a free list and reused.
+        The '<file_name>.idx' file holds a hash table from 'customer_id' to the record number,
+        it is rebuilt from the records if it is missing or does not match the data file
+        :param file_name: data file path
+        :param initial_capacity: number of records a new file has room for
+        """
+        self.file_name = file_name
+        self.index_file_name = f"{file_name}.idx"
+        self.record_size = 1 + sum(self.field_widths.values())
+        self.field_offsets = dict()
+        offset = 1
+        for attribute_name, width in self.field_widths.items():
+            self.field_offsets[attribute_name] = (offset, width)
+            offset += width
+
+        if not os.path.exists(file_name):
+            with open(file_name, "wb") as file:
+                file.write(self.header.pack(self.magic, self.record_size, 0, -1, 0).ljust(self.header_size, b"\0"))
+                file.truncate(self.header_size + initial_capacity * self.record_size)
+        self._index_file = None
+        self._index_map = None
+        self._file = open(file_name, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, record_size, self.record_count, self.free_head, self.live_count = \
+            self.header.unpack_from(self._map, 0)
+        if magic != self.magic or record_size != self.record_size:
+            self.close()
+            raise CustomerException(f"{file_name} is not a customer record file")
+
+        if not self._open_index():
+            self._rebuild_index()
+        self._open_storages.add(self)
+
+    def insert_customer(self, customer: Customer) -> None:
+        """
+        Writes the customer into a free record or appends a record,
+        an existing customer with the same ID is overwritten
+        :param customer: Customer
+        :return: None
+        """
+        values = {attribute_name: self._encode(attribute_name, getattr(customer, attribute_name))
+                  for attribute_name in self.field_widths}
+        record = self._index_find(values["customer_id"])
+        if record is None:
+            record = self._allocate_record()
+            self.live_count += 1
+            self._index_insert(values["customer_id"], record)
+        base = self._record_offset(record)
+        self._map[base] = self.used
+        for attribute_name, value in values.items():
+            offset, width = self.field_offsets[attribute_name]
+            self._map[base + offset:base + offset + width] = value
+        self._write_header()
+
+    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Looks a customer up in the index by 'customer_id',
+        other arguments are compared record by record in the mapped file
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        if argument_name not in self.field_offsets:
+            return None
+        try:
+            value = self._encode(argument_name, argument_value)
+        except CustomerException:
+            return None
+        if argument_name == "customer_id":
+            record = self._index_find(value)
+            return None if record is None else self._read_record(record)
+        offset, width = self.field_offsets[argument_name]
+        for record in range(self.record_count):
+            base = self._record_offset(record)
+            if self._map[base] == self.used and self._map[base + offset:base + offset + width] == value:
+                return self._read_record(record)
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Reads only the records found in the index if there is an equality or 'in' predicate on 'customer_id',
+        otherwise compares every record
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        planned = next((predicate for predicate in predicates
+                        if predicate.argument_name == "customer_id" and predicate.operator != "prefix"), None)
+        if planned is None:
+            return super().find_all(predicates)
+        others = [predicate for predicate in predicates if predicate is not planned]
+        customers = []
+        for value in planned.values:
+            try:
+                record = self._index_find(self._encode("customer_id", value))
+            except CustomerException:
+                continue
+            if record is not None:
+                customer = self._read_record(record)
+                if all(predicate.matches(customer) for predicate in others):
+                    customers.append(customer)
+        return sorted(customers, key=attrgetter("customer_id"))
+
+    def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        """
+        Overwrites the updated fields of the customer record in place
+        :param customer: Customer
+        :param updatable_arguments: dict with updatable arguments
+        :return: None
+        """
+        record = self._index_find(self._encode("customer_id", customer.customer_id))
+        if record is None:
+            return
+        values = {attribute_name: self._encode(attribute_name, updatable_arguments[attribute_name])
+                  for attribute_name in self.field_widths
+                  if attribute_name != "customer_id" and attribute_name in updatable_arguments}
+        base = self._record_offset(record)
+        for attribute_name, value in values.items():
+            offset, width = self.field_offsets[attribute_name]
+            self._map[base + offset:base + offset + width] = value
+
+    def delete_customer(self, customer: Customer) -> None:
+        """
+        Marks the customer record as free and links it into the free list
+        :param customer: Customer
+        :return: None
+        """
+        key = self._encode("customer_id", customer.customer_id)
+        record = self._index_find(key)
+        if record is None:
+            return
+        base = self._record_offset(record)
+        self._map[base] = self.free
+        self._map[base + 1:base + 9] = self.free_head.to_bytes(8, "little", signed=True)
+        self.free_head = record
+        self.live_count -= 1
+        self._index_delete(key)
+        self._write_header()
+
+    def list_of_customer(self, sort_params: list) -> list:
+        """
+        Reads all used records
+        and returns the result
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        customers_all = [self._read_record(record) for record in range(self.record_count)
+                         if self._map[self._record_offset(record)] == self.used]
+        if len(sort_params) > 0:
+            customers_all.sort(key=attrgetter(*sort_params))
+        return customers_all
+
+    def flush(self) -> None:
+        """
+        Writes the changed pages of both files to disk
+        """
+        if self._map is not None:
+            self._map.flush()
+        if self._index_map is not None:
+            self._index_map.flush()
+
+    def close(self) -> None:
+        """
+        Flushes and closes both files
+        """
+        self._open_storages.discard(self)
+        self.flush()
+        for resource in (self._index_map, self._index_file, self._map, self._file):
+            if resource is not None:
+                resource.close()
+        self._map = self._file = self._index_map = self._index_file = None
+
+    @classmethod
+    def _close_open_storages(cls) -> None:
+        """
+        Closes the storages that are still open when the program exits,
+        the set holds weak references so that unused storages can be freed
+        """
+        for storage in list(cls._open_storages):
+            storage.close()
+
+    def _record_offset(self, record: int) -> int:
+        return self.header_size + record * self.record_size
+
+    def _read_record(self, record: int) -> Customer:
+        base = self._record_offset(record)
+        values = []
+        for offset, width in self.field_offsets.values():
+            values.append(self._map[base + offset:base + offset + width].rstrip(b"\0").decode("utf-8"))
+        return Customer(*values)
+
+    def _encode(self, attribute_name: str, value: str) -> bytes:
+        encoded_value = value.encode("utf-8")
+        width = self.field_widths[attribute_name]
+        if len(encoded_value) > width:
+            raise CustomerException(f"{attribute_name} is longer than {width} bytes")
+        return encoded_value.ljust(width, b"\0")
+
+    def _write_header(self) -> None:
+        self.header.pack_into(self._map, 0, self.magic, self.record_size, self.record_count, self.free_head,
+                              self.live_count)
+
+    def _allocate_record(self) -> int:
+        """
+        Takes the first record of the free list or appends a record, growing the file twice if it is full
+        """
+        if self.free_head >= 0:
+            record = self.free_head
+            base = self._record_offset(record)
+            self.free_head = int.from_bytes(self._map[base + 1:base + 9], "little", signed=True)
+            return record
+        record = self.record_count
+        self.record_count += 1
+        if self._record_offset(self.record_count) > len(self._map):
+            self._map.resize(self._record_offset(2 * self.record_count))
+        return record
+
+    def _open_index(self) -> bool:
+        """
+        Maps the index file if it exists and matches the data file
+        :return: True if the index can be used
+        """
+        if not os.path.exists(self.index_file_name):
+            return False
+        self._index_file = open(self.index_file_name, "r+b")
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0)
+        magic, self.index_capacity, self.index_filled, index_live = self.index_header.unpack_from(self._index_map, 0)
+        expected_size = self.header_size + self.index_capacity * self.index_slot.size
+        if magic == self.index_magic and index_live == self.live_count and len(self._index_map) == expected_size:
+            return True
+        self._index_map.close()
+        self._index_file.close()
+        self._index_map = self._index_file = None
+        return False
+
+    def _rebuild_index(self, capacity: int = 1024) -> None:
+        """
+        Creates the index file from the used records, the capacity is doubled until they fit the load factor
+        """
+        while capacity * self.max_index_load <= self.live_count:
+            capacity *= 2
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_file.close()
+        with open(self.index_file_name, "wb") as file:
+            file.truncate(self.header_size + capacity * self.index_slot.size)
+        self._index_file = open(self.index_file_name, "r+b")
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0)
+        self.index_capacity = capacity
+        self.index_filled = 0
+        for record in range(self.record_count):
+            base = self._record_offset(record)
+            if self._map[base] == self.used:
+                offset, width = self.field_offsets["customer_id"]
+                self._index_insert(self._map[base + offset:base + offset + width], record)
+        self._write_index_header()
+
+    def _write_index_header(self) -> None:
+        self.index_header.pack_into(self._index_map, 0, self.index_magic, self.index_capacity, self.index_filled,
+                                    self.live_count)
+
+    def _index_probe(self, key: bytes) -> tuple:
+        """
+        Walks the hash table from the slot of the key
+        :return: the slot of the key and its record, or the slot to insert the key and None
+        """
+        mask = self.index_capacity - 1
+        slot = zlib.crc32(key) & mask
+        first_deleted = None
+        while True:
+            state, slot_key, record = self.index_slot.unpack_from(self._index_map,
+                                                                  self.header_size + slot * self.index_slot.size)
+            if state == self.slot_empty:
+                return (slot if first_deleted is None else first_deleted), None
+            if state == self.slot_deleted:
+                if first_deleted is None:
+                    first_deleted = slot
+            elif slot_key == key:
+                return slot, record
+            slot = (slot + 1) & mask
+
+    def _index_find(self, key: bytes) -> int:
+        _, record = self._index_probe(key)
+        return record
+
+    def _index_insert(self, key: bytes, record: int) -> None:
+        """
+        Stores the record number of the key. When the used and deleted slots reach the load factor,
+        the table is rebuilt without the deleted slots, twice as large only if the live keys fill half of it,
+        so that deletes and inserts alternating do not grow the file
+        """
+        if self.index_filled + 1 > self.index_capacity * self.max_index_load:
+            capacity = self.index_capacity
+            if 2 * self.live_count > capacity * self.max_index_load:
+                capacity *= 2
+            self._rebuild_index(capacity)
+        slot, _ = self._index_probe(key)
+        offset = self.header_size + slot * self.index_slot.size
+        if self._index_map[offset] == self.slot_empty:
+            self.index_filled += 1
+        self.index_slot.pack_into(self._index_map, offset, self.slot_used, key, record)
+        self._write_index_header()
+
+    def _index_delete(self, key: bytes) -> None:
+        slot, record = self._index_probe(key)
+        if record is None:
+            return
+        self._index_map[self.header_size + slot * self.index_slot.size] = self.slot_deleted
+        self._write_index_header()
+
+
+atexit.register(FixedRecordStorage._close_open_storages)
+
+
+class CachedXMLStorage(XMLStorage):
+    thread_safe = True
+
+    def __init__(self, file_name: str, flush_interval: float = 1.0) -> None:
+        """
+        XML storage that keeps the parsed customers in memory, in an InMemoryStorage with its hash and sorted indexes.
+        The cache is reloaded when the file is changed by another process and the unsaved changes are applied
+        on top of it, so that a write does not drop the customers changed by the other process.
+        Changes are written to the file at most once per 'flush_interval' seconds and on exit
+        :param file_name: XML file path
+        :param flush_interval: seconds between writes of changed data, 0 writes every change immediately
+        """
+        super().__init__(file_name)
+        self.flush_interval = flush_interval
+        self.cache = InMemoryStorage()
+        self._changed_ids = dict()
+        self._file_stamp = None
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+
+    @property
+    def customers(self) -> dict:
+        return self.cache.customers
+
+    @property
+    def sorted_indexes(self) -> SortedIndexes:
+        return self.cache.sorted_indexes
+
+    def insert_customer(self, customer: Customer) -> None:
+        """
+        Inserts a customer instance into the cache
+        and schedules writing the file
+        :param customer: Customer
+        :return: None
+        """
+        with self._lock:
+            self._load()
+            self.cache.insert_customer(self._copy(customer))
+            self._mark_dirty([customer.customer_id])
+
+    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Searches for a customer in the indexes of the cache by argument name and value
+        and returns the result
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        with self._lock:
+            self._load()
+            return self.cache.find_customer(argument_name, argument_value)
+
+    def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        """
+        Updates the customer instance in the cache
+        and schedules writing the file
+        :param customer: Customer
+        :param updatable_arguments: dict with updatable arguments
+        """
+        with self._lock:
+            self._load()
+            if customer.customer_id in self.cache.customers:
+                self.cache.update_customer(customer, updatable_arguments)
+                self._mark_dirty([customer.customer_id])
+
+    def delete_customer(self, customer: Customer) -> None:
+        """
+        Remove the customer instance from the cache
+        and schedules writing the file
+        :param customer: Customer
+        :return: None
+        """
+        with self._lock:
+            self._load()
+            if customer.customer_id in self.cache.customers:
+                self.cache.delete_customer(customer)
+                self._mark_dirty([customer.customer_id])
+
+    def list_of_customer(self, sort_params: list) -> list:
+        """
+        Returns all customers in the cache
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        with self._lock:
+            self._load()
+            return self.cache.list_of_customer(sort_params)
+
+    def iter_customers(self, sort_params: list) -> Iterator[Customer]:
+        """
+        Yields all customers in the cache one by one
+        :param sort_params: list of parameters for sorting
+        :return: Iterator
+        """
+        yield from self.list_of_customer(sort_params)
+
+    def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns a page of customers from the sorted index
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the page cursor, values of 'page_sort_params' of the last customer of the previous page
+        :return: List
+        """
+        with self._lock:
+            self._load()
+            return self.cache.list_page(sort_params, limit, offset, after)
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Searches for the customers in the indexes of the cache
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        with self._lock:
+            self._load()
+            return self.cache.find_all(predicates)
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Inserts the customers that are not in the cache yet and schedules a single write of the file,
+        customers with an existing 'customer_id' are skipped
+        :param customers: customers to insert
+        :return: number of inserted customers
+        """
+        with self._lock:
+            self._load()
+            inserted_ids = []
+            for customer in customers:
+                if customer.customer_id not in self.cache.customers:
+                    self.cache.insert_customer(self._copy(customer))
+                    inserted_ids.append(customer.customer_id)
+            if inserted_ids:
+                self._mark_dirty(inserted_ids)
+            return len(inserted_ids)
+
+    def insert_many(self, customers: list) -> list:
+        """
+        Inserts the customers into the cache if none of them exists and schedules a single write of the file
+        :param customers: list of customers
+        :return: IDs of the customers that already exist or repeat in the list, nothing is inserted if not empty
+        """
+        with self._lock:
+            self._load()
+            existing_ids = duplicate_ids(customer.customer_id for customer in customers)
+            existing_ids.extend(customer.customer_id for customer in customers
+                                if customer.customer_id in self.cache.customers)
+            if existing_ids:
+                return existing_ids
+            self.import_customers(customers)
+            return []
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the customers in the cache if all of them exist and schedules a single write of the file
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: IDs of the customers that do not exist, nothing is updated if not empty
+        """
+        with self._lock:
+            self._load()
+            missing_ids = self.cache.update_many(updatable_arguments_list)
+            if not missing_ids and updatable_arguments_list:
+                self._mark_dirty([updatable_arguments["customer_id"]
+                                  for updatable_arguments in updatable_arguments_list])
+            return missing_ids
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes the customers from the cache if all of them exist and schedules a single write of the file
+        :param customer_ids: list of customer IDs
+        :return: IDs of the customers that do not exist, nothing is removed if not empty
+        """
+        with self._lock:
+            self._load()
+            missing_ids = self.cache.delete_many(customer_ids)
+            if not missing_ids and customer_ids:
+                self._mark_dirty(customer_ids)
+            return missing_ids
+
+    def flush(self) -> None:
+        """
+        Writes the cached customers to the file if they have been changed.
+        Changes made to the file by another process since it was read are merged in first
+        :return: None
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._load()
+            root = ElementTree.Element('data')
+            for customer in self.cache.customers.values():
+                root.append(self._customer_to_element(customer))
+            temp_file_name = f"{self.file_name}.tmp"
+            ElementTree.ElementTree(root).write(temp_file_name)
+            os.replace(temp_file_name, self.file_name)
+            self._file_stamp = self._stat_file()
+            self._changed_ids.clear()
+            self._dirty = False
+
+    def _load(self) -> None:
+        """
+        Parses the file if it is not cached yet or has been changed by another process.
+        The customers changed here and not written yet are kept as they are in the cache,
+        the other customers are taken from the file
+        """
+        file_stamp = self._stat_file()
+        if file_stamp == self._file_stamp:
+            return
+        cache = InMemoryStorage()
+        for element_customer in ElementTree.parse(self.file_name).getroot():
+            cache.insert_customer(self._element_to_customer(element_customer))
+        for customer_id in self._changed_ids:
+            customer = self.cache.customers.get(customer_id)
+            if customer is not None:
+                cache.insert_customer(customer)
+            elif customer_id in cache.customers:
+                cache.delete_customer(cache.customers[customer_id])
+        self.cache = cache
+        self._file_stamp = file_stamp
+
+    def _mark_dirty(self, customer_ids: list) -> None:
+        self._changed_ids.update(dict.fromkeys(customer_ids))
+        self._dirty = True
+        if self.flush_interval <= 0:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @staticmethod
+    def _copy(customer: Customer) -> Customer:
+        return Customer(customer.customer_id, customer.full_name, customer.position,
+                        customer.name_of_the_organization, customer.email, customer.phone)
+
+
+class JournaledXMLStorage(CachedXMLStorage):
+    fsync_policies = ("always", "interval", "never")
+
+    def __init__(self, file_name: str, fsync: str = "always", fsync_interval: float = 1.0,
+                 compact_after: int = 10000) -> None:
+        """
+        XML storage that appends every change to the '<file_name>.journal' file instead of rewriting the XML file.
+        On start the customers are read from the XML snapshot and the journal is replayed over them,
+        'compact' rewrites the snapshot and empties the journal
+        :param file_name: XML file path
+        :param fsync: 'always' syncs the journal after every change, 'interval' at most once per 'fsync_interval'
+        seconds, 'never' leaves it to the operating system
+        :param fsync_interval: seconds between syncs for the 'interval' policy
+        :param compact_after: number of journal entries after which the snapshot is rewritten in the background
+        """
+        if fsync not in self.fsync_policies:
+            raise CustomerException(f"Unknown fsync policy: {fsync}")
+        super().__init__(file_name, flush_interval=0)
+        self.journal_file_name = f"{file_name}.journal"
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_after = compact_after
+        self.journal_entries = 0
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+        self._compacting = None
+        super()._load()
+        self._replay()
+        self._journal = open(self.journal_file_name, "ab")
+
+    def insert_customer(self, customer: Customer) -> None:
+        """
+        Inserts a customer instance into the cache
+        and appends it to the journal
+        :param customer: Customer
+        :return: None
+        """
+        with self._lock:
+            super().insert_customer(customer)
+            self._append([self._insert_entry(customer)])
+
+    def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        """
+        Updates the customer instance in the cache
+        and appends the change to the journal
+        :param customer: Customer
+        :param updatable_arguments: dict with updatable arguments
+        """
+        with self._lock:
+            if customer.customer_id not in self.customers:
+                return
+            super().update_customer(customer, updatable_arguments)
+            self._append([self._update_entry(customer.customer_id, updatable_arguments)])
+
+    def delete_customer(self, customer: Customer) -> None:
+        """
+        Remove the customer instance from the cache
+        and appends the removal to the journal
+        :param customer: Customer
+        :return: None
+        """
+        with self._lock:
+            if customer.customer_id not in self.customers:
+                return
+            super().delete_customer(customer)
+            self._append([{"op": "delete", "customer_id": customer.customer_id}])
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Inserts the customers that are not in the cache yet and appends them to the journal with a single sync,
+        customers with an existing 'customer_id' are skipped
+        :param customers: customers to insert
+        :return: number of inserted customers
+        """
+        with self._lock:
+            new_customers = dict()
+            for customer in customers:
+                if customer.customer_id not in self.customers and customer.customer_id not in new_customers:
+                    new_customers[customer.customer_id] = customer
+            inserted = super().import_customers(new_customers.values())
+            self._append([self._insert_entry(customer) for customer in new_customers.values()])
+            return inserted
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the customers in the cache if all of them exist and appends the changes to the journal
+        with a single sync
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: IDs of the customers that do not exist, nothing is updated if not empty
+        """
+        with self._lock:
+            missing_ids = super().update_many(updatable_arguments_list)
+            if not missing_ids:
+                self._append([self._update_entry(updatable_arguments["customer_id"], updatable_arguments)
+                              for updatable_arguments in updatable_arguments_list])
+            return missing_ids
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes the customers from the cache if all of them exist and appends the removals to the journal
+        with a single sync
+        :param customer_ids: list of customer IDs
+        :return: IDs of the customers that do not exist, nothing is removed if not empty
+        """
+        with self._lock:
+            missing_ids = super().delete_many(customer_ids)
+            if not missing_ids:
+                self._append([{"op": "delete", "customer_id": customer_id} for customer_id in customer_ids])
+            return missing_ids
+
+    def flush(self) -> None:
+        """
+        Syncs the journal to disk if it has unsynced changes
+        :return: None
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._unsynced and getattr(self, "_journal", None) is not None and not self._journal.closed:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+                self._unsynced = False
+            self._last_sync = time.monotonic()
+
+    def compact(self) -> None:
+        """
+        Writes the cached customers to the XML file and empties the journal.
+        If the process stops in between, replaying the journal over the new snapshot gives the same customers
+        :return: None
+        """
+        with self._lock:
+            if self.journal_entries == 0:
+                return
+            root = ElementTree.Element('data')
+            for customer in self.customers.values():
+                root.append(self._customer_to_element(customer))
+            temp_file_name = f"{self.file_name}.tmp"
+            with open(temp_file_name, "wb") as file:
+                ElementTree.ElementTree(root).write(file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_file_name, self.file_name)
+            self._journal.truncate(0)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self.journal_entries = 0
+            self._unsynced = False
+            self._dirty = False
+            self._file_stamp = self._stat_file()
+
+    def close(self) -> None:
+        """
+        Syncs and closes the journal
+        """
+        with self._lock:
+            self.flush()
+            self._journal.close()
+
+    def _load(self) -> None:
+        """
+        The customers are loaded once on start, the journal is the only writer of the file
+        """
+
+    def _mark_dirty(self, customer_ids: list) -> None:
+        self._dirty = True
+
+    def _append(self, entries: list) -> None:
+        """
+        Appends the entries to the journal and syncs it according to the fsync policy
+        """
+        if not entries:
+            return
+        self._journal.write(b"".join(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+                                     for entry in entries))
+        self._journal.flush()
+        self.journal_entries += len(entries)
+        self._unsynced = True
+        since_sync = time.monotonic() - self._last_sync
+        if self.fsync == "always" or (self.fsync == "interval" and since_sync >= self.fsync_interval):
+            self.flush()
+        elif self.fsync == "interval" and self._timer is None:
+            self._timer = threading.Timer(self.fsync_interval - since_sync, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+        if self.journal_entries >= self.compact_after and self._compacting is None:
+            self._compacting = threading.Thread(target=self._compact_in_background, daemon=True)
+            self._compacting.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        finally:
+            self._compacting = None
+
+    def _replay(self) -> None:
+        """
+        Applies the journal entries to the customers read from the snapshot.
+        A torn last entry left by a crash is cut off
+        """
+        if not os.path.exists(self.journal_file_name):
+            return
+        valid_size = 0
+        with open(self.journal_file_name, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(entry)
+                valid_size += len(line)
+                self.journal_entries += 1
+        if valid_size < os.path.getsize(self.journal_file_name):
+            os.truncate(self.journal_file_name, valid_size)
+        if self.journal_entries > 0:
+            self._dirty = True
+
+    def _apply(self, entry: dict) -> None:
+        if entry["op"] == "insert":
+            self.cache.insert_customer(Customer(*entry["customer"]))
+            return
+        customer = self.cache.customers.get(entry["customer_id"])
+        if customer is None:
+            return
+        if entry["op"] == "update":
+            self.cache.update_customer(customer, entry["arguments"])
+        elif entry["op"] == "delete":
+            self.cache.delete_customer(customer)
+
+    @staticmethod
+    def _insert_entry(customer: Customer) -> dict:
+        return {"op": "insert", "customer": [getattr(customer, attribute_name)
+                                             for attribute_name in CUSTOMER_ATTRIBUTES]}
+
+    @staticmethod
+    def _update_entry(customer_id: str, updatable_arguments: dict) -> dict:
+        arguments = {attribute_name: value for attribute_name, value in updatable_arguments.items()
+                     if attribute_name != "customer_id" and attribute_name in CUSTOMER_ATTRIBUTES}
+        return {"op": "update", "customer_id": customer_id, "arguments": arguments}
+
+
+class DataBaseStorage(StorageStrategy):
+    thread_safe = True
+
+    def __init__(self, db_name: str, db_user: str, db_password: str, db_host: str, db_port: str,
+                 pool: ConnectionPool = None, itersize: int = 2000, migrate: bool = False) -> None:
+        """
+        Storage of customers in the database
+        :param pool: ConnectionPool, a new connection is opened for every call if None
+        :param itersize: number of rows fetched at a time by 'iter_customers'
+        :param migrate: apply the migrations of 'handbook/migrations' that are not applied to the database yet
+        """
+        self.db_name = db_name
+        self.db_user = db_user
+        self.db_password = db_password
+        self.db_host = db_host
+        self.db_port = db_port
+        self.pool = pool
+        self.itersize = itersize
+        self.import_batch_size = 50000
+        if migrate:
+            with self._connect() as connection:
+                apply_migrations(connection)
+
+    @contextmanager
+    def _connect(self):
+        """
+        Borrows a connection from the pool if one is configured,
+        otherwise opens a new connection and closes it afterwards
+        """
+        if self.pool is not None:
+            with self.pool.connection() as connection:
+                yield connection
+            return
+        connection = create_connection(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port)
+        try:
+            yield connection
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def insert_customer(self, customer: Customer) -> None:
+        """
+        Inserts a customer instance into the storage
+        :param customer: Customer
+        :return: None
+        """
+        query = """
+        INSERT INTO 
+            customers (customer_id, full_name, position, name_of_the_organization, email, phone) 
+        VALUES (%s, %s, %s, %s, %s, %s);
+        """
+        values = [getattr(customer, attribute_name) for attribute_name in CUSTOMER_ATTRIBUTES]
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                self._execute(connection, cursor, "insert_customer", query, values)
+                connection.commit()
+
+    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Searches for a customer in the storage by argument name and value
+        and returns the result
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        validate_sort_params([argument_name])
+        query = f"""
+        SELECT *
+        FROM customers 
+        WHERE 
+            {argument_name} = %s
+        LIMIT 1;
+        """
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                self._execute(connection, cursor, f"find_customer_by_{argument_name}", query, [argument_value])
+                result = cursor.fetchone()
+                if result is not None:
+                    customer_id, full_name, position, name_of_the_organization, email, phone = result
+                    customer = Customer(customer_id, full_name, position, name_of_the_organization, email, phone)
+                    return customer
+
+    def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        """
+        Updates the customer instance in the storage
+        :param customer: Customer
+        :param updatable_arguments: dict with updatable arguments
+        :return: None
+        """
+        query = """
+        UPDATE customers 
+        SET 
+            full_name = %s,
+            position = %s,
+            name_of_the_organization = %s,
+            email = %s,
+            phone = %s
+        WHERE 
+            customer_id = %s;
+        """
+        values = [updatable_arguments.get(attribute_name, getattr(customer, attribute_name))
+                  for attribute_name in CUSTOMER_ATTRIBUTES if attribute_name != "customer_id"]
+        values.append(customer.customer_id)
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                self._execute(connection, cursor, "update_customer", query, values)
+                connection.commit()
+
+    def delete_customer(self, customer: Customer) -> None:
+        """
+        Remove the customer instance in the storage
+        :param customer: Customer
+        :return: None
+        """
+        self.delete_customer_by_id(customer.customer_id)
+
+    def list_of_customer(self, sort_params: list) -> list:
+        """
+        Searches for all customers in the storage
+        and returns the result
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        query = self._list_query(sort_params)
+        customers = []
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query)
+                result = cursor.fetchall()
+                for row in result:
+                    customer_id, full_name, position, name_of_the_organization, email, phone = row
+                    customer = Customer(customer_id, full_name, position, name_of_the_organization, email, phone)
+                    customers.append(customer)
+                return customers
+
+    def iter_customers(self, sort_params: list) -> Iterator[Customer]:
+        """
+        Yields all customers in the storage one by one.
+        Uses a server-side cursor, so only 'itersize' rows are held by the client at a time
+        :param sort_params: list of parameters for sorting
+        :return: Iterator
+        """
+        query = self._list_query(sort_params)
+        with self._connect() as connection:
+            with connection.cursor(name=f"customers_{uuid4().hex}") as cursor:
+                cursor.itersize = self.itersize
+                cursor.execute(query)
+                for row in cursor:
+                    yield Customer(*row)
+
+    def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns a page of customers using a row comparison on the sort columns,
+        so that the database can start the page from an index instead of skipping the previous rows
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the page cursor, values of 'page_sort_params' of the last customer of the previous page
+        :return: List
+        """
+        page_params = page_sort_params(sort_params)
+        validate_sort_params(page_params)
+        columns = ", ".join(page_params)
+        query_params = []
+        condition = ""
+        if after is not None:
+            placeholders = ", ".join(["%s"] * len(page_params))
+            condition = f"WHERE ({columns}) > ({placeholders})"
+            query_params.extend(after)
+        query = f"""
+        SELECT * 
+        FROM customers 
+        {condition}
+        ORDER BY 
+            {columns}
+        LIMIT %s OFFSET %s;
+        """
+        query_params.extend([limit, offset])
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query, query_params)
+                return [Customer(*row) for row in cursor.fetchall()]
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Combines the predicates into one 'WHERE' clause, so that the database chooses the most selective index
+        from its statistics and checks the other conditions on the rows found by it.
+        Prefixes are searched with 'LIKE', served by the pattern and trigram indexes of 'handbook/migrations'
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        conditions = []
+        query_params = []
+        for predicate in predicates:
+            if predicate.operator == "eq":
+                conditions.append(f"{predicate.argument_name} = %s")
+                query_params.append(predicate.value)
+            elif predicate.operator == "in":
+                conditions.append(f"{predicate.argument_name} = ANY(%s)")
+                query_params.append(list(predicate.value))
+            else:
+                conditions.append(f"{predicate.argument_name} LIKE %s")
+                query_params.append(re.sub(r"([\\%_])", r"\\\1", predicate.value) + "%")
+        condition = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+        SELECT * 
+        FROM customers 
+        {condition}
+        ORDER BY 
+            customer_id;
+        """
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query, query_params)
+                return [Customer(*row) for row in cursor.fetchall()]
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Loads the customers with 'COPY FROM STDIN' into a temporary table in batches of 'import_batch_size'
+        and moves them into the 'customers' table in the same transaction,
+        customers with an existing 'customer_id' are skipped, of a repeated 'customer_id' the first customer is kept
+        :param customers: customers to insert
+        :return: number of inserted customers
+        """
+        inserted = 0
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                CREATE TEMPORARY TABLE customers_import 
+                    (LIKE customers INCLUDING DEFAULTS) 
+                ON COMMIT DROP;
+                """)
+                batch = []
+                for customer in customers:
+                    batch.append(customer)
+                    if len(batch) == self.import_batch_size:
+                        inserted += self._copy_batch(cursor, batch)
+                        batch = []
+                if batch:
+                    inserted += self._copy_batch(cursor, batch)
+                connection.commit()
+        return inserted
+
+    def insert_many(self, customers: list) -> list:
+        """
+        Inserts the customers in one transaction if none of them exists in the storage
+        :param customers: list of customers
+        :return: IDs of the customers that already exist or repeat in the list, nothing is inserted if not empty
+        """
+        query = """
+        INSERT INTO 
+            customers (customer_id, full_name, position, name_of_the_organization, email, phone) 
+        VALUES %s 
+        ON CONFLICT (customer_id) DO NOTHING 
+        RETURNING customer_id;
+        """
+        rows = [tuple(getattr(customer, attribute_name) for attribute_name in CUSTOMER_ATTRIBUTES)
+                for customer in customers]
+        existing_ids = duplicate_ids(customer.customer_id for customer in customers)
+        if existing_ids or not rows:
+            return existing_ids
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                inserted_ids = {row[0] for row in execute_values(cursor, query, rows, fetch=True)}
+                existing_ids = [customer.customer_id for customer in customers
+                                if customer.customer_id not in inserted_ids]
+                if existing_ids:
+                    connection.rollback()
+                else:
+                    connection.commit()
+        return existing_ids
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the customers with one statement if all of them exist in the storage,
+        arguments missing from a dict keep their stored values
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: IDs of the customers that do not exist, nothing is updated if not empty
+        """
+        query = """
+        UPDATE customers 
+        SET 
+            full_name = COALESCE(updates.full_name, customers.full_name),
+            position = COALESCE(updates.position, customers.position),
+            name_of_the_organization = COALESCE(updates.name_of_the_organization, 
+                                                customers.name_of_the_organization),
+            email = COALESCE(updates.email, customers.email),
+            phone = COALESCE(updates.phone, customers.phone)
+        FROM (VALUES %s) AS updates (customer_id, full_name, position, name_of_the_organization, email, phone)
+        WHERE 
+            customers.customer_id = updates.customer_id
+        RETURNING customers.customer_id;
+        """
+        rows = [tuple(updatable_arguments.get(attribute_name) for attribute_name in CUSTOMER_ATTRIBUTES)
+                for updatable_arguments in updatable_arguments_list]
+        if not rows:
+            return []
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                updated_ids = {row[0] for row in execute_values(cursor, query, rows, fetch=True)}
+                missing_ids = [updatable_arguments["customer_id"] for updatable_arguments in updatable_arguments_list
+                               if updatable_arguments["customer_id"] not in updated_ids]
+                if missing_ids:
+                    connection.rollback()
+                else:
+                    connection.commit()
+        return missing_ids
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes the customers with one statement if all of them exist in the storage
+        :param customer_ids: list of customer IDs
+        :return: IDs of the customers that do not exist, nothing is removed if not empty
+        """
+        query = """
+        DELETE 
+        FROM customers 
+        WHERE 
+            customer_id = ANY(%s)
+        RETURNING customer_id;
+        """
+        missing_ids = duplicate_ids(customer_ids)
+        if missing_ids or not customer_ids:
+            return missing_ids
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query, (list(customer_ids),))
+                deleted_ids = {row[0] for row in cursor.fetchall()}
+                missing_ids = [customer_id for customer_id in customer_ids if customer_id not in deleted_ids]
+                if missing_ids:
+                    connection.rollback()
+                else:
+                    connection.commit()
+        return missing_ids
+
+    def insert_new_customer(self, customer: Customer) -> bool:
+        """
+        Inserts the customer with a single statement that skips an existing 'customer_id'
+        :param customer: Customer
+        :return: True if the customer was inserted, False if it already exists
+        """
+        query = """
+        INSERT INTO 
+            customers (customer_id, full_name, position, name_of_the_organization, email, phone) 
+        VALUES (%s, %s, %s, %s, %s, %s) 
+        ON CONFLICT (customer_id) DO NOTHING 
+        RETURNING customer_id;
+        """
+        values = [getattr(customer, attribute_name) for attribute_name in CUSTOMER_ATTRIBUTES]
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                self._execute(connection, cursor, "insert_new_customer", query, values)
+                inserted = cursor.fetchone() is not None
+                connection.commit()
+        return inserted
+
+    def update_customer_by_id(self, updatable_arguments: dict) -> bool:
+        """
+        Updates the customer with a single statement that reports whether the customer exists
+        :param updatable_arguments: dict with updatable arguments and 'customer_id'
+        :return: True if the customer was updated, False if it does not exist
+        """
+        columns = [attribute_name for attribute_name in CUSTOMER_ATTRIBUTES
+                   if attribute_name != "customer_id" and attribute_name in updatable_arguments]
+        if columns:
+            assignments = ", ".join(f"{column} = %s" for column in columns)
+            query = f"""
+            UPDATE customers 
+            SET 
+                {assignments}
+            WHERE 
+                customer_id = %s
+            RETURNING customer_id;
+            """
+            statement_name = "update_customer_by_id_" + "_".join(str(CUSTOMER_ATTRIBUTES.index(column))
+                                                                 for column in columns)
+        else:
+            statement_name = "update_customer_by_id"
+            query = """
+            SELECT customer_id 
+            FROM customers 
+            WHERE 
+                customer_id = %s;
+            """
+        values = [updatable_arguments[column] for column in columns] + [updatable_arguments["customer_id"]]
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                self._execute(connection, cursor, statement_name, query, values)
+                updated = cursor.fetchone() is not None
+                connection.commit()
+        return updated
+
+    def delete_customer_by_id(self, customer_id: str) -> bool:
+        """
+        Removes the customer with a single statement that reports whether the customer exists
+        :param customer_id: customer ID
+        :return: True if the customer was removed, False if it does not exist
+        """
+        query = """
+        DELETE 
+        FROM customers 
+        WHERE 
+            customer_id = %s
+        RETURNING customer_id;
+        """
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                self._execute(connection, cursor, "delete_customer_by_id", query, [customer_id])
+                deleted = cursor.fetchone() is not None
+                connection.commit()
+        return deleted
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Reads all customers in one consistent snapshot with a server-side cursor
+        :return: context manager of the change position of the snapshot and an iterator of the customers,
+        changes from the position on are returned by 'changes_since'
+        """
+        with self._connect() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY;")
+                    cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot());")
+                    position = cursor.fetchone()[0]
+                with connection.cursor(name=f"customers_{uuid4().hex}") as cursor:
+                    cursor.itersize = self.itersize
+                    cursor.execute(self._list_query([]))
+                    yield position, (Customer(*row) for row in cursor)
+            finally:
+                connection.rollback()
+
+    def changes_since(self, position: int) -> tuple:
+        """
+        Reads the customers changed by the transactions that finished after the change position
+        from the 'customer_changes' table filled by the triggers of 'handbook/migrations'.
+        The position is a transaction ID, so a transaction that commits late is not skipped.
+        Changes older than 'change_retention' seconds are removed from the table and can be missed
+        :param position: change position returned by 'snapshot' or a previous call
+        :return: tuple of the new change position, the changed customers and the IDs of the removed customers
+        """
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot());")
+                new_position = cursor.fetchone()[0]
+                cursor.execute("""
+                SELECT DISTINCT customer_id 
+                FROM customer_changes 
+                WHERE 
+                    txid >= %s AND txid < %s;
+                """, (position, new_position))
+                changed_ids = [row[0] for row in cursor.fetchall()]
+                customers = []
+                if changed_ids:
+                    cursor.execute("""
+                    SELECT * 
+                    FROM customers 
+                    WHERE 
+                        customer_id = ANY(%s);
+                    """, (changed_ids,))
+                    customers = [Customer(*row) for row in cursor.fetchall()]
+                connection.commit()
+        found_ids = {customer.customer_id for customer in customers}
+        return new_position, customers, [customer_id for customer_id in changed_ids if customer_id not in found_ids]
+
+    def change_retention(self) -> float:
+        """
+        Returns the number of seconds for which the 'customer_changes' table keeps the changes
+        """
+        with self._connect() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT extract(epoch FROM customer_change_retention());")
+                retention = float(cursor.fetchone()[0])
+            connection.rollback()
+        return retention
+
+    def _execute(self, connection, cursor, statement_name: str, query: str, values: list) -> None:
+        """
+        Executes the query with the values passed separately from the SQL text.
+        Connections of the pool prepare the query as a named server-side statement on its first use,
+        so later calls skip parsing and planning
+        It is prepared again if the server no longer has it, so it must be the first query of the transaction
+        :param statement_name: name of the prepared statement, the same for every query with the same text
+        :param query: query with '%s' placeholders
+        :param values: query parameters
+        """
+        if self.pool is None:
+            cursor.execute(query, values)
+            return
+        prepared_statements = self.pool.prepared_statements(connection)
+        execute_query = f"EXECUTE {statement_name} ({', '.join(['%s'] * len(values))});"
+        if statement_name in prepared_statements:
+            try:
+                cursor.execute(execute_query, values)
+                return
+            except InvalidSqlStatementName:
+                connection.rollback()
+        numbers = count(1)
+        cursor.execute(f"PREPARE {statement_name} AS {re.sub('%s', lambda _: f'${next(numbers)}', query)}")
+        prepared_statements.add(statement_name)
+        cursor.execute(execute_query, values)
+
+    @staticmethod
+    def _copy_batch(cursor, customers: list) -> int:
+        """
+        Copies the batch into the temporary table and inserts the new customers.
+        Repeated IDs are removed before the copy, so the first customer with an ID is kept as in the other storages
+        """
+        first_customers = dict()
+        for customer in customers:
+            first_customers.setdefault(customer.customer_id, customer)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for customer in first_customers.values():
+            writer.writerow([getattr(customer, attribute_name) for attribute_name in CUSTOMER_ATTRIBUTES])
+        buffer.seek(0)
+        cursor.copy_expert("COPY customers_import FROM STDIN WITH (FORMAT csv);", buffer)
+        cursor.execute("""
+        INSERT INTO customers 
+        SELECT * 
+        FROM customers_import 
+        ON CONFLICT (customer_id) DO NOTHING;
+        """)
+        inserted = cursor.rowcount
+        cursor.execute("TRUNCATE customers_import;")
+        return inserted
+
+    @staticmethod
+    def _list_query(sort_params: list) -> str:
+        validate_sort_params(sort_params)
+        if len(sort_params) == 0:
+            return """
+            SELECT * 
+            FROM customers;
+            """
+        param = ",".join(sort_params)
+        return f"""
+            SELECT * 
+            FROM customers 
+            ORDER BY 
+                {param};
+            """
+
+
+class SQLiteStorage(StorageStrategy):
+    columns = ", ".join(CUSTOMER_ATTRIBUTES)
+    schema = """
+    CREATE TABLE IF NOT EXISTS customers(
+        customer_id                 TEXT PRIMARY KEY,
+        full_name                   TEXT NOT NULL,
+        position                    TEXT NOT NULL,
+        name_of_the_organization    TEXT NOT NULL,
+        email                       TEXT NOT NULL,
+        phone                       TEXT NOT NULL
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS customers_full_name ON customers (full_name);
+    CREATE INDEX IF NOT EXISTS customers_position ON customers (position);
+    CREATE INDEX IF NOT EXISTS customers_name_of_the_organization ON customers (name_of_the_organization);
+    CREATE INDEX IF NOT EXISTS customers_email ON customers (email);
+    CREATE INDEX IF NOT EXISTS customers_phone ON customers (phone);
+    """
+
+    def __init__(self, file_name: str) -> None:
+        """
+        Storage of customers in an SQLite database file.
+        The database is opened once in WAL mode, so readers do not block the writer,
+        and the statements are parameterized, so SQLite reuses their compiled form from its statement cache
+        :param file_name: database file path
+        """
+        self.file_name = file_name
+        self.connection = sqlite3.connect(file_name, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL;")
+        self.connection.execute("PRAGMA synchronous=NORMAL;")
+        self.connection.executescript(self.schema)
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """
+        Closes the database connection
+        """
+        self.connection.close()
+
+    def insert_customer(self, customer: Customer) -> None:
+        """
+        Inserts a customer instance into the storage
+        :param customer: Customer
+        :return: None
+        """
+        with self.connection:
+            self.connection.execute(f"INSERT INTO customers ({self.columns}) VALUES (?, ?, ?, ?, ?, ?);",
+                                    self._values(customer))
+
+    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
         """
         Searches for a customer in the storage by argument name and value
         and returns the result
@@ -326,94 +2690,702 @@ class DataBaseStorage(StorageStrategy):
         :param argument_value: the value of the argument to search for
         :return: Customer
         """
-        query = f"""
-        SELECT *
-        FROM customers 
-        WHERE 
-            customers.{argument_name} = '{argument_value}';
-        """
-        with create_connection(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port) as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                result = cursor.fetchone()
-                if result is not None:
-                    customer_id, full_name, position, name_of_the_organization, email, phone = result
-                    customer = Customer(customer_id, full_name, position, name_of_the_organization, email, phone)
-                    return customer
+        validate_sort_params([argument_name])
+        row = self.connection.execute(f"SELECT {self.columns} FROM customers WHERE {argument_name} = ? LIMIT 1;",
+                                      (argument_value,)).fetchone()
+        if row is not None:
+            return Customer(*row)
+
+    def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        """
+        Updates the customer instance in the storage
+        :param customer: Customer
+        :param updatable_arguments: dict with updatable arguments
+        :return: None
+        """
+        self.update_customer_by_id(dict(updatable_arguments, customer_id=customer.customer_id))
+
+    def delete_customer(self, customer: Customer) -> None:
+        """
+        Remove the customer instance in the storage
+        :param customer: Customer
+        :return: None
+        """
+        self.delete_customer_by_id(customer.customer_id)
+
+    def list_of_customer(self, sort_params: list) -> list:
+        """
+        Searches for all customers in the storage
+        and returns the result
+        :param sort_params: list of parameters for sorting
+        :return: List
+        """
+        return [Customer(*row) for row in self.connection.execute(self._list_query(sort_params))]
+
+    def iter_customers(self, sort_params: list) -> Iterator[Customer]:
+        """
+        Yields all customers in the storage one by one,
+        rows are read from the database file as the cursor is iterated
+        :param sort_params: list of parameters for sorting
+        :return: Iterator
+        """
+        for row in self.connection.execute(self._list_query(sort_params)):
+            yield Customer(*row)
+
+    def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns a page of customers using a row value comparison on the sort columns,
+        so that SQLite can start the page from an index instead of skipping the previous rows
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the page cursor, values of 'page_sort_params' of the last customer of the previous page
+        :return: List
+        """
+        page_params = page_sort_params(sort_params)
+        validate_sort_params(page_params)
+        columns = ", ".join(page_params)
+        query_params = []
+        condition = ""
+        if after is not None:
+            placeholders = ", ".join(["?"] * len(page_params))
+            condition = f"WHERE ({columns}) > ({placeholders})"
+            query_params.extend(after)
+        query = f"SELECT {self.columns} FROM customers {condition} ORDER BY {columns} LIMIT ? OFFSET ?;"
+        query_params.extend([limit, offset])
+        return [Customer(*row) for row in self.connection.execute(query, query_params)]
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Combines the predicates into one 'WHERE' clause, so that SQLite chooses the most selective index.
+        A prefix is searched as the range of values from the prefix up to the next string,
+        which the index of the argument serves, unlike the case-insensitive 'LIKE'
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        conditions = []
+        query_params = []
+        for predicate in predicates:
+            if predicate.operator == "eq":
+                conditions.append(f"{predicate.argument_name} = ?")
+                query_params.append(predicate.value)
+            elif predicate.operator == "in":
+                conditions.append(f"{predicate.argument_name} IN ({', '.join(['?'] * len(predicate.value))})")
+                query_params.extend(predicate.value)
+            elif predicate.value:
+                conditions.append(f"{predicate.argument_name} >= ? AND {predicate.argument_name} < ?")
+                query_params.extend([predicate.value, predicate.value[:-1] + chr(ord(predicate.value[-1]) + 1)])
+        condition = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT {self.columns} FROM customers {condition} ORDER BY customer_id;"
+        return [Customer(*row) for row in self.connection.execute(query, query_params)]
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Inserts the customers in one transaction,
+        customers with an existing 'customer_id' are skipped
+        :param customers: customers to insert
+        :return: number of inserted customers
+        """
+        with self.connection:
+            cursor = self.connection.executemany(
+                f"INSERT OR IGNORE INTO customers ({self.columns}) VALUES (?, ?, ?, ?, ?, ?);",
+                (self._values(customer) for customer in customers))
+            return cursor.rowcount
+
+    def insert_many(self, customers: list) -> list:
+        """
+        Inserts the customers in one transaction if none of them exists in the storage
+        :param customers: list of customers
+        :return: IDs of the customers that already exist or repeat in the list, nothing is inserted if not empty
+        """
+        existing_ids = duplicate_ids(customer.customer_id for customer in customers)
+        if existing_ids or not customers:
+            return existing_ids
+        try:
+            with self.connection:
+                self.connection.executemany(f"INSERT INTO customers ({self.columns}) VALUES (?, ?, ?, ?, ?, ?);",
+                                            [self._values(customer) for customer in customers])
+        except sqlite3.IntegrityError:
+            stored_ids = self._stored_ids([customer.customer_id for customer in customers])
+            return [customer.customer_id for customer in customers if customer.customer_id in stored_ids]
+        return []
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the customers in one transaction if all of them exist in the storage,
+        arguments missing from a dict keep their stored values
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: IDs of the customers that do not exist, nothing is updated if not empty
+        """
+        query = """
+        UPDATE customers
+        SET
+            full_name = COALESCE(?, full_name),
+            position = COALESCE(?, position),
+            name_of_the_organization = COALESCE(?, name_of_the_organization),
+            email = COALESCE(?, email),
+            phone = COALESCE(?, phone)
+        WHERE
+            customer_id = ?;
+        """
+        customer_ids = [updatable_arguments["customer_id"] for updatable_arguments in updatable_arguments_list]
+        rows = [[updatable_arguments.get(attribute_name) for attribute_name in CUSTOMER_ATTRIBUTES[1:]]
+                + [updatable_arguments["customer_id"]] for updatable_arguments in updatable_arguments_list]
+        return self._write_all(query, rows, customer_ids)
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes the customers in one transaction if all of them exist in the storage
+        :param customer_ids: list of customer IDs
+        :return: IDs of the customers that do not exist, nothing is removed if not empty
+        """
+        missing_ids = duplicate_ids(customer_ids)
+        if missing_ids:
+            return missing_ids
+        return self._write_all("DELETE FROM customers WHERE customer_id = ?;",
+                               [(customer_id,) for customer_id in customer_ids], customer_ids)
+
+    def insert_new_customer(self, customer: Customer) -> bool:
+        """
+        Inserts the customer with a single statement that skips an existing 'customer_id'
+        :param customer: Customer
+        :return: True if the customer was inserted, False if it already exists
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                f"INSERT INTO customers ({self.columns}) VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING;",
+                self._values(customer))
+            return cursor.rowcount == 1
+
+    def update_customer_by_id(self, updatable_arguments: dict) -> bool:
+        """
+        Updates the customer with a single statement that reports whether the customer exists
+        :param updatable_arguments: dict with updatable arguments and 'customer_id'
+        :return: True if the customer was updated, False if it does not exist
+        """
+        columns = [attribute_name for attribute_name in CUSTOMER_ATTRIBUTES
+                   if attribute_name != "customer_id" and attribute_name in updatable_arguments]
+        if not columns:
+            return self.find_customer("customer_id", updatable_arguments["customer_id"]) is not None
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        values = [updatable_arguments[column] for column in columns] + [updatable_arguments["customer_id"]]
+        with self.connection:
+            cursor = self.connection.execute(f"UPDATE customers SET {assignments} WHERE customer_id = ?;", values)
+            return cursor.rowcount == 1
+
+    def delete_customer_by_id(self, customer_id: str) -> bool:
+        """
+        Removes the customer with a single statement that reports whether the customer exists
+        :param customer_id: customer ID
+        :return: True if the customer was removed, False if it does not exist
+        """
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM customers WHERE customer_id = ?;", (customer_id,))
+            return cursor.rowcount == 1
+
+    def _write_all(self, query: str, rows: list, customer_ids: list) -> list:
+        """
+        Executes the query for every row in one transaction that is rolled back unless every row changes a customer
+        :return: IDs of the customers that do not exist
+        """
+        if not rows:
+            return []
+        self.connection.execute("BEGIN;")
+        try:
+            cursor = self.connection.executemany(query, rows)
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+        if cursor.rowcount == len(rows):
+            self.connection.commit()
+            return []
+        self.connection.rollback()
+        stored_ids = self._stored_ids(customer_ids)
+        return [customer_id for customer_id in customer_ids if customer_id not in stored_ids]
+
+    def _stored_ids(self, customer_ids: list) -> set:
+        stored_ids = set()
+        for start in range(0, len(customer_ids), 500):
+            chunk = customer_ids[start:start + 500]
+            placeholders = ", ".join(["?"] * len(chunk))
+            stored_ids.update(row[0] for row in self.connection.execute(
+                f"SELECT customer_id FROM customers WHERE customer_id IN ({placeholders});", chunk))
+        return stored_ids
+
+    @staticmethod
+    def _values(customer: Customer) -> tuple:
+        return tuple(getattr(customer, attribute_name) for attribute_name in CUSTOMER_ATTRIBUTES)
+
+    def _list_query(self, sort_params: list) -> str:
+        validate_sort_params(sort_params)
+        if len(sort_params) == 0:
+            return f"SELECT {self.columns} FROM customers;"
+        return f"SELECT {self.columns} FROM customers ORDER BY {', '.join(sort_params)};"
+
+
+class TieredStorage(StorageStrategy):
+    thread_safe = True
+
+    def __init__(self, storage: DataBaseStorage, refresh_interval: float = 5.0) -> None:
+        """
+        Storage that serves reads from an in-memory copy of the database and writes through to the database.
+        The copy is loaded in bulk on start and brought up to date with the customers changed since the last refresh,
+        by this or any other process. It is loaded again if the last refresh is so old that the changes since
+        may have been removed from the change log
+        :param storage: DataBaseStorage, the system of record
+        :param refresh_interval: seconds after which a read refreshes the copy first, None refreshes only on 'refresh'
+        """
+        self.storage = storage
+        self.refresh_interval = refresh_interval
+        self.change_retention = storage.change_retention()
+        self.hot = InMemoryStorage()
+        self._position = None
+        self._refreshed_at = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self.warm()
+
+    def warm(self) -> None:
+        """
+        Loads all customers from the database into a new in-memory copy
+        """
+        with self._refresh_lock:
+            hot = InMemoryStorage()
+            with self.storage.snapshot() as (position, customers):
+                hot.import_customers(customers)
+            with self._lock:
+                self.hot = hot
+                self._position = position
+                self._refreshed_at = time.monotonic()
+
+    def refresh(self) -> None:
+        """
+        Applies the customers changed in the database since the last refresh to the in-memory copy,
+        reloads all customers if the last refresh is older than half of the change log retention
+        """
+        if time.monotonic() - self._refreshed_at > self.change_retention / 2:
+            self.warm()
+            return
+        with self._refresh_lock:
+            position, customers, removed_ids = self.storage.changes_since(self._position)
+            with self._lock:
+                for customer in customers:
+                    self.hot.insert_customer(customer)
+                for customer_id in removed_ids:
+                    self._remove(customer_id)
+                self._position = position
+                self._refreshed_at = time.monotonic()
+
+    def insert_customer(self, customer: Customer) -> None:
+        """
+        Inserts the customer into the database and the in-memory copy
+        :param customer: Customer
+        :return: None
+        """
+        self.storage.insert_customer(customer)
+        with self._lock:
+            self.hot.insert_customer(customer)
+
+    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Searches for a customer in the in-memory copy
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        self._refresh_if_due()
+        with self._lock:
+            return self.hot.find_customer(argument_name, argument_value)
 
     def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
         """
-        Updates the customer instance in the storage
+        Updates the customer in the database and the in-memory copy
         :param customer: Customer
         :param updatable_arguments: dict with updatable arguments
         :return: None
         """
-        query = f"""
-        UPDATE customers 
-        SET 
-            full_name = '{updatable_arguments.get("full_name", customer.full_name)}',
-            position = '{updatable_arguments.get("position", customer.position)}',
-            name_of_the_organization = '{updatable_arguments.get("name_of_the_organization", 
-                                                                 customer.name_of_the_organization)}',
-            email = '{updatable_arguments.get("email", customer.email)}',
-            phone = '{updatable_arguments.get("phone", customer.phone)}'
-        WHERE 
-            customer_id = '{customer.customer_id}';
-        """
-        with create_connection(self.db_name, self.db_user, self.db_password, self.db_host,
-                               self.db_port) as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                connection.commit()
+        self.storage.update_customer(customer, updatable_arguments)
+        with self._lock:
+            self._update(dict(updatable_arguments, customer_id=customer.customer_id))
 
     def delete_customer(self, customer: Customer) -> None:
         """
-        Remove the customer instance in the storage
-        and writes the file
+        Removes the customer from the database and the in-memory copy
         :param customer: Customer
         :return: None
         """
-        query = f"""
-        DELETE 
-        FROM customers 
-        WHERE 
-            customer_id = '{customer.customer_id}'
-        """
-        with create_connection(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port) as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                connection.commit()
+        self.storage.delete_customer(customer)
+        with self._lock:
+            self._remove(customer.customer_id)
 
     def list_of_customer(self, sort_params: list) -> list:
         """
-        Searches for all customers in the storage
-        and returns the result
+        Returns all customers of the in-memory copy
         :param sort_params: list of parameters for sorting
         :return: List
         """
-        if len(sort_params) == 0:
-            query = """
-            SELECT * 
-            FROM customers;
-            """
+        validate_sort_params(sort_params)
+        self._refresh_if_due()
+        with self._lock:
+            return self.hot.list_of_customer(sort_params)
+
+    def iter_customers(self, sort_params: list) -> Iterator[Customer]:
+        """
+        Yields all customers of the in-memory copy
+        :param sort_params: list of parameters for sorting
+        :return: Iterator
+        """
+        yield from self.list_of_customer(sort_params)
+
+    def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Returns a page of customers from the in-memory copy
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: the page cursor, values of 'page_sort_params' of the last customer of the previous page
+        :return: List
+        """
+        validate_sort_params(sort_params)
+        self._refresh_if_due()
+        with self._lock:
+            return self.hot.list_page(sort_params, limit, offset, after)
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Searches for the customers in the indexes of the in-memory copy
+        :param predicates: list of Predicate, all customers are returned if empty
+        :return: List
+        """
+        self._refresh_if_due()
+        with self._lock:
+            return self.hot.find_all(predicates)
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Imports the customers into the database and refreshes the in-memory copy with the inserted ones
+        :param customers: customers to insert
+        :return: number of inserted customers
+        """
+        inserted = self.storage.import_customers(customers)
+        self.refresh()
+        return inserted
+
+    def insert_many(self, customers: list) -> list:
+        """
+        Inserts the customers into the database and, if none of them exists, into the in-memory copy
+        :param customers: list of customers
+        :return: IDs of the customers that already exist or repeat in the list, nothing is inserted if not empty
+        """
+        existing_ids = self.storage.insert_many(customers)
+        if not existing_ids:
+            with self._lock:
+                for customer in customers:
+                    self.hot.insert_customer(customer)
+        return existing_ids
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the customers in the database and, if all of them exist, in the in-memory copy
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: IDs of the customers that do not exist, nothing is updated if not empty
+        """
+        missing_ids = self.storage.update_many(updatable_arguments_list)
+        if not missing_ids:
+            with self._lock:
+                for updatable_arguments in updatable_arguments_list:
+                    self._update(updatable_arguments)
+        return missing_ids
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes the customers from the database and, if all of them exist, from the in-memory copy
+        :param customer_ids: list of customer IDs
+        :return: IDs of the customers that do not exist, nothing is removed if not empty
+        """
+        missing_ids = self.storage.delete_many(customer_ids)
+        if not missing_ids:
+            with self._lock:
+                for customer_id in customer_ids:
+                    self._remove(customer_id)
+        return missing_ids
+
+    def insert_new_customer(self, customer: Customer) -> bool:
+        """
+        Inserts the customer into the database and the in-memory copy if it does not exist
+        :param customer: Customer
+        :return: True if the customer was inserted, False if it already exists
+        """
+        inserted = self.storage.insert_new_customer(customer)
+        if inserted:
+            with self._lock:
+                self.hot.insert_customer(customer)
+        return inserted
+
+    def update_customer_by_id(self, updatable_arguments: dict) -> bool:
+        """
+        Updates the customer in the database and the in-memory copy
+        :param updatable_arguments: dict with updatable arguments and 'customer_id'
+        :return: True if the customer was updated, False if it does not exist
+        """
+        updated = self.storage.update_customer_by_id(updatable_arguments)
+        if updated:
+            with self._lock:
+                self._update(updatable_arguments)
+        return updated
+
+    def delete_customer_by_id(self, customer_id: str) -> bool:
+        """
+        Removes the customer from the database and the in-memory copy
+        :param customer_id: customer ID
+        :return: True if the customer was removed, False if it does not exist
+        """
+        deleted = self.storage.delete_customer_by_id(customer_id)
+        if deleted:
+            with self._lock:
+                self._remove(customer_id)
+        return deleted
+
+    def on_change(self, customer_ids: list) -> None:
+        """
+        Refreshes the in-memory copy with the customers changed in the database
+        :param customer_ids: IDs of the changed customers, None if they are not known
+        """
+        self.refresh()
+
+    def _refresh_if_due(self) -> None:
+        if self.refresh_interval is not None and time.monotonic() - self._refreshed_at >= self.refresh_interval:
+            self.refresh()
+
+    def _update(self, updatable_arguments: dict) -> None:
+        stored_customer = self.hot.customers.get(updatable_arguments["customer_id"])
+        if stored_customer is not None:
+            self.hot.update_customer(stored_customer, updatable_arguments)
+
+    def _remove(self, customer_id: str) -> None:
+        stored_customer = self.hot.customers.get(customer_id)
+        if stored_customer is not None:
+            self.hot.delete_customer(stored_customer)
+
+
+class CacheMetrics:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        return f"hits={self.hits} misses={self.misses} evictions={self.evictions}"
+
+
+class CachingStorage(StorageStrategy):
+    def __init__(self, storage: StorageStrategy, max_size: int = 10000, ttl: float = None) -> None:
+        """
+        Storage that keeps the customers found in another storage in a bounded LRU cache.
+        Searches are cached by argument name and value, the cached entries of a customer are dropped
+        when it is changed or removed through this storage. Changes made by other processes are seen after 'ttl'
+        :param storage: the storage that is read through and written through
+        :param max_size: maximum number of cached searches, the least recently used one is evicted
+        :param ttl: seconds after which a cached search expires, None keeps it until evicted
+        """
+        if max_size < 1:
+            raise CustomerException("Cache size must be at least 1")
+        self.storage = storage
+        self.max_size = max_size
+        self.ttl = ttl
+        self.thread_safe = storage.thread_safe
+        self.metrics = CacheMetrics()
+        self._entries = OrderedDict()
+        self._keys_by_id = dict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def insert_customer(self, customer: Customer) -> None:
+        """
+        Inserts the customer into the storage, a cached customer with the same ID is dropped
+        :param customer: Customer
+        :return: None
+        """
+        self.storage.insert_customer(customer)
+        self.invalidate(customer.customer_id)
+
+    def find_customer(self, argument_name: str, argument_value: str) -> Customer:
+        """
+        Returns the cached customer or searches the storage and caches the found customer
+        :param argument_name: the name of the argument to search for
+        :param argument_value: the value of the argument to search for
+        :return: Customer
+        """
+        key = (argument_name, argument_value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                customer, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.metrics.hits += 1
+                    return customer
+                self._drop(key)
+            self.metrics.misses += 1
+            generation = self._generation
+        customer = self.storage.find_customer(argument_name, argument_value)
+        if customer is not None:
+            self._add(key, customer, generation)
+        return customer
+
+    def update_customer(self, customer: Customer, updatable_arguments: dict) -> None:
+        """
+        Updates the customer in the storage and drops its cached entries
+        :param customer: Customer
+        :param updatable_arguments: dict with updatable arguments
+        :return: None
+        """
+        self.storage.update_customer(customer, updatable_arguments)
+        self.invalidate(customer.customer_id)
+
+    def delete_customer(self, customer: Customer) -> None:
+        """
+        Removes the customer from the storage and drops its cached entries
+        :param customer: Customer
+        :return: None
+        """
+        self.storage.delete_customer(customer)
+        self.invalidate(customer.customer_id)
+
+    def list_of_customer(self, sort_params: list) -> list:
+        """
+        Lists are not cached
+        """
+        return self.storage.list_of_customer(sort_params)
+
+    def iter_customers(self, sort_params: list) -> Iterator[Customer]:
+        """
+        Iterates the customers of the storage
+        """
+        return self.storage.iter_customers(sort_params)
+
+    def list_page(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> list:
+        """
+        Pages are not cached
+        """
+        return self.storage.list_page(sort_params, limit, offset, after)
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Searches with several predicates are not cached
+        """
+        return self.storage.find_all(predicates)
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Imports into the storage, existing customers are not changed
+        """
+        return self.storage.import_customers(customers)
+
+    def insert_many(self, customers: list) -> list:
+        """
+        Inserts into the storage and drops the cached entries of the customers
+        """
+        existing_ids = self.storage.insert_many(customers)
+        for customer in customers:
+            self.invalidate(customer.customer_id)
+        return existing_ids
+
+    def update_many(self, updatable_arguments_list: list) -> list:
+        """
+        Updates the storage and drops the cached entries of the customers
+        """
+        missing_ids = self.storage.update_many(updatable_arguments_list)
+        for updatable_arguments in updatable_arguments_list:
+            self.invalidate(updatable_arguments["customer_id"])
+        return missing_ids
+
+    def delete_many(self, customer_ids: list) -> list:
+        """
+        Removes from the storage and drops the cached entries of the customers
+        """
+        missing_ids = self.storage.delete_many(customer_ids)
+        for customer_id in customer_ids:
+            self.invalidate(customer_id)
+        return missing_ids
+
+    def insert_new_customer(self, customer: Customer) -> bool:
+        """
+        Inserts into the storage, an existing customer is not changed
+        """
+        return self.storage.insert_new_customer(customer)
+
+    def update_customer_by_id(self, updatable_arguments: dict) -> bool:
+        """
+        Updates the storage and drops the cached entries of the customer
+        """
+        updated = self.storage.update_customer_by_id(updatable_arguments)
+        self.invalidate(updatable_arguments["customer_id"])
+        return updated
+
+    def delete_customer_by_id(self, customer_id: str) -> bool:
+        """
+        Removes from the storage and drops the cached entries of the customer
+        """
+        deleted = self.storage.delete_customer_by_id(customer_id)
+        self.invalidate(customer_id)
+        return deleted
+
+    def invalidate(self, customer_id: str) -> None:
+        """
+        Drops every cached search that found the customer
+        :param customer_id: customer ID
+        """
+        with self._lock:
+            self._generation += 1
+            for key in self._keys_by_id.pop(customer_id, ()):
+                self._entries.pop(key, None)
+
+    def on_change(self, customer_ids: list) -> None:
+        """
+        Passes the change on to the cached storage, then drops the cached searches of the changed customers,
+        so that a search made while the cached storage applies the change is not kept
+        :param customer_ids: IDs of the changed customers, None drops all cached searches
+        """
+        self.storage.on_change(customer_ids)
+        if customer_ids is None:
+            self.clear()
         else:
-            param = ",".join(sort_params)
-            query = f"""
-            SELECT * 
-            FROM customers 
-            ORDER BY 
-                {param};
-            """
-        customers = []
-        with create_connection(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port) as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                result = cursor.fetchall()
-                for row in result:
-                    customer_id, full_name, position, name_of_the_organization, email, phone = row
-                    customer = Customer(customer_id, full_name, position, name_of_the_organization, email, phone)
-                    customers.append(customer)
-                return customers
+            for customer_id in customer_ids:
+                self.invalidate(customer_id)
+
+    def clear(self) -> None:
+        """
+        Drops all cached searches
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_id.clear()
+
+    def _add(self, key: tuple, customer: Customer, generation: int) -> None:
+        """
+        Caches the found customer unless a change was made while the storage was searched
+        """
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (customer, expires_at)
+            self._keys_by_id.setdefault(customer.customer_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+                self.metrics.evictions += 1
+
+    def _drop(self, key: tuple) -> None:
+        customer, _ = self._entries.pop(key)
+        keys = self._keys_by_id.get(customer.customer_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[customer.customer_id]
 
 
 class StorageFactory:
@@ -423,15 +3395,45 @@ class StorageFactory:
         Selects storage based on input arguments
         """
         if sys_arguments.path is not None:
+            if sys_arguments.xml_index is not None:
+                return IndexedXMLStorage(sys_arguments.path, tuple(sys_arguments.xml_index.split(",")))
+            if sys_arguments.xml_journal:
+                return JournaledXMLStorage(sys_arguments.path, sys_arguments.xml_fsync,
+                                           compact_after=sys_arguments.xml_compact_after)
+            if sys_arguments.xml_flush_interval is not None:
+                return CachedXMLStorage(sys_arguments.path, sys_arguments.xml_flush_interval)
             return XMLStorage(sys_arguments.path)
+        elif sys_arguments.sqlite is not None:
+            return SQLiteStorage(sys_arguments.sqlite)
+        elif sys_arguments.binary_path is not None:
+            return FixedRecordStorage(sys_arguments.binary_path)
         elif sys_arguments.db is not None:
-            return DataBaseStorage(
+            pool = None
+            if sys_arguments.pool_size is not None:
+                pool = ConnectionPool(
+                    sys_arguments.db,
+                    sys_arguments.user,
+                    sys_arguments.password,
+                    sys_arguments.host,
+                    sys_arguments.port,
+                    max_size=sys_arguments.pool_size,
+                    max_lifetime=sys_arguments.pool_max_lifetime
+                )
+            storage = DataBaseStorage(
                 sys_arguments.db,
                 sys_arguments.user,
                 sys_arguments.password,
                 sys_arguments.host,
-                sys_arguments.port
+                sys_arguments.port,
+                pool,
+                sys_arguments.db_itersize,
+                migrate=True
             )
+            if sys_arguments.db_hot_tier:
+                return TieredStorage(storage, sys_arguments.db_hot_tier_refresh)
+            return storage
+        elif sys_arguments.columnar:
+            return ColumnarStorage()
         else:
             return InMemoryStorage()
 
@@ -443,9 +3445,8 @@ class CustomerService:
     def create_customer(self, customer_id: str, full_name: str, position: str, name_of_the_organization: str,
                         email: str, phone: str) -> None:
         """
-        Checks for the existence of a customer
+        Calls the 'insert_new_customer' command to insert the customer into the storage
         Raises 'CustomerException' exception if the customer exists
-        Calls the 'insert_customer' command to insert the customer into the storage
         :param customer_id: customer ID
         :param full_name: surname, name, patronymic of the customer
         :param position: customer position
@@ -454,11 +3455,9 @@ class CustomerService:
         :param phone: customer's phone number
         :return: None
         """
-        expected_customer = self._storage.find_customer("customer_id", customer_id)
-        if expected_customer is not None:
-            raise CustomerException("Customer already exists")
         customer = Customer(customer_id, full_name, position, name_of_the_organization, email, phone)
-        self._storage.insert_customer(customer)
+        if not self._storage.insert_new_customer(customer):
+            raise CustomerException("Customer already exists")
 
     def find_customer(self, argument_name: str, argument_value: str) -> Customer:
         """
@@ -473,26 +3472,30 @@ class CustomerService:
 
     def update_customer(self, updatable_arguments: dict) -> None:
         """
-        Searches for a customer by ID  and
-        calls the 'update_customer' command to update the customer into the storage
+        Calls the 'update_customer_by_id' command to update the customer into the storage
+        Raises 'CustomerException' exception if the customer does not exist
         :return: None
         """
-        customer = self._storage.find_customer('customer_id', updatable_arguments['customer_id'])
-        if customer is None:
+        if not self._storage.update_customer_by_id(updatable_arguments):
             raise CustomerException("Customer does not exist")
-        self._storage.update_customer(customer, updatable_arguments)
 
     def remove_customer(self, customer_id: str) -> None:
         """
-        Searches for a customer by ID  and
-        calls the 'delete_customer' command to remove the customer into the storage
+        Calls the 'delete_customer_by_id' command to remove the customer from the storage
+        Raises 'CustomerException' exception if the customer does not exist
         :param customer_id: customer ID
         :return: None
         """
-        customer = self._storage.find_customer('customer_id', customer_id)
-        if customer is None:
+        if not self._storage.delete_customer_by_id(customer_id):
             raise CustomerException("Customer does not exist")
-        self._storage.delete_customer(customer)
+
+    def find_all(self, predicates: list) -> list:
+        """
+        Calls the 'find_all' command to find the customers matching every predicate
+        :param predicates: list of Predicate
+        :return: List ordered by 'customer_id'
+        """
+        return self._storage.find_all(predicates)
 
     def get_list_of_customers(self, sort_params: list) -> list:
         """
@@ -503,3 +3506,72 @@ class CustomerService:
         """
         customer_data = self._storage.list_of_customer(sort_params)
         return customer_data
+
+    def iter_customers(self, sort_params: list) -> Iterator[Customer]:
+        """
+        Calls the 'iter_customers' command to get customers from the storage one by one
+        :param sort_params: list of parameters for sorting
+        :return: Iterator
+        """
+        return self._storage.iter_customers(sort_params)
+
+    def import_customers(self, customers: Iterable[Customer]) -> int:
+        """
+        Calls the 'import_customers' command to insert the customers into the storage in bulk,
+        customers that already exist are skipped
+        :param customers: customers to insert
+        :return: number of inserted customers
+        """
+        return self._storage.import_customers(customers)
+
+    def insert_many(self, customers: list) -> None:
+        """
+        Calls the 'insert_many' command to insert the customers into the storage in one operation
+        Raises 'CustomerException' exception if any of the customers exists, no customer is inserted then
+        :param customers: list of customers
+        :return: None
+        """
+        existing_ids = self._storage.insert_many(customers)
+        if existing_ids:
+            raise CustomerException(f"Customers already exist: {', '.join(existing_ids)}")
+
+    def update_many(self, updatable_arguments_list: list) -> None:
+        """
+        Calls the 'update_many' command to update the customers in the storage in one operation
+        Raises 'CustomerException' exception if any of the customers does not exist, no customer is updated then
+        :param updatable_arguments_list: list of dicts with updatable arguments and 'customer_id'
+        :return: None
+        """
+        missing_ids = self._storage.update_many(updatable_arguments_list)
+        if missing_ids:
+            raise CustomerException(f"Customers do not exist: {', '.join(missing_ids)}")
+
+    def delete_many(self, customer_ids: list) -> None:
+        """
+        Calls the 'delete_many' command to remove the customers from the storage in one operation
+        Raises 'CustomerException' exception if any of the customers does not exist, no customer is removed then
+        :param customer_ids: list of customer IDs
+        :return: None
+        """
+        missing_ids = self._storage.delete_many(customer_ids)
+        if missing_ids:
+            raise CustomerException(f"Customers do not exist: {', '.join(missing_ids)}")
+
+    def get_page_of_customers(self, sort_params: list, limit: int, offset: int = 0, after: tuple = None) -> tuple:
+        """
+        Calls the 'list_page' command to get a page of customers ordered by the sort parameters and 'customer_id'
+        Raises 'CustomerException' if the page size is not positive
+        :param sort_params: list of parameters for sorting
+        :param limit: maximum number of customers
+        :param offset: number of customers to skip
+        :param after: cursor returned with the previous page
+        :return: tuple of the list of customers and the cursor of the next page, None if it is the last page
+        """
+        if limit < 1:
+            raise CustomerException("Page size must be positive")
+        if offset < 0:
+            raise CustomerException("Offset must not be negative")
+        customers = self._storage.list_page(sort_params, limit, offset, after)
+        if len(customers) < limit:
+            return customers, None
+        return customers, page_cursor(customers[-1], sort_params)
@@ -1,3 +1,9 @@
+import select
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import psycopg2
 from psycopg2 import OperationalError
 
@@ -19,3 +25,291 @@ def create_connection(db_name: str, db_user: str, db_password: str, db_host: str
     except OperationalError as e:
         print(e)
     return connection
+
+
+class PoolException(Exception):
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checked_out = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.created = 0
+        self.recycled = 0
+
+    def __repr__(self) -> str:
+        return f"checked_out={self.checked_out} waits={self.waits} wait_time={self.wait_time:.3f}s " \
+               f"created={self.created} recycled={self.recycled}"
+
+
+class ConnectionPool:
+    def __init__(self, db_name: str, db_user: str, db_password: str, db_host: str, db_port: str,
+                 max_size: int = 10, max_lifetime: float = 3600.0, timeout: float = 30.0,
+                 health_check_interval: float = 30.0) -> None:
+        """
+        A thread-safe pool of database connections
+        :param max_size: the maximum number of open connections
+        :param max_lifetime: seconds after which a connection is closed and replaced with a new one
+        :param timeout: seconds to wait for a free connection before raising 'PoolException'
+        :param health_check_interval: idle seconds after which a connection is checked with 'SELECT 1' before use
+        """
+        if max_size < 1:
+            raise PoolException("Pool size must be at least 1")
+        self.db_name = db_name
+        self.db_user = db_user
+        self.db_password = db_password
+        self.db_host = db_host
+        self.db_port = db_port
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.metrics = PoolMetrics()
+        self._idle = deque()
+        self._created_at = dict()
+        self._prepared = dict()
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def getconn(self) -> psycopg2.extensions.connection:
+        """
+        Takes an idle connection from the pool or opens a new one if the pool is not full.
+        Waits for a returned connection otherwise.
+        The lock is held only to take the connection, it is checked and opened without blocking other threads.
+        Raises 'PoolException' on timeout or if the pool is closed
+        :return: connection
+        """
+        waited = False
+        started = time.monotonic()
+        while True:
+            with self._condition:
+                connection = None
+                while True:
+                    if self._closed:
+                        raise PoolException("Connection pool is closed")
+                    if self._idle:
+                        connection, released_at = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    if not waited:
+                        waited = True
+                        self.metrics.waits += 1
+                    remaining = self.timeout - (time.monotonic() - started)
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        self.metrics.wait_time += time.monotonic() - started
+                        raise PoolException("Timed out waiting for a database connection")
+            if connection is None:
+                break
+            if self._is_usable(connection, released_at):
+                with self._condition:
+                    self._add_wait_time(waited, started)
+                    self.metrics.checked_out += 1
+                return connection
+            self._discard(connection)
+            with self._condition:
+                self.metrics.recycled += 1
+
+        with self._condition:
+            self._add_wait_time(waited, started)
+        connection = create_connection(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port)
+        with self._condition:
+            if connection is None:
+                self._size -= 1
+                self._condition.notify()
+                raise PoolException("Unable to connect to the database")
+            self._created_at[id(connection)] = time.monotonic()
+            self.metrics.created += 1
+            self.metrics.checked_out += 1
+        return connection
+
+    def putconn(self, connection: psycopg2.extensions.connection, discard: bool = False) -> None:
+        """
+        Returns a connection to the pool.
+        Broken, expired or explicitly discarded connections are closed instead.
+        An open transaction is rolled back before the lock is taken
+        """
+        if not discard and not connection.closed:
+            try:
+                if connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except (psycopg2.InterfaceError, OperationalError):
+                discard = True
+        with self._condition:
+            self.metrics.checked_out -= 1
+            keep = not (discard or self._closed or connection.closed or self._expired(connection))
+            if keep:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+            elif not discard:
+                self.metrics.recycled += 1
+        if not keep:
+            self._discard(connection)
+
+    @contextmanager
+    def connection(self) -> psycopg2.extensions.connection:
+        """
+        Borrows a connection for the duration of a 'with' block.
+        The connection is discarded if the block fails with a database error
+        """
+        connection = self.getconn()
+        try:
+            yield connection
+        except (psycopg2.InterfaceError, OperationalError):
+            self.putconn(connection, discard=True)
+            raise
+        except Exception:
+            self.putconn(connection)
+            raise
+        else:
+            self.putconn(connection)
+
+    def prepared_statements(self, connection: psycopg2.extensions.connection) -> set:
+        """
+        Returns the names of the statements prepared by the connection, the set is dropped with the connection
+        """
+        with self._condition:
+            return self._prepared.setdefault(id(connection), set())
+
+    def close_all(self) -> None:
+        """
+        Closes all idle connections and rejects further checkouts
+        """
+        with self._condition:
+            self._closed = True
+            idle_connections = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._condition.notify_all()
+        for connection in idle_connections:
+            self._discard(connection)
+
+    def _is_usable(self, connection: psycopg2.extensions.connection, released_at: float) -> bool:
+        if connection.closed or self._expired(connection):
+            return False
+        if time.monotonic() - released_at < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            connection.rollback()
+        except (psycopg2.InterfaceError, OperationalError):
+            return False
+        return True
+
+    def _expired(self, connection: psycopg2.extensions.connection) -> bool:
+        created_at = self._created_at.get(id(connection))
+        return created_at is not None and time.monotonic() - created_at > self.max_lifetime
+
+    def _add_wait_time(self, waited: bool, started: float) -> None:
+        if waited:
+            self.metrics.wait_time += time.monotonic() - started
+
+    def _discard(self, connection: psycopg2.extensions.connection) -> None:
+        """
+        Frees the place of the connection in the pool and closes the connection outside the lock
+        """
+        with self._condition:
+            self._created_at.pop(id(connection), None)
+            self._prepared.pop(id(connection), None)
+            self._size -= 1
+            self._condition.notify()
+        if not connection.closed:
+            connection.close()
+
+
+class ChangeListener:
+    channel = "customers_changed"
+
+    def __init__(self, db_name: str, db_user: str, db_password: str, db_host: str, db_port: str,
+                 poll_interval: float = 1.0, reconnect_delay: float = 1.0) -> None:
+        """
+        Listens on its own connection for the notifications sent by the triggers of 'handbook/migrations'
+        and passes the changed customer IDs to the subscribed callbacks from a background thread.
+        Callbacks receive None when the IDs are not known - the payload was too long or notifications
+        may have been missed while the connection was lost
+        :param poll_interval: seconds between checks whether the listener is stopped
+        :param reconnect_delay: seconds to wait before reconnecting after the connection is lost
+        """
+        self.db_name = db_name
+        self.db_user = db_user
+        self.db_password = db_password
+        self.db_host = db_host
+        self.db_port = db_port
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self._callbacks = []
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback) -> None:
+        """
+        :param callback: function called with the list of changed customer IDs or None
+        """
+        self._callbacks.append(callback)
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="handbook-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        connected_before = False
+        while not self._stopping.is_set():
+            connection = create_connection(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port)
+            if connection is None:
+                self._stopping.wait(self.reconnect_delay)
+                continue
+            try:
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel};")
+                if connected_before:
+                    self._dispatch(None)
+                connected_before = True
+                while not self._stopping.is_set():
+                    if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    connection.poll()
+                    payloads = [notification.payload for notification in connection.notifies]
+                    connection.notifies.clear()
+                    if payloads:
+                        self._dispatch(self._changed_ids(payloads))
+            except psycopg2.Error as e:
+                print(e)
+                self._stopping.wait(self.reconnect_delay)
+            finally:
+                connection.close()
+
+    def _dispatch(self, customer_ids) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(customer_ids)
+            except Exception as e:
+                print(e)
+
+    @staticmethod
+    def _changed_ids(payloads: list):
+        """
+        Merges the notifications received together
+        :return: list of customer IDs, None if any notification does not list them
+        """
+        customer_ids = dict()
+        for payload in payloads:
+            if payload == "*":
+                return None
+            customer_ids.update(dict.fromkeys(payload.split(",")))
+        return list(customer_ids)
@@ -0,0 +1,71 @@
+import os.path
+import re
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(__file__), "migrations")
+MIGRATION_LOCK_ID = 7210414
+
+
+class MigrationException(Exception):
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def load_migrations(directory: str = MIGRATIONS_DIRECTORY) -> list:
+    """
+    Reads the migrations from the files named '<version>_<name>.sql'
+    Raises 'MigrationException' if a file name has no version or a version repeats
+    :param directory: directory with the migration files
+    :return: list of tuples of version, name and SQL ordered by version
+    """
+    migrations = dict()
+    for file_name in os.listdir(directory):
+        if not file_name.endswith(".sql"):
+            continue
+        match = re.fullmatch(r"(\d+)_(\w+)\.sql", file_name)
+        if match is None:
+            raise MigrationException(f"Migration file name must be '<version>_<name>.sql': {file_name}")
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationException(f"Migration version {version} repeats: {file_name}")
+        with open(os.path.join(directory, file_name), encoding="utf-8") as file:
+            migrations[version] = (version, match.group(2), file.read())
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def apply_migrations(connection, directory: str = MIGRATIONS_DIRECTORY) -> list:
+    """
+    Applies the migrations that are not recorded in the 'schema_migrations' table yet, in order of version.
+    All of them are applied in one transaction under an advisory lock,
+    so processes starting at the same time do not apply a migration twice and a failed migration changes nothing
+    :param connection: database connection
+    :param directory: directory with the migration files
+    :return: versions of the applied migrations
+    """
+    migrations = load_migrations(directory)
+    applied_versions = []
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s);", (MIGRATION_LOCK_ID,))
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations(
+                version     integer PRIMARY KEY,
+                name        text NOT NULL,
+                applied_at  timestamptz NOT NULL DEFAULT now()
+            );
+            """)
+            cursor.execute("SELECT version FROM schema_migrations;")
+            recorded_versions = {row[0] for row in cursor.fetchall()}
+            for version, name, sql in migrations:
+                if version in recorded_versions:
+                    continue
+                cursor.execute(sql)
+                cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s);", (version, name))
+                applied_versions.append(version)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return applied_versions
@@ -0,0 +1,12 @@
+-- Each index serves both the search by the argument and the pages of 'list' sorted by it,
+-- which are ordered by the sort arguments and then by customer_id
+CREATE INDEX IF NOT EXISTS customers_full_name ON customers (full_name, customer_id);
+CREATE INDEX IF NOT EXISTS customers_position ON customers (position, customer_id);
+CREATE INDEX IF NOT EXISTS customers_name_of_the_organization ON customers (name_of_the_organization, customer_id);
+CREATE INDEX IF NOT EXISTS customers_email ON customers (email, customer_id);
+CREATE INDEX IF NOT EXISTS customers_phone ON customers (phone, customer_id);
+
+-- Employees listed by organization or by position
+CREATE INDEX IF NOT EXISTS customers_organization_full_name
+    ON customers (name_of_the_organization, full_name, customer_id);
+CREATE INDEX IF NOT EXISTS customers_position_full_name ON customers (position, full_name, customer_id);
@@ -0,0 +1,6 @@
+-- Searches by a part of a name
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS customers_full_name_trigram ON customers USING gin (full_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS customers_name_of_the_organization_trigram
+    ON customers USING gin (name_of_the_organization gin_trgm_ops);
@@ -0,0 +1,6 @@
+-- Searches by the beginning of an argument with 'LIKE', which the indexes of the database collation do not serve.
+-- Names and organizations are served by the trigram indexes
+CREATE INDEX IF NOT EXISTS customers_customer_id_pattern ON customers (customer_id varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS customers_position_pattern ON customers (position varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS customers_email_pattern ON customers (email varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS customers_phone_pattern ON customers (phone varchar_pattern_ops);
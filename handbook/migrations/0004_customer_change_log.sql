@@ -0,0 +1,46 @@
+-- Change log read by the in-memory hot tier and notifications sent to the change listener.
+-- Databases created by an earlier docker/init.sql already have these objects, so every statement can be repeated
+CREATE TABLE IF NOT EXISTS customer_changes(
+    change_id                   bigserial PRIMARY KEY,
+    customer_id                 varchar(9) NOT NULL,
+    txid                        bigint NOT NULL DEFAULT txid_current()
+);
+
+CREATE INDEX IF NOT EXISTS customer_changes_txid ON customer_changes (txid);
+
+CREATE OR REPLACE FUNCTION log_customer_changes() RETURNS trigger AS $$
+DECLARE
+    changed_ids text;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO customer_changes (customer_id) SELECT customer_id FROM old_rows;
+        SELECT string_agg(DISTINCT customer_id, ',') INTO changed_ids FROM old_rows;
+    ELSE
+        INSERT INTO customer_changes (customer_id) SELECT customer_id FROM new_rows;
+        SELECT string_agg(DISTINCT customer_id, ',') INTO changed_ids FROM new_rows;
+    END IF;
+    -- the payload of a notification is limited to 8000 bytes, '*' asks listeners to drop everything
+    IF length(changed_ids) > 7000 THEN
+        changed_ids := '*';
+    END IF;
+    IF changed_ids IS NOT NULL THEN
+        PERFORM pg_notify('customers_changed', changed_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS customers_inserted ON customers;
+CREATE TRIGGER customers_inserted AFTER INSERT ON customers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_customer_changes();
+
+DROP TRIGGER IF EXISTS customers_updated ON customers;
+CREATE TRIGGER customers_updated AFTER UPDATE ON customers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_customer_changes();
+
+DROP TRIGGER IF EXISTS customers_deleted ON customers;
+CREATE TRIGGER customers_deleted AFTER DELETE ON customers
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_customer_changes();
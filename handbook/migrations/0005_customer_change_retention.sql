@@ -0,0 +1,44 @@
+-- Entries of the change log are kept for 'customer_change_retention()'. Every statement that logs changes
+-- also removes up to twice as many expired entries plus 100, so the log does not grow with the total number of changes.
+-- Entries locked by a concurrent statement are skipped instead of waited for
+ALTER TABLE customer_changes ADD COLUMN IF NOT EXISTS changed_at timestamptz NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS customer_changes_changed_at ON customer_changes (changed_at);
+
+CREATE OR REPLACE FUNCTION customer_change_retention() RETURNS interval AS $$
+    SELECT interval '1 day';
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION log_customer_changes() RETURNS trigger AS $$
+DECLARE
+    changed_ids text;
+    changed_count bigint;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO customer_changes (customer_id) SELECT customer_id FROM old_rows;
+        GET DIAGNOSTICS changed_count = ROW_COUNT;
+        SELECT string_agg(DISTINCT customer_id, ',') INTO changed_ids FROM old_rows;
+    ELSE
+        INSERT INTO customer_changes (customer_id) SELECT customer_id FROM new_rows;
+        GET DIAGNOSTICS changed_count = ROW_COUNT;
+        SELECT string_agg(DISTINCT customer_id, ',') INTO changed_ids FROM new_rows;
+    END IF;
+    DELETE FROM customer_changes
+    WHERE change_id IN (
+        SELECT change_id
+        FROM customer_changes
+        WHERE changed_at < now() - customer_change_retention()
+        ORDER BY changed_at
+        LIMIT 2 * changed_count + 100
+        FOR UPDATE SKIP LOCKED
+    );
+    -- the payload of a notification is limited to 8000 bytes, '*' asks listeners to drop everything
+    IF length(changed_ids) > 7000 THEN
+        changed_ids := '*';
+    END IF;
+    IF changed_ids IS NOT NULL THEN
+        PERFORM pg_notify('customers_changed', changed_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from handbook.batch_runner import execute_request
+from handbook.customer_service import CustomerService
+from handbook.validator import Validator
+
+
+class CustomerServer:
+    def __init__(self, customer_service: CustomerService, commands: dict, max_workers: int = 8,
+                 max_requests: int = 64, thread_safe: bool = False, validator=Validator) -> None:
+        """
+        Serves the batch mode JSON Lines protocol over TCP or a Unix socket.
+        Every line received from a client is executed as a command and answered with one JSON line,
+        commands of one connection are executed in order.
+        :param customer_service: CustomerService
+        :param commands: dict of command classes by command name
+        :param max_workers: number of threads that execute blocking storage calls
+        :param max_requests: maximum number of commands executed or waiting for a worker at the same time
+        :param thread_safe: False executes one command at a time for storages that can not be shared between threads
+        """
+        self.customer_service = customer_service
+        self.commands = commands
+        self.validator = validator
+        self.max_requests = max_requests
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="handbook-worker")
+        self._storage_lock = None if thread_safe else threading.Lock()
+        self._requests = None
+        self._server = None
+        self._clients = set()
+        self._handlers = set()
+        self._in_flight = set()
+        self._stopping = None
+
+    async def serve(self, host: str = None, port: int = None, unix_path: str = None) -> None:
+        """
+        Accepts connections until 'shutdown' is called or SIGINT/SIGTERM is received
+        :param host: TCP host
+        :param port: TCP port
+        :param unix_path: path of a Unix socket, used instead of the TCP address if given
+        """
+        loop = asyncio.get_running_loop()
+        self._requests = asyncio.Semaphore(self.max_requests)
+        self._stopping = asyncio.Event()
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host=host, port=port)
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signal_number, self.shutdown)
+            except (NotImplementedError, RuntimeError):
+                pass
+        try:
+            await self._stopping.wait()
+        finally:
+            await self._close()
+
+    @property
+    def addresses(self) -> list:
+        return [sock.getsockname() for sock in self._server.sockets] if self._server is not None else []
+
+    def shutdown(self) -> None:
+        """
+        Stops accepting connections; commands that are already running are completed before 'serve' returns
+        """
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _close(self, timeout: float = 30.0) -> None:
+        """
+        Stops accepting connections, waits for the running commands, then closes the client connections.
+        The connections are closed before 'wait_closed', which waits for them from Python 3.12.1
+        """
+        self._server.close()
+        if self._in_flight:
+            await asyncio.wait(self._in_flight, timeout=timeout)
+        for writer in list(self._clients):
+            writer.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        if self._handlers:
+            await asyncio.wait(self._handlers)
+        await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        handler.add_done_callback(self._handlers.discard)
+        self._clients.add(writer)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                if line.strip() == b"":
+                    continue
+                task = asyncio.ensure_future(self._execute(line.decode("utf-8", errors="replace")))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+                response = await task
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _execute(self, line: str) -> dict:
+        async with self._requests:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._execute_blocking, line)
+
+    def _execute_blocking(self, line: str) -> dict:
+        if self._storage_lock is None:
+            return execute_request(line, self.customer_service, self.commands, self.validator)
+        with self._storage_lock:
+            return execute_request(line, self.customer_service, self.commands, self.validator)
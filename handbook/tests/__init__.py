@@ -1,8 +1,21 @@
 __all__ = [
+    "test_async_customer_service",
+    "test_batch_runner",
+    "test_caching_storage",
+    "test_cached_xml_storage",
+    "test_columnar_storage",
+    "test_customer_import",
     "test_customer_service",
     "test_customer_storage",
     "test_database_connection",
+    "test_database_migrations",
     "test_database_storage",
+    "test_fixed_record_storage",
+    "test_indexed_xml_storage",
+    "test_journaled_xml_storage",
+    "test_server",
+    "test_sqlite_storage",
+    "test_tiered_storage",
     "test_validator",
     "test_xml_storage"
 ]
@@ -0,0 +1,95 @@
+import unittest
+from os import environ
+from unittest.mock import AsyncMock
+
+from handbook.async_customer_service import AsyncCustomerService, AsyncDataBaseStorage
+from handbook.customer_service import Customer, CustomerException
+
+
+class TestAsyncCustomerService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.customer = Customer("000000001", "Ivanov Vasyl", "developer", "FGH-2000", "vasyl@mail.ru",
+                                 "79278763423")
+        self.storage_mock = AsyncMock()
+        self.customer_service = AsyncCustomerService(self.storage_mock)
+
+    async def test_create_customer(self) -> None:
+        # GIVEN
+        self.storage_mock.insert_new_customer.return_value = True
+
+        # WHEN
+        await self.customer_service.create_customer("000000001", "Ivanov Vasyl", "developer", "FGH-2000",
+                                                    "vasyl@mail.ru", "79278763423")
+
+        # THEN
+        self.assertEqual(self.storage_mock.insert_new_customer.call_args.args[0], self.customer)
+
+    async def test_remove_customer_raise_exception(self) -> None:
+        # GIVEN
+        self.storage_mock.delete_customer_by_id.return_value = False
+
+        # WHEN
+        with self.assertRaises(CustomerException):
+            await self.customer_service.remove_customer("000000001")
+
+        # THEN
+        self.storage_mock.delete_customer_by_id.assert_awaited_once_with("000000001")
+
+    async def test_get_page_of_customers(self) -> None:
+        # GIVEN
+        self.storage_mock.list_page.return_value = [self.customer]
+
+        # WHEN
+        customers, cursor = await self.customer_service.get_page_of_customers(["email"], 1)
+
+        # THEN
+        self.assertEqual(customers, [self.customer])
+        self.assertEqual(cursor, ("vasyl@mail.ru", "000000001"))
+
+
+@unittest.skipUnless(environ.get('test_db'), "set test_db, test_user, test_password, test_host, test_port "
+                                             "to run against a local Postgres with the docker/init.sql schema")
+class TestAsyncDataBaseStorage(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.storage = AsyncDataBaseStorage(environ.get('test_db'), environ.get('test_user'),
+                                            environ.get('test_password'), environ.get('test_host', 'localhost'),
+                                            environ.get('test_port', '5432'))
+        await self.storage.open()
+        self.customer = Customer("999999991", "Ivanov Vasyl", "developer", "FGH-2000", "vasyl@mail.ru",
+                                 "79278763423")
+        await self.storage.delete_customer_by_id(self.customer.customer_id)
+
+    async def asyncTearDown(self) -> None:
+        await self.storage.delete_customer_by_id(self.customer.customer_id)
+        await self.storage.close()
+
+    async def test_insert_update_delete(self) -> None:
+        # GIVEN
+        inserted = await self.storage.insert_new_customer(self.customer)
+
+        # WHEN
+        inserted_again = await self.storage.insert_new_customer(self.customer)
+        updated = await self.storage.update_customer_by_id({"customer_id": "999999991", "phone": "79278763447"})
+        customer = await self.storage.find_customer("customer_id", "999999991")
+        deleted = await self.storage.delete_customer_by_id("999999991")
+
+        # THEN
+        self.assertTrue(inserted)
+        self.assertFalse(inserted_again)
+        self.assertTrue(updated)
+        self.assertEqual(customer.phone, "79278763447")
+        self.assertTrue(deleted)
+
+    async def test_iter_customers(self) -> None:
+        # GIVEN
+        await self.storage.insert_customer(self.customer)
+
+        # WHEN
+        customers = [customer async for customer in self.storage.iter_customers(["customer_id"])]
+
+        # THEN
+        self.assertIn(self.customer, customers)
+
+
+if __name__ == '__main__':
+    unittest.main()
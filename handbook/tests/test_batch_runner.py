@@ -0,0 +1,102 @@
+import io
+import json
+import unittest
+
+from handbook.batch_runner import run_batch
+from handbook.command_parser import ExitCommand, InsertCommand, FindCommand, UpdateCommand, DeleteCommand, \
+    ListCommand
+from handbook.customer_service import CustomerService, InMemoryStorage
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.customer_service = CustomerService(InMemoryStorage())
+        self.commands = {
+            'insert': InsertCommand,
+            'find': FindCommand,
+            'update': UpdateCommand,
+            'delete': DeleteCommand,
+            'list': ListCommand,
+            'exit': ExitCommand,
+        }
+        self.customer = {"customer_id": "000000001", "full_name": "Ivanov Vasyl", "position": "developer",
+                         "name_of_the_organization": "FGH", "email": "vasyl@mail.ru", "phone": "79278763423"}
+
+    def run_commands(self, *requests) -> list:
+        input_file = io.StringIO("".join(json.dumps(request) + "\n" for request in requests))
+        output_file = io.StringIO()
+        run_batch(input_file, output_file, self.customer_service, self.commands)
+        return [json.loads(line) for line in output_file.getvalue().splitlines()]
+
+    def test_run_batch(self) -> None:
+        # GIVEN
+        requests = [{"id": "a", "command": "insert", "arguments": self.customer},
+                    {"command": "update", "arguments": {"customer_id": "000000001", "phone": "79278763447"}},
+                    {"command": "find", "arguments": {"phone": "79278763447"}},
+                    {"command": "list", "arguments": {"sort": ["full_name"], "limit": 1}},
+                    {"command": "delete", "arguments": {"customer_id": "000000001"}}]
+
+        # WHEN
+        responses = self.run_commands(*requests)
+
+        # THEN
+        self.assertEqual([response["status"] for response in responses], ["ok"] * 5)
+        self.assertEqual(responses[0]["id"], "a")
+        self.assertEqual(responses[2]["result"]["customer_id"], "000000001")
+        self.assertEqual(responses[3]["result"]["next"], ["Ivanov Vasyl", "000000001"])
+        self.assertIsNone(self.customer_service.find_customer("customer_id", "000000001"))
+
+    def test_find_all(self) -> None:
+        # GIVEN
+        other_customer = dict(self.customer, customer_id="000000002", full_name="Ivanova Anna")
+        requests = [{"command": "insert", "arguments": self.customer},
+                    {"command": "insert", "arguments": other_customer},
+                    {"command": "find", "arguments": {"all": True, "position": "developer",
+                                                      "full_name": {"prefix": "Ivanova"}}},
+                    {"command": "find", "arguments": {"all": True,
+                                                      "customer_id": {"in": ["000000002", "000000001"]}}},
+                    {"command": "find", "arguments": {"all": True, "customer_id": {"in": ["RE0000001"]}}},
+                    {"command": "find", "arguments": {"all": True, "email": {"like": "vasyl"}}}]
+
+        # WHEN
+        responses = self.run_commands(*requests)
+
+        # THEN
+        self.assertEqual([response["status"] for response in responses], ["ok"] * 4 + ["error"] * 2)
+        self.assertEqual(responses[2]["result"], {"customers": [other_customer]})
+        self.assertEqual([customer["customer_id"] for customer in responses[3]["result"]["customers"]],
+                         ["000000001", "000000002"])
+
+    def test_run_batch_errors(self) -> None:
+        # GIVEN
+        invalid_customer = dict(self.customer, customer_id="RE0000001")
+        requests = [{"command": "insert", "arguments": invalid_customer},
+                    {"command": "delete", "arguments": {"customer_id": "000000001"}},
+                    {"command": "unknown"}]
+
+        # WHEN
+        responses = self.run_commands(*requests)
+
+        # THEN
+        self.assertEqual([response["status"] for response in responses], ["error"] * 3)
+        self.assertEqual(responses[1]["error"], "Customer does not exist")
+
+    def test_exit_stops_batch_with_failures(self) -> None:
+        # GIVEN
+        requests = [{"command": "delete", "arguments": {"customer_id": "000000001"}},
+                    {"command": "exit"},
+                    {"command": "insert", "arguments": self.customer}]
+        input_file = io.StringIO("".join(json.dumps(request) + "\n" for request in requests))
+        output_file = io.StringIO()
+
+        # WHEN
+        failed = run_batch(input_file, output_file, self.customer_service, self.commands)
+
+        # THEN
+        self.assertEqual(failed, 1)
+        self.assertEqual(len(output_file.getvalue().splitlines()), 1)
+        self.assertIsNone(self.customer_service.find_customer("customer_id", "000000001"))
+
+
+if __name__ == '__main__':
+    unittest.main()
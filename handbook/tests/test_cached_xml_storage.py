@@ -0,0 +1,140 @@
+import os.path
+import unittest
+
+from handbook.customer_service import CachedXMLStorage, XMLStorage, Customer
+
+
+class TestCachedXMLStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path_file = "test_cached_handbook.xml"
+        self.xml_storage = CachedXMLStorage(self.path_file, flush_interval=60)
+
+    def tearDown(self) -> None:
+        self.xml_storage.flush()
+        if os.path.exists(self.path_file):
+            os.remove(self.path_file)
+
+    def test_insert_customer(self) -> None:
+        # GIVEN
+        arguments = "000000001,Ivanov Vasyl,developer,FGH,vasyl@mail.ru,79278763423".split(",")
+        customer = Customer(*arguments)
+
+        # WHEN
+        self.xml_storage.insert_customer(customer)
+
+        # THEN
+        customer = self.xml_storage.find_customer("customer_id", "000000001")
+        self.assertIsNotNone(customer)
+
+    def test_changes_written_on_flush(self) -> None:
+        # GIVEN
+        arguments = "000000002,Ivanov Peter,manager,FGH,peter@mail.ru,79279826478".split(",")
+        self.xml_storage.insert_customer(Customer(*arguments))
+        self.assertIsNone(XMLStorage(self.path_file).find_customer("customer_id", "000000002"))
+
+        # WHEN
+        self.xml_storage.flush()
+
+        # THEN
+        customer = XMLStorage(self.path_file).find_customer("email", "peter@mail.ru")
+        self.assertEqual(customer.full_name, "Ivanov Peter")
+
+    def test_reload_after_external_change(self) -> None:
+        # GIVEN
+        self.xml_storage.list_of_customer([])
+        arguments = "000000003,Romanov Dmitriy,manager,FGH,dmitriy@mail.ru,79273987569".split(",")
+
+        # WHEN
+        XMLStorage(self.path_file).insert_customer(Customer(*arguments))
+
+        # THEN
+        customer = self.xml_storage.find_customer("customer_id", "000000003")
+        self.assertIsNotNone(customer)
+
+    def test_update_and_delete_customer_loaded_from_file(self) -> None:
+        # GIVEN
+        customers = [Customer("000000005", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423"),
+                     Customer("000000006", "Brown Ivan", "manager", "FGH", "ivan@mail.ru", "79278763424")]
+        for customer in customers:
+            XMLStorage(self.path_file).insert_customer(customer)
+        xml_storage = CachedXMLStorage(self.path_file, flush_interval=60)
+
+        # WHEN
+        xml_storage.update_customer(customers[0], {"position": "general manager"})
+        xml_storage.delete_customer(customers[1])
+        xml_storage.flush()
+
+        # THEN
+        self.assertEqual(XMLStorage(self.path_file).find_customer("customer_id", "000000005").position,
+                         "general manager")
+        self.assertIsNone(XMLStorage(self.path_file).find_customer("customer_id", "000000006"))
+
+    def test_external_change_is_kept_on_flush(self) -> None:
+        # GIVEN
+        local_customer = Customer("000000007", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423")
+        external_customer = Customer("000000008", "Brown Ivan", "manager", "FGH", "ivan@mail.ru", "79278763424")
+        self.xml_storage.insert_customer(local_customer)
+
+        # WHEN
+        XMLStorage(self.path_file).insert_customer(external_customer)
+        self.xml_storage.flush()
+
+        # THEN
+        self.assertEqual(XMLStorage(self.path_file).list_of_customer(["customer_id"]),
+                         [local_customer, external_customer])
+        self.assertEqual(self.xml_storage.find_customer("email", "ivan@mail.ru"), external_customer)
+
+    def test_find_customer_uses_indexes(self) -> None:
+        # GIVEN
+        customer = Customer("000000009", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423")
+        self.xml_storage.insert_customer(customer)
+
+        # WHEN
+        self.xml_storage.update_customer(customer, {"email": "new@mail.ru"})
+
+        # THEN
+        self.assertEqual(self.xml_storage.cache.indexes["email"], {"new@mail.ru": "000000009"})
+        self.assertEqual(self.xml_storage.find_customer("email", "new@mail.ru").customer_id, "000000009")
+        self.assertIsNone(self.xml_storage.find_customer("email", "vasyl@mail.ru"))
+
+    def test_update_customer(self) -> None:
+        # GIVEN
+        arguments = "000000003,Romanov Dmitriy,manager,FGH,dmitriy@mail.ru,79273987569".split(",")
+        customer = Customer(*arguments)
+        self.xml_storage.insert_customer(customer)
+
+        # WHEN
+        self.xml_storage.update_customer(customer, {"position": "general manager"})
+        self.xml_storage.flush()
+
+        # THEN
+        customer = XMLStorage(self.path_file).find_customer("customer_id", "000000003")
+        self.assertEqual(customer.position, "general manager")
+
+    def test_delete_customer(self) -> None:
+        # GIVEN
+        arguments = "000000004,Green Alexandr,manager,FGH,alexandr@mail.ru,79056987458".split(",")
+        customer = Customer(*arguments)
+        self.xml_storage.insert_customer(customer)
+
+        # WHEN
+        self.xml_storage.delete_customer(customer)
+
+        # THEN
+        customer = self.xml_storage.find_customer("customer_id", "000000004")
+        self.assertIsNone(customer)
+
+    def test_list_of_customer_ordered(self) -> None:
+        # GIVEN
+        self.xml_storage.insert_customer(Customer(*"000000005,Green Alexandr,manager,FGH,a@mail.ru,7905".split(",")))
+        self.xml_storage.insert_customer(Customer(*"000000006,Brown Ivan,manager,FGH,b@mail.ru,7906".split(",")))
+
+        # WHEN
+        customers = self.xml_storage.list_of_customer(["full_name"])
+
+        # THEN
+        self.assertEqual([customer.customer_id for customer in customers], ["000000006", "000000005"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import patch
+
+from handbook.customer_service import CachingStorage, Customer, InMemoryStorage
+
+
+class TestCachingStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.storage = InMemoryStorage()
+        self.customers = [
+            Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423"),
+            Customer("000000002", "Brown Ivan", "manager", "FGH", "ivan@mail.ru", "79278763424"),
+            Customer("000000003", "Adams Peter", "developer", "ABC", "peter@mail.ru", "79278763425"),
+        ]
+        for customer in self.customers:
+            self.storage.insert_customer(customer)
+        self.caching_storage = CachingStorage(self.storage, max_size=2)
+
+    def test_find_customer_is_read_through(self) -> None:
+        # WHEN
+        with patch.object(self.storage, "find_customer", wraps=self.storage.find_customer) as find_customer:
+            first = self.caching_storage.find_customer("email", "ivan@mail.ru")
+            second = self.caching_storage.find_customer("email", "ivan@mail.ru")
+
+        # THEN
+        self.assertEqual(first, self.customers[1])
+        self.assertIs(first, second)
+        find_customer.assert_called_once_with("email", "ivan@mail.ru")
+        self.assertEqual((self.caching_storage.metrics.hits, self.caching_storage.metrics.misses), (1, 1))
+
+    def test_update_invalidates_every_key_of_customer(self) -> None:
+        # GIVEN
+        self.caching_storage.find_customer("customer_id", "000000001")
+        self.caching_storage.find_customer("email", "vasyl@mail.ru")
+
+        # WHEN
+        self.caching_storage.update_customer_by_id({"customer_id": "000000001", "email": "new@mail.ru"})
+
+        # THEN
+        self.assertEqual(len(self.caching_storage._entries), 0)
+        self.assertIsNone(self.caching_storage.find_customer("email", "vasyl@mail.ru"))
+        self.assertEqual(self.caching_storage.find_customer("customer_id", "000000001").email, "new@mail.ru")
+
+    def test_delete_invalidates_customer(self) -> None:
+        # GIVEN
+        self.caching_storage.find_customer("customer_id", "000000002")
+
+        # WHEN
+        self.caching_storage.delete_many(["000000002"])
+
+        # THEN
+        self.assertIsNone(self.caching_storage.find_customer("customer_id", "000000002"))
+
+    def test_change_in_other_process_invalidates_customer(self) -> None:
+        # GIVEN
+        self.caching_storage.find_customer("customer_id", "000000001")
+        self.caching_storage.find_customer("customer_id", "000000002")
+
+        # WHEN
+        self.caching_storage.on_change(["000000001"])
+
+        # THEN
+        self.assertEqual(list(self.caching_storage._entries), [("customer_id", "000000002")])
+        self.caching_storage.on_change(None)
+        self.assertEqual(len(self.caching_storage._entries), 0)
+
+    def test_search_during_change_is_not_cached(self) -> None:
+        # GIVEN
+        stale_customer = Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "old@mail.ru", "79278763423")
+
+        def find_while_changing(customer_ids) -> None:
+            with patch.object(self.storage, "find_customer", return_value=stale_customer):
+                self.caching_storage.find_customer("customer_id", "000000001")
+
+        # WHEN
+        with patch.object(self.storage, "on_change", side_effect=find_while_changing):
+            self.caching_storage.on_change(["000000001"])
+
+        # THEN
+        self.assertEqual(self.caching_storage.find_customer("customer_id", "000000001").email, "vasyl@mail.ru")
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        # GIVEN
+        self.caching_storage.find_customer("customer_id", "000000001")
+        self.caching_storage.find_customer("customer_id", "000000002")
+        self.caching_storage.find_customer("customer_id", "000000001")
+
+        # WHEN
+        self.caching_storage.find_customer("customer_id", "000000003")
+
+        # THEN
+        self.assertEqual(self.caching_storage.metrics.evictions, 1)
+        self.assertEqual(list(self.caching_storage._entries),
+                         [("customer_id", "000000001"), ("customer_id", "000000003")])
+
+    def test_entry_expires_after_ttl(self) -> None:
+        # GIVEN
+        caching_storage = CachingStorage(self.storage, ttl=10)
+        with patch("handbook.customer_service.time.monotonic", return_value=100.0):
+            caching_storage.find_customer("customer_id", "000000001")
+
+        # WHEN
+        with patch("handbook.customer_service.time.monotonic", return_value=111.0):
+            caching_storage.find_customer("customer_id", "000000001")
+
+        # THEN
+        self.assertEqual((caching_storage.metrics.hits, caching_storage.metrics.misses), (0, 2))
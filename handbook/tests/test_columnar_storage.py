@@ -0,0 +1,90 @@
+import unittest
+
+from handbook.customer_service import ColumnarStorage, Customer, Predicate
+
+
+class TestColumnarStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.customer_storage = ColumnarStorage()
+        self.customers = [
+            Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423"),
+            Customer("000000002", "Brown Ivan", "manager", "FGH", "ivan@mail.ru", "79278763424"),
+            Customer("000000003", "Adams Peter", "developer", "ABC", "peter@mail.ru", "79278763425"),
+        ]
+        for customer in self.customers:
+            self.customer_storage.insert_customer(customer)
+
+    def test_find_customer(self) -> None:
+        # WHEN
+        customer = self.customer_storage.find_customer("email", "ivan@mail.ru")
+
+        # THEN
+        self.assertEqual(customer, self.customers[1])
+        self.assertEqual(customer.full_name, "Brown Ivan")
+
+    def test_filter_customers_prefix(self) -> None:
+        # WHEN
+        customers = self.customer_storage.filter_customers("full_name", "Ivan", prefix=True)
+
+        # THEN
+        self.assertEqual(customers, [self.customers[0]])
+
+    def test_find_all(self) -> None:
+        # WHEN
+        customers = self.customer_storage.find_all([Predicate("name_of_the_organization", "eq", "FGH"),
+                                                    Predicate("position", "in", ["developer", "tester"])])
+        by_prefix = self.customer_storage.find_all([Predicate("email", "prefix", "i"),
+                                                    Predicate("customer_id", "eq", "000000002")])
+
+        # THEN
+        self.assertEqual(customers, [self.customers[0]])
+        self.assertEqual(by_prefix, [self.customers[1]])
+
+    def test_encoded_columns(self) -> None:
+        # WHEN
+        by_prefix = self.customer_storage.filter_customers("position", "dev", prefix=True)
+        by_unknown = self.customer_storage.find_customer("name_of_the_organization", "XYZ")
+        by_in = self.customer_storage.find_all([Predicate("name_of_the_organization", "in", ["ABC", "XYZ"])])
+
+        # THEN
+        self.assertEqual(self.customer_storage.categories["position"], ["developer", "manager"])
+        self.assertEqual(list(self.customer_storage.columns["position"]), [0, 1, 0])
+        self.assertEqual(by_prefix, [self.customers[0], self.customers[2]])
+        self.assertIsNone(by_unknown)
+        self.assertEqual(by_in, [self.customers[2]])
+        self.assertEqual(by_prefix[1].position, "developer")
+
+    def test_update_customer(self) -> None:
+        # WHEN
+        self.customer_storage.update_customer(self.customers[1], {"position": "developer"})
+
+        # THEN
+        customers = self.customer_storage.filter_customers("position", "developer")
+        self.assertEqual(len(customers), 3)
+
+    def test_delete_customer(self) -> None:
+        # WHEN
+        self.customer_storage.delete_customer(self.customers[0])
+
+        # THEN
+        self.assertIsNone(self.customer_storage.find_customer("customer_id", "000000001"))
+        self.assertEqual(self.customer_storage.find_customer("customer_id", "000000003").full_name, "Adams Peter")
+        self.assertEqual(len(self.customer_storage), 2)
+
+    def test_list_of_customer_ordered(self) -> None:
+        # WHEN
+        customers = self.customer_storage.list_of_customer(["position", "full_name"])
+
+        # THEN
+        self.assertEqual([customer.customer_id for customer in customers], ["000000003", "000000001", "000000002"])
+
+    def test_list_page(self) -> None:
+        # WHEN
+        customers = self.customer_storage.list_page(["position"], 2, after=("developer", "000000001"))
+
+        # THEN
+        self.assertEqual([customer.customer_id for customer in customers], ["000000003", "000000002"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os.path
+import unittest
+
+from handbook.customer_import import read_customers
+from handbook.customer_service import Customer
+from handbook.validator import ValidateException
+
+
+class TestCustomerImport(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path_file = None
+
+    def tearDown(self) -> None:
+        if self.path_file is not None and os.path.exists(self.path_file):
+            os.remove(self.path_file)
+
+    def write_file(self, file_name: str, content: str) -> None:
+        self.path_file = file_name
+        with open(file_name, "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def test_read_customers_csv(self) -> None:
+        # GIVEN
+        self.write_file("test_import.csv",
+                        "customer_id,full_name,position,name_of_the_organization,email,phone\n"
+                        "000000001,Ivanov Vasyl,developer,FGH,vasyl@mail.ru,79278763423\n")
+
+        # WHEN
+        customers = list(read_customers(self.path_file))
+
+        # THEN
+        self.assertEqual(customers, [Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru",
+                                              "79278763423")])
+
+    def test_read_customers_json_lines(self) -> None:
+        # GIVEN
+        self.write_file("test_import.jsonl",
+                        '{"customer_id": "000000002", "full_name": "Ivanov Peter", "position": "manager", '
+                        '"name_of_the_organization": "FGH", "email": "peter@mail.ru", "phone": "79279826478"}\n')
+
+        # WHEN
+        customers = list(read_customers(self.path_file))
+
+        # THEN
+        self.assertEqual(customers[0].full_name, "Ivanov Peter")
+
+    def test_read_customers_raise_exception(self) -> None:
+        # GIVEN
+        self.write_file("test_import.csv", "RE0000001,Ivanov Vasyl,developer,FGH,vasyl@mail.ru,79278763423\n")
+
+        # WHEN
+        with self.assertRaises(ValidateException) as context:
+            list(read_customers(self.path_file))
+
+        # THEN
+        self.assertIn("Line 1", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
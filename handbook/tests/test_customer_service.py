@@ -26,7 +26,7 @@ class TestCustomerService(unittest.TestCase):
                                      self.phone
                                      )
         customer_storage_mock = MockStorageStrategy()
-        customer_storage_mock.find_customer.return_value = None
+        customer_storage_mock.insert_new_customer.return_value = True
         customer_service = CustomerService(customer_storage_mock)
 
         # WHEN
@@ -39,11 +39,29 @@ class TestCustomerService(unittest.TestCase):
                                          )
 
         # THEN
-        self.assertTrue(customer_storage_mock.insert_customer.assert_called_once)
+        customer_storage_mock.insert_new_customer.assert_called_once()
+        customer_storage_mock.find_customer.assert_not_called()
 
-        customer_to_insert = customer_storage_mock.insert_customer.call_args.args[0]
+        customer_to_insert = customer_storage_mock.insert_new_customer.call_args.args[0]
         self.assertTrue(eq(expected_customer, customer_to_insert))
 
+    @patch('handbook.customer_service.StorageStrategy')
+    def test_create_existing_customer_raise_exception(self, MockStorageStrategy: Mock) -> None:
+        # GIVEN
+        customer_storage_mock = MockStorageStrategy()
+        customer_storage_mock.insert_new_customer.return_value = False
+        customer_service = CustomerService(customer_storage_mock)
+
+        # WHEN
+        with self.assertRaises(CustomerException):
+            customer_service.create_customer(self.customer_id,
+                                             self.full_name,
+                                             self.position,
+                                             self.name_of_the_organization,
+                                             self.email,
+                                             self.phone
+                                             )
+
     @patch('handbook.customer_service.StorageStrategy')
     def test_create_customer_raise_exception(self, MockStorageStrategy: Mock) -> None:
         # GIVEN
@@ -86,59 +104,47 @@ class TestCustomerService(unittest.TestCase):
     @patch('handbook.customer_service.StorageStrategy')
     def test_update_customer(self, MockStorageStrategy: Mock) -> None:
         # GIVEN
-        expected_customer = Customer(self.customer_id,
-                                     self.full_name,
-                                     self.position,
-                                     self.name_of_the_organization,
-                                     self.email,
-                                     self.phone
-                                     )
         new_phone = "79278763447"
+        updatable_arguments = {"customer_id": self.customer_id, "phone": new_phone}
 
         customer_storage_mock = MockStorageStrategy()
-        customer_storage_mock.find_customer.return_value = expected_customer
+        customer_storage_mock.update_customer_by_id.return_value = True
         customer_service = CustomerService(customer_storage_mock)
 
         # WHEN
-        customer_service.update_customer(self.customer_id,
-                                         self.full_name,
-                                         self.position,
-                                         self.name_of_the_organization,
-                                         self.email,
-                                         new_phone
-                                         )
+        customer_service.update_customer(updatable_arguments)
 
         # THEN
-        self.assertTrue(customer_storage_mock.update_customer.assert_called_once)
+        customer_storage_mock.update_customer_by_id.assert_called_once()
+        customer_storage_mock.find_customer.assert_not_called()
+
+        arguments_to_update = customer_storage_mock.update_customer_by_id.call_args.args[0]
+        self.assertEqual(arguments_to_update["phone"], new_phone)
 
-        updated_phone = customer_storage_mock.update_customer.call_args.args[5]
-        self.assertEqual(updated_phone, new_phone)
+    @patch('handbook.customer_service.StorageStrategy')
+    def test_update_missing_customer_raise_exception(self, MockStorageStrategy: Mock) -> None:
+        # GIVEN
+        customer_storage_mock = MockStorageStrategy()
+        customer_storage_mock.update_customer_by_id.return_value = False
+        customer_service = CustomerService(customer_storage_mock)
 
-        customer_to_update = customer_storage_mock.update_customer.call_args.args[0]
-        self.assertTrue(eq(expected_customer, customer_to_update))
+        # WHEN
+        with self.assertRaises(CustomerException):
+            customer_service.update_customer({"customer_id": self.customer_id, "phone": "79278763447"})
 
     @patch('handbook.customer_service.StorageStrategy')
     def test_remove_customer(self, MockStorageStrategy: Mock) -> None:
         # GIVEN
-        expected_customer = Customer(self.customer_id,
-                                     self.full_name,
-                                     self.position,
-                                     self.name_of_the_organization,
-                                     self.email,
-                                     self.phone
-                                     )
         customer_storage_mock = MockStorageStrategy()
-        customer_storage_mock.find_customer.return_value = expected_customer
+        customer_storage_mock.delete_customer_by_id.return_value = True
         customer_service = CustomerService(customer_storage_mock)
 
         # WHEN
         customer_service.remove_customer(self.customer_id)
 
         # THEN
-        self.assertTrue(customer_storage_mock.delete_customer.assert_called_once)
-
-        customer_to_remove = customer_storage_mock.delete_customer.call_args.args[0]
-        self.assertTrue(eq(expected_customer, customer_to_remove))
+        customer_storage_mock.delete_customer_by_id.assert_called_once_with(self.customer_id)
+        customer_storage_mock.find_customer.assert_not_called()
 
     @patch('handbook.customer_service.StorageStrategy')
     def test_display_customer_data(self, MockStorageStrategy: Mock) -> None:
@@ -185,5 +191,51 @@ class TestCustomerService(unittest.TestCase):
         self.assertEqual(params, list_options)
 
 
+    @patch('handbook.customer_service.StorageStrategy')
+    def test_get_page_of_customers(self, MockStorageStrategy: Mock) -> None:
+        # GIVEN
+        expected_customer = Customer(self.customer_id,
+                                     self.full_name,
+                                     self.position,
+                                     self.name_of_the_organization,
+                                     self.email,
+                                     self.phone
+                                     )
+        customer_storage_mock = MockStorageStrategy()
+        customer_storage_mock.list_page.return_value = [expected_customer]
+        customer_service = CustomerService(customer_storage_mock)
+
+        # WHEN
+        customers, cursor = customer_service.get_page_of_customers(["full_name"], 1)
+
+        # THEN
+        self.assertEqual(customers, [expected_customer])
+        self.assertEqual(cursor, (self.full_name, self.customer_id))
+
+    @patch('handbook.customer_service.StorageStrategy')
+    def test_get_page_of_customers_raise_exception(self, MockStorageStrategy: Mock) -> None:
+        # GIVEN
+        customer_service = CustomerService(MockStorageStrategy())
+
+        # WHEN
+        with self.assertRaises(CustomerException):
+            customer_service.get_page_of_customers([], 0)
+
+
+    @patch('handbook.customer_service.StorageStrategy')
+    def test_delete_many_raise_exception(self, MockStorageStrategy: Mock) -> None:
+        # GIVEN
+        customer_storage_mock = MockStorageStrategy()
+        customer_storage_mock.delete_many.return_value = [self.customer_id]
+        customer_service = CustomerService(customer_storage_mock)
+
+        # WHEN
+        with self.assertRaises(CustomerException):
+            customer_service.delete_many([self.customer_id])
+
+        # THEN
+        customer_storage_mock.find_customer.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,7 @@
 import unittest
+from operator import attrgetter
 
-from handbook.customer_service import InMemoryStorage, Customer
+from handbook.customer_service import InMemoryStorage, Customer, CustomerException, Predicate
 
 
 class TestCustomerStorage(unittest.TestCase):
@@ -47,6 +48,59 @@ class TestCustomerStorage(unittest.TestCase):
         # THEN
         self.assertIsNotNone(customer)
 
+    def test_find_customer_by_email(self) -> None:
+        # GIVEN
+        expected_customer = Customer(self.customer_id,
+                                     self.full_name,
+                                     self.position,
+                                     self.name_of_the_organization,
+                                     self.email,
+                                     self.phone
+                                     )
+        self.customer_storage.insert_customer(expected_customer)
+
+        # WHEN
+        customer = self.customer_storage.find_customer("email", self.email)
+
+        # THEN
+        self.assertIs(customer, expected_customer)
+
+    def test_find_customer_after_update(self) -> None:
+        # GIVEN
+        expected_customer = Customer(self.customer_id,
+                                     self.full_name,
+                                     self.position,
+                                     self.name_of_the_organization,
+                                     self.email,
+                                     self.phone
+                                     )
+        self.customer_storage.insert_customer(expected_customer)
+
+        # WHEN
+        self.customer_storage.update_customer(expected_customer, {"phone": "79278763447"})
+
+        # THEN
+        self.assertIsNone(self.customer_storage.find_customer("phone", self.phone))
+        self.assertIs(self.customer_storage.find_customer("phone", "79278763447"), expected_customer)
+
+    def test_find_customer_after_delete(self) -> None:
+        # GIVEN
+        expected_customer = Customer(self.customer_id,
+                                     self.full_name,
+                                     self.position,
+                                     self.name_of_the_organization,
+                                     self.email,
+                                     self.phone
+                                     )
+        self.customer_storage.insert_customer(expected_customer)
+
+        # WHEN
+        self.customer_storage.delete_customer(expected_customer)
+
+        # THEN
+        self.assertIsNone(self.customer_storage.find_customer("full_name", self.full_name))
+        self.assertEqual(self.customer_storage.indexes["full_name"], {})
+
     def test_update_customer(self) -> None:
         # GIVEN
         expected_customer = Customer(self.customer_id,
@@ -120,5 +174,141 @@ class TestCustomerStorage(unittest.TestCase):
         self.assertIn(expected_customer, list_of_customer)
 
 
+    def test_list_of_customer_ordered_after_changes(self) -> None:
+        # GIVEN
+        self.customer_storage.insert_customer(Customer("000000001", "Ivanov Vasyl", "developer", "FGH",
+                                                       "vasyl@mail.ru", "79278763423"))
+        self.customer_storage.insert_customer(Customer("000000002", "Brown Ivan", "manager", "FGH",
+                                                       "ivan@mail.ru", "79278763424"))
+        self.customer_storage.insert_customer(Customer("000000003", "Adams Peter", "developer", "FGH",
+                                                       "peter@mail.ru", "79278763425"))
+        self.customer_storage.list_of_customer(["position", "full_name"])
+
+        # WHEN
+        customer = self.customer_storage.find_customer("customer_id", "000000002")
+        self.customer_storage.update_customer(customer, {"position": "analyst"})
+        self.customer_storage.delete_customer(self.customer_storage.find_customer("customer_id", "000000003"))
+        self.customer_storage.insert_customer(Customer("000000004", "Clark John", "developer", "FGH",
+                                                       "john@mail.ru", "79278763426"))
+        list_of_customer = self.customer_storage.list_of_customer(["position", "full_name"])
+
+        # THEN
+        expected_order = sorted(self.customer_storage.customers.values(), key=attrgetter("position", "full_name"))
+        self.assertEqual([customer.customer_id for customer in list_of_customer],
+                         [customer.customer_id for customer in expected_order])
+        self.assertEqual([customer.customer_id for customer in list_of_customer],
+                         ["000000002", "000000004", "000000001"])
+
+
+    def test_list_page(self) -> None:
+        # GIVEN
+        for number, full_name in enumerate(["Ivanov Vasyl", "Brown Ivan", "Adams Peter", "Brown Ivan"], 1):
+            self.customer_storage.insert_customer(Customer(f"00000000{number}", full_name, "developer", "FGH",
+                                                           "vasyl@mail.ru", "79278763423"))
+
+        # WHEN
+        first_page = self.customer_storage.list_page(["full_name"], 2)
+        second_page = self.customer_storage.list_page(["full_name"], 2, after=("Brown Ivan", "000000002"))
+
+        # THEN
+        self.assertEqual([customer.customer_id for customer in first_page], ["000000003", "000000002"])
+        self.assertEqual([customer.customer_id for customer in second_page], ["000000004", "000000001"])
+
+
+    def test_import_customers(self) -> None:
+        # GIVEN
+        existing_customer = Customer(self.customer_id, self.full_name, self.position,
+                                     self.name_of_the_organization, self.email, self.phone)
+        self.customer_storage.insert_customer(existing_customer)
+        customers = [Customer(self.customer_id, "Petrov Ivan", self.position, self.name_of_the_organization,
+                              self.email, self.phone),
+                     Customer("000000002", self.full_name, self.position, self.name_of_the_organization,
+                              self.email, self.phone)]
+
+        # WHEN
+        inserted = self.customer_storage.import_customers(customers)
+
+        # THEN
+        self.assertEqual(inserted, 1)
+        self.assertEqual(self.customer_storage.find_customer("customer_id", self.customer_id).full_name,
+                         self.full_name)
+        self.assertIsNotNone(self.customer_storage.find_customer("customer_id", "000000002"))
+
+
+    def test_insert_many_existing_customer(self) -> None:
+        # GIVEN
+        existing_customer = Customer(self.customer_id, self.full_name, self.position,
+                                     self.name_of_the_organization, self.email, self.phone)
+        self.customer_storage.insert_customer(existing_customer)
+        new_customer = Customer("000000002", self.full_name, self.position, self.name_of_the_organization,
+                                self.email, self.phone)
+
+        # WHEN
+        existing_ids = self.customer_storage.insert_many([new_customer, existing_customer])
+
+        # THEN
+        self.assertEqual(existing_ids, [self.customer_id])
+        self.assertIsNone(self.customer_storage.find_customer("customer_id", "000000002"))
+
+    def test_update_many_and_delete_many(self) -> None:
+        # GIVEN
+        customers = [Customer(f"00000000{number}", self.full_name, self.position, self.name_of_the_organization,
+                              self.email, self.phone) for number in range(1, 4)]
+        self.customer_storage.insert_many(customers)
+
+        # WHEN
+        missing_ids = self.customer_storage.update_many([{"customer_id": "000000001", "phone": "79278763447"},
+                                                         {"customer_id": "000000002", "email": "ivan@mail.ru"}])
+        self.customer_storage.delete_many(["000000002", "000000003"])
+
+        # THEN
+        self.assertEqual(missing_ids, [])
+        self.assertEqual(self.customer_storage.find_customer("phone", "79278763447").customer_id, "000000001")
+        self.assertEqual(self.customer_storage.list_of_customer([]), [customers[0]])
+
+
+    def test_insert_new_customer(self) -> None:
+        # GIVEN
+        expected_customer = Customer(self.customer_id, self.full_name, self.position,
+                                     self.name_of_the_organization, self.email, self.phone)
+
+        # WHEN
+        inserted = self.customer_storage.insert_new_customer(expected_customer)
+        inserted_again = self.customer_storage.insert_new_customer(expected_customer)
+
+        # THEN
+        self.assertTrue(inserted)
+        self.assertFalse(inserted_again)
+        self.assertFalse(self.customer_storage.delete_customer_by_id("000000002"))
+
+    def test_find_all(self) -> None:
+        # GIVEN
+        for number, (full_name, position) in enumerate([("Ivanov Vasyl", "developer"), ("Brown Ivan", "manager"),
+                                                        ("Ivanov Petr", "developer"), ("Ivanova Anna", "tester")], 1):
+            self.customer_storage.insert_customer(Customer(f"00000000{number}", full_name, position, "FGH",
+                                                           f"user{number}@mail.ru", "79278763423"))
+
+        # WHEN
+        developers = self.customer_storage.find_all([Predicate("full_name", "prefix", "Ivanov"),
+                                                     Predicate("position", "eq", "developer")])
+        by_ids = self.customer_storage.find_all([Predicate("customer_id", "in", ["000000004", "000000002", "9"]),
+                                                 Predicate("name_of_the_organization", "eq", "FGH")])
+        by_prefix = self.customer_storage.find_all([Predicate("full_name", "prefix", "Ivanov")])
+
+        # THEN
+        self.assertEqual([customer.customer_id for customer in developers], ["000000001", "000000003"])
+        self.assertEqual([customer.customer_id for customer in by_ids], ["000000002", "000000004"])
+        self.assertEqual([customer.customer_id for customer in by_prefix], ["000000001", "000000003", "000000004"])
+        self.assertEqual(self.customer_storage.find_all([Predicate("position", "eq", "director")]), [])
+        self.assertEqual(len(self.customer_storage.find_all([])), 4)
+
+    def test_predicate_unknown_operator(self) -> None:
+        # WHEN / THEN
+        with self.assertRaises(CustomerException):
+            Predicate("full_name", "like", "Ivanov")
+        with self.assertRaises(CustomerException):
+            Predicate("password", "eq", "1")
+
+
 if __name__ == '__main__':
     unittest.main()
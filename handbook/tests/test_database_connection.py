@@ -0,0 +1,185 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock, Mock
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from handbook.database_connection import ChangeListener, ConnectionPool, PoolException
+
+
+def connection_mock() -> Mock:
+    connection = Mock()
+    connection.closed = 0
+    connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+    return connection
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = ConnectionPool("handbook", "handbook_user", "111111", "localhost", "5432",
+                                   max_size=2, timeout=0.1)
+
+    @patch('handbook.database_connection.create_connection')
+    def test_connection_reused(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        mock_create_connection.side_effect = lambda *args: connection_mock()
+
+        # WHEN
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            pass
+
+        # THEN
+        self.assertIs(first, second)
+        self.assertEqual(mock_create_connection.call_count, 1)
+        self.assertEqual(self.pool.metrics.checked_out, 0)
+
+    @patch('handbook.database_connection.create_connection')
+    def test_getconn_timeout(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        mock_create_connection.side_effect = lambda *args: connection_mock()
+        self.pool.getconn()
+        self.pool.getconn()
+
+        # WHEN
+        with self.assertRaises(PoolException):
+            self.pool.getconn()
+
+        # THEN
+        self.assertEqual(self.pool.metrics.checked_out, 2)
+        self.assertEqual(self.pool.metrics.waits, 1)
+        self.assertGreater(self.pool.metrics.wait_time, 0)
+
+    @patch('handbook.database_connection.create_connection')
+    def test_getconn_waits_for_returned_connection(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        self.pool.timeout = 5
+        mock_create_connection.side_effect = lambda *args: connection_mock()
+        first = self.pool.getconn()
+        self.pool.getconn()
+        timer = threading.Timer(0.05, self.pool.putconn, args=(first,))
+
+        # WHEN
+        timer.start()
+        connection = self.pool.getconn()
+
+        # THEN
+        self.assertIs(connection, first)
+        self.assertEqual(self.pool.metrics.waits, 1)
+
+    @patch('handbook.database_connection.create_connection')
+    def test_expired_connection_recycled(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        self.pool.max_lifetime = 0
+        mock_create_connection.side_effect = lambda *args: connection_mock()
+        first = self.pool.getconn()
+
+        # WHEN
+        self.pool.putconn(first)
+        second = self.pool.getconn()
+
+        # THEN
+        self.assertIsNot(first, second)
+        first.close.assert_called_once()
+        self.assertEqual(self.pool.metrics.recycled, 1)
+
+    @patch('handbook.database_connection.create_connection')
+    def test_broken_connection_discarded(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        mock_create_connection.side_effect = lambda *args: connection_mock()
+        first = self.pool.getconn()
+        self.pool.putconn(first)
+        first.closed = 2
+
+        # WHEN
+        second = self.pool.getconn()
+
+        # THEN
+        self.assertIsNot(first, second)
+        self.assertEqual(mock_create_connection.call_count, 2)
+
+    @patch('handbook.database_connection.create_connection')
+    def test_health_check_and_rollback_do_not_hold_lock(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        self.pool.health_check_interval = 0
+        connection = connection_mock()
+        connection.get_transaction_status.return_value = None
+        connection.cursor = MagicMock()
+        mock_create_connection.return_value = connection
+        lock_free = []
+
+        def acquire_lock() -> None:
+            acquired = self.pool._condition.acquire(timeout=1)
+            lock_free.append(acquired)
+            if acquired:
+                self.pool._condition.release()
+
+        def check_lock(*args) -> None:
+            thread = threading.Thread(target=acquire_lock)
+            thread.start()
+            thread.join()
+
+        connection.rollback.side_effect = check_lock
+        connection.cursor.return_value.__enter__.return_value.execute.side_effect = check_lock
+
+        # WHEN
+        self.pool.putconn(self.pool.getconn())
+        self.pool.getconn()
+
+        # THEN
+        self.assertGreaterEqual(len(lock_free), 3)
+        self.assertTrue(all(lock_free))
+
+    @patch('handbook.database_connection.create_connection')
+    def test_connection_failure_raise_exception(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        mock_create_connection.return_value = None
+
+        # WHEN
+        with self.assertRaises(PoolException):
+            self.pool.getconn()
+
+        # THEN
+        self.assertEqual(self.pool.metrics.checked_out, 0)
+
+
+class TestChangeListener(unittest.TestCase):
+    def test_notifications_are_merged(self) -> None:
+        # WHEN
+        customer_ids = ChangeListener._changed_ids(["000000001,000000002", "000000002"])
+
+        # THEN
+        self.assertEqual(customer_ids, ["000000001", "000000002"])
+        self.assertIsNone(ChangeListener._changed_ids(["000000001", "*"]))
+
+    @patch('handbook.database_connection.select.select')
+    @patch('handbook.database_connection.create_connection')
+    def test_notifications_are_passed_to_callbacks(self, mock_create_connection: Mock, mock_select: Mock) -> None:
+        # GIVEN
+        listener = ChangeListener("handbook", "handbook_user", "111111", "localhost", "5432", poll_interval=0.01)
+        connection = MagicMock()
+        connection.notifies = [Mock(payload="000000001")]
+        mock_create_connection.return_value = connection
+        mock_select.return_value = ([connection], [], [])
+        received = []
+
+        def callback(customer_ids: list) -> None:
+            received.append(customer_ids)
+            listener._stopping.set()
+
+        listener.subscribe(callback)
+
+        # WHEN
+        listener.start()
+        listener._thread.join(timeout=1)
+
+        # THEN
+        self.assertEqual(received, [["000000001"]])
+        connection.cursor.return_value.__enter__.return_value.execute.assert_called_once_with(
+            "LISTEN customers_changed;")
+        connection.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
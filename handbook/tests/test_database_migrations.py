@@ -0,0 +1,76 @@
+import os.path
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from handbook.database_migrations import MigrationException, apply_migrations, load_migrations
+
+
+class TestDatabaseMigrations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.write_migration("0002_second.sql", "CREATE INDEX second ON customers (email);")
+        self.write_migration("0001_first.sql", "CREATE INDEX first ON customers (phone);")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def write_migration(self, file_name: str, sql: str) -> None:
+        with open(os.path.join(self.directory, file_name), "w", encoding="utf-8") as file:
+            file.write(sql)
+
+    def test_project_migrations_are_ordered(self) -> None:
+        # WHEN
+        migrations = load_migrations()
+
+        # THEN
+        versions = [version for version, _, _ in migrations]
+        self.assertEqual(versions, sorted(versions))
+        self.assertEqual(versions[0], 1)
+
+    def test_project_migrations_create_change_log(self) -> None:
+        # WHEN
+        sql = "\n".join(sql for _, _, sql in load_migrations())
+
+        # THEN
+        for name in ("customer_changes", "log_customer_changes", "customers_inserted", "customers_updated",
+                     "customers_deleted", "customer_change_retention"):
+            self.assertIn(name, sql)
+
+    def test_repeated_version(self) -> None:
+        # GIVEN
+        self.write_migration("2_again.sql", "SELECT 1;")
+
+        # THEN
+        with self.assertRaises(MigrationException):
+            load_migrations(self.directory)
+
+    def test_only_new_migrations_are_applied(self) -> None:
+        # GIVEN
+        connection = MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [(1,)]
+
+        # WHEN
+        applied_versions = apply_migrations(connection, self.directory)
+
+        # THEN
+        self.assertEqual(applied_versions, [2])
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertIn("CREATE INDEX second ON customers (email);", statements)
+        self.assertNotIn("CREATE INDEX first ON customers (phone);", statements)
+        connection.commit.assert_called_once()
+
+    def test_failed_migration_is_rolled_back(self) -> None:
+        # GIVEN
+        connection = MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+        cursor.execute.side_effect = lambda sql, *args: None if "second" not in sql else 1 / 0
+
+        # THEN
+        with self.assertRaises(ZeroDivisionError):
+            apply_migrations(connection, self.directory)
+        connection.rollback.assert_called_once()
+        connection.commit.assert_not_called()
@@ -0,0 +1,220 @@
+import unittest
+from unittest.mock import patch, Mock, MagicMock
+
+from handbook.customer_service import DataBaseStorage, Customer, CustomerException, Predicate
+
+
+class TestDataBaseStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.customer = Customer("000000001", "Ivanov Vasyl", "developer", "FGH-2000", "vasyl@mail.ru",
+                                 "79278763423")
+
+    def test_find_customer_uses_pool(self) -> None:
+        # GIVEN
+        pool = MagicMock()
+        connection = MagicMock()
+        pool.connection.return_value.__enter__.return_value = connection
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = ("000000001", "Ivanov Vasyl", "developer", "FGH-2000", "vasyl@mail.ru",
+                                        "79278763423")
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432", pool)
+
+        # WHEN
+        customer = storage.find_customer("customer_id", "000000001")
+
+        # THEN
+        pool.connection.assert_called_once()
+        self.assertEqual(customer, self.customer)
+
+    @patch('handbook.customer_service.create_connection')
+    def test_insert_customer_closes_connection(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        connection = MagicMock()
+        mock_create_connection.return_value = connection
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432")
+
+        # WHEN
+        storage.insert_customer(self.customer)
+
+        # THEN
+        connection.commit.assert_called_once()
+        connection.close.assert_called_once()
+
+
+    @patch('handbook.customer_service.create_connection')
+    def test_list_page_after_cursor(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        connection = MagicMock()
+        mock_create_connection.return_value = connection
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432")
+
+        # WHEN
+        storage.list_page(["full_name"], 10, after=("Ivanov Vasyl", "000000001"))
+
+        # THEN
+        query, query_params = cursor.execute.call_args.args
+        self.assertIn("(full_name, customer_id) > (%s, %s)", query)
+        self.assertEqual(query_params, ["Ivanov Vasyl", "000000001", 10, 0])
+
+    @patch('handbook.customer_service.create_connection')
+    def test_iter_customers(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        connection = MagicMock()
+        mock_create_connection.return_value = connection
+        cursor = connection.cursor.return_value.__enter__.return_value
+        row = ("000000001", "Ivanov Vasyl", "developer", "FGH-2000", "vasyl@mail.ru", "79278763423")
+        cursor.__iter__.return_value = iter([row])
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432", itersize=500)
+
+        # WHEN
+        customers = list(storage.iter_customers([]))
+
+        # THEN
+        self.assertEqual(customers, [self.customer])
+        self.assertIsNotNone(connection.cursor.call_args.kwargs["name"])
+        self.assertEqual(cursor.itersize, 500)
+        connection.close.assert_called_once()
+
+
+    @patch('handbook.customer_service.create_connection')
+    def test_import_customers(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        connection = MagicMock()
+        mock_create_connection.return_value = connection
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.rowcount = 1
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432")
+
+        repeated_customer = Customer("000000001", "Brown Ivan", "manager", "FGH", "ivan@mail.ru", "79278763424")
+
+        # WHEN
+        inserted = storage.import_customers([self.customer, repeated_customer])
+
+        # THEN
+        self.assertEqual(inserted, 1)
+        copy_query, buffer = cursor.copy_expert.call_args.args
+        self.assertIn("COPY customers_import FROM STDIN", copy_query)
+        self.assertEqual(buffer.getvalue().strip(),
+                         "000000001,Ivanov Vasyl,developer,FGH-2000,vasyl@mail.ru,79278763423")
+        connection.commit.assert_called_once()
+
+
+    @patch('handbook.customer_service.execute_values')
+    @patch('handbook.customer_service.create_connection')
+    def test_insert_many_existing_customer(self, mock_create_connection: Mock, mock_execute_values: Mock) -> None:
+        # GIVEN
+        connection = MagicMock()
+        mock_create_connection.return_value = connection
+        mock_execute_values.return_value = [("000000002",)]
+        new_customer = Customer("000000002", "Ivanov Peter", "manager", "FGH", "peter@mail.ru", "79279826478")
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432")
+
+        # WHEN
+        existing_ids = storage.insert_many([self.customer, new_customer])
+
+        # THEN
+        self.assertEqual(existing_ids, ["000000001"])
+        self.assertEqual(len(mock_execute_values.call_args.args[2]), 2)
+        connection.rollback.assert_called_once()
+        connection.commit.assert_not_called()
+
+
+    @patch('handbook.customer_service.create_connection')
+    def test_update_customer_by_id(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        connection = MagicMock()
+        mock_create_connection.return_value = connection
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = None
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432")
+
+        # WHEN
+        updated = storage.update_customer_by_id({"customer_id": "000000001", "phone": "79278763447"})
+
+        # THEN
+        self.assertFalse(updated)
+        query, values = cursor.execute.call_args.args
+        self.assertIn("RETURNING customer_id", query)
+        self.assertEqual(values, ["79278763447", "000000001"])
+        self.assertEqual(cursor.execute.call_count, 1)
+
+
+    def test_changes_since_returns_changed_and_removed_customers(self) -> None:
+        # GIVEN
+        pool = MagicMock()
+        connection = MagicMock()
+        pool.connection.return_value.__enter__.return_value = connection
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (120,)
+        cursor.fetchall.side_effect = [[("000000001",), ("000000002",)],
+                                       [("000000001", "Ivanov Vasyl", "developer", "FGH-2000", "vasyl@mail.ru",
+                                         "79278763423")]]
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432", pool)
+
+        # WHEN
+        position, customers, removed_ids = storage.changes_since(100)
+
+        # THEN
+        self.assertEqual(position, 120)
+        self.assertEqual(customers, [self.customer])
+        self.assertEqual(removed_ids, ["000000002"])
+
+
+    def test_pooled_connection_prepares_statement_once(self) -> None:
+        # GIVEN
+        pool = MagicMock()
+        connection = MagicMock()
+        pool.connection.return_value.__enter__.return_value = connection
+        pool.prepared_statements.return_value = set()
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = None
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432", pool)
+
+        # WHEN
+        storage.find_customer("email", "o'brien@mail.ru")
+        storage.find_customer("email", "vasyl@mail.ru")
+
+        # THEN
+        statements = [call.args for call in cursor.execute.call_args_list]
+        self.assertEqual(len(statements), 3)
+        self.assertIn("PREPARE find_customer_by_email AS", statements[0][0])
+        self.assertIn("email = $1", statements[0][0])
+        self.assertEqual(statements[1], ("EXECUTE find_customer_by_email (%s);", ["o'brien@mail.ru"]))
+        self.assertEqual(statements[2], ("EXECUTE find_customer_by_email (%s);", ["vasyl@mail.ru"]))
+
+    def test_find_customer_unknown_argument(self) -> None:
+        # GIVEN
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432", MagicMock())
+
+        # THEN
+        with self.assertRaises(CustomerException):
+            storage.find_customer("email = email OR 1", "1")
+
+    @patch('handbook.customer_service.create_connection')
+    def test_find_all_where_clause(self, mock_create_connection: Mock) -> None:
+        # GIVEN
+        connection = MagicMock()
+        mock_create_connection.return_value = connection
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [tuple(getattr(self.customer, name) for name in
+                                              ("customer_id", "full_name", "position", "name_of_the_organization",
+                                               "email", "phone"))]
+        storage = DataBaseStorage("handbook", "handbook_user", "111111", "localhost", "5432")
+
+        # WHEN
+        customers = storage.find_all([Predicate("position", "eq", "developer"),
+                                      Predicate("customer_id", "in", ["000000001", "000000002"]),
+                                      Predicate("email", "prefix", "va_s%")])
+
+        # THEN
+        query, query_params = cursor.execute.call_args.args
+        self.assertIn("WHERE position = %s AND customer_id = ANY(%s) AND email LIKE %s", query)
+        self.assertIn("ORDER BY", query)
+        self.assertEqual(query_params, ["developer", ["000000001", "000000002"], "va\\_s\\%%"])
+        self.assertEqual(customers, [self.customer])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from handbook.command_parser import FindCommand
+from handbook.customer_service import CustomerService, InMemoryStorage
+
+
+class TestFindCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.customer_service = CustomerService(InMemoryStorage())
+        self.customer_service.create_customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru",
+                                              "79278763423")
+        self.customer_service.create_customer("000000002", "Ivanov Petr", "manager", "FGH", "petr@mail.ru",
+                                              "79278763424")
+        self.customer_service.create_customer("000000003", "Brown Ivan", "developer", "ABC", "ivan@mail.ru",
+                                              "79278763425")
+
+    def execute(self, *inputs) -> str:
+        output = io.StringIO()
+        with patch("builtins.input", side_effect=inputs), redirect_stdout(output):
+            FindCommand().execute(self.customer_service)
+        return output.getvalue()
+
+    def test_find_all_interactive(self) -> None:
+        # GIVEN
+        inputs = ["all",
+                  "full_name", "prefix", "Ivanov",
+                  "customer_id", "in", "000000001, 000000002",
+                  "position", "", "developer",
+                  ""]
+
+        # WHEN
+        output = self.execute(*inputs)
+
+        # THEN
+        self.assertIn("000000001", output)
+        self.assertNotIn("000000002", output)
+        self.assertNotIn("000000003", output)
+
+    def test_find_all_interactive_no_data(self) -> None:
+        # GIVEN
+        inputs = ["all", "position", "eq", "director", ""]
+
+        # WHEN
+        output = self.execute(*inputs)
+
+        # THEN
+        self.assertIn("No data", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
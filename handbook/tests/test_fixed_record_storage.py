@@ -0,0 +1,152 @@
+import os.path
+import unittest
+from unittest.mock import patch
+
+from handbook.customer_service import Customer, CustomerException, FixedRecordStorage, Predicate
+
+
+class TestFixedRecordStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path_file = "test_handbook.bin"
+        self.storage = FixedRecordStorage(self.path_file, initial_capacity=2)
+        self.customers = [
+            Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423"),
+            Customer("000000002", "Иванов Иван", "менеджер", "ООО Рога", "ivan@mail.ru", "79278763424"),
+            Customer("000000003", "Adams Peter", "developer", "ABC", "peter@mail.ru", "79278763425"),
+        ]
+        for customer in self.customers:
+            self.storage.insert_customer(customer)
+
+    def tearDown(self) -> None:
+        self.storage.close()
+        for file_name in (self.path_file, self.storage.index_file_name):
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    def test_find_customer(self) -> None:
+        # WHEN
+        by_id = self.storage.find_customer("customer_id", "000000002")
+        by_email = self.storage.find_customer("email", "peter@mail.ru")
+
+        # THEN
+        self.assertEqual(by_id.full_name, "Иванов Иван")
+        self.assertEqual(by_email.customer_id, "000000003")
+        self.assertIsNone(self.storage.find_customer("customer_id", "000000009"))
+
+    def test_find_all(self) -> None:
+        # WHEN
+        by_ids = self.storage.find_all([Predicate("customer_id", "in", ["000000003", "000000001", "0000000001"]),
+                                        Predicate("position", "eq", "developer")])
+        by_prefix = self.storage.find_all([Predicate("email", "prefix", "i")])
+
+        # THEN
+        self.assertEqual(by_ids, [self.customers[0], self.customers[2]])
+        self.assertEqual(by_prefix, [self.customers[1]])
+
+    def test_update_customer(self) -> None:
+        # WHEN
+        self.storage.update_customer(self.customers[0], {"customer_id": "000000001", "position": "manager"})
+
+        # THEN
+        customer = self.storage.find_customer("customer_id", "000000001")
+        self.assertEqual(customer.position, "manager")
+        self.assertEqual(customer.email, "vasyl@mail.ru")
+
+    def test_delete_customer_reuses_record(self) -> None:
+        # GIVEN
+        record_count = self.storage.record_count
+
+        # WHEN
+        self.storage.delete_customer(self.customers[1])
+        self.storage.insert_customer(Customer("000000004", "Brown Ivan", "manager", "FGH", "brown@mail.ru",
+                                              "79278763426"))
+
+        # THEN
+        self.assertEqual(self.storage.record_count, record_count)
+        self.assertIsNone(self.storage.find_customer("customer_id", "000000002"))
+        self.assertEqual(len(self.storage.list_of_customer([])), 3)
+
+    def test_list_of_customer_sorted(self) -> None:
+        # WHEN
+        customers = self.storage.list_of_customer(["full_name"])
+
+        # THEN
+        self.assertEqual([customer.customer_id for customer in customers], ["000000003", "000000001", "000000002"])
+
+    def test_reopen_uses_index(self) -> None:
+        # GIVEN
+        self.storage.close()
+
+        # WHEN
+        self.storage = FixedRecordStorage(self.path_file)
+
+        # THEN
+        self.assertEqual(self.storage.find_customer("customer_id", "000000003").full_name, "Adams Peter")
+        self.assertEqual(self.storage.live_count, 3)
+
+    def test_reopen_does_not_rebuild_index(self) -> None:
+        # GIVEN
+        self.storage.delete_customer(self.customers[1])
+        self.storage.insert_customer(Customer("000000004", "Brown Ivan", "manager", "FGH", "brown@mail.ru",
+                                              "79278763426"))
+        self.storage.close()
+
+        # WHEN
+        with patch.object(FixedRecordStorage, "_rebuild_index") as mock_rebuild_index:
+            self.storage = FixedRecordStorage(self.path_file)
+
+        # THEN
+        mock_rebuild_index.assert_not_called()
+        self.assertEqual(self.storage.find_customer("customer_id", "000000004").full_name, "Brown Ivan")
+
+    def test_reopen_rebuilds_missing_index(self) -> None:
+        # GIVEN
+        self.storage.close()
+        os.remove(self.storage.index_file_name)
+
+        # WHEN
+        self.storage = FixedRecordStorage(self.path_file)
+
+        # THEN
+        self.assertEqual(self.storage.find_customer("customer_id", "000000001").full_name, "Ivanov Vasyl")
+
+    def test_index_does_not_grow_on_churn(self) -> None:
+        # GIVEN
+        index_capacity = self.storage.index_capacity
+        customer = Customer("000000004", "Brown Ivan", "manager", "FGH", "brown@mail.ru", "79278763426")
+
+        # WHEN
+        for number in range(5000):
+            customer.customer_id = str(100000 + number)
+            self.storage.insert_customer(customer)
+            self.storage.delete_customer(customer)
+
+        # THEN
+        self.assertEqual(self.storage.index_capacity, index_capacity)
+        self.assertEqual(self.storage.live_count, 3)
+        self.assertEqual(self.storage.find_customer("customer_id", "000000003").full_name, "Adams Peter")
+
+    def test_open_not_record_file(self) -> None:
+        # GIVEN
+        self.storage.close()
+        with open(self.path_file, "r+b") as file:
+            file.write(b"NOTAFILE")
+
+        # WHEN
+        with self.assertRaises(CustomerException):
+            FixedRecordStorage(self.path_file)
+
+    def test_closed_storage_is_not_kept_for_exit(self) -> None:
+        # WHEN
+        self.storage.close()
+
+        # THEN
+        self.assertNotIn(self.storage, FixedRecordStorage._open_storages)
+
+    def test_value_too_long(self) -> None:
+        # GIVEN
+        customer = Customer("000000005", "x" * 241, "developer", "ABC", "long@mail.ru", "79278763427")
+
+        # THEN
+        with self.assertRaises(CustomerException):
+            self.storage.insert_customer(customer)
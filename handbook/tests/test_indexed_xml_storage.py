@@ -0,0 +1,75 @@
+import os.path
+import unittest
+
+from handbook.customer_service import Customer, IndexedXMLStorage, Predicate, XMLStorage
+
+
+class TestIndexedXMLStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path_file = "test_indexed_handbook.xml"
+        self.xml_storage = IndexedXMLStorage(self.path_file, ("email",))
+        self.customers = [
+            Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423"),
+            Customer("000000002", "Иванов Иван", "менеджер", "ООО Рога", "ivan@mail.ru", "79278763424"),
+        ]
+        self.xml_storage.insert_many(self.customers)
+
+    def tearDown(self) -> None:
+        for file_name in (self.path_file, self.xml_storage.index_file_name):
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    def test_find_customer_by_index(self) -> None:
+        # WHEN
+        by_id = self.xml_storage.find_customer("customer_id", "000000002")
+        by_email = self.xml_storage.find_customer("email", "vasyl@mail.ru")
+
+        # THEN
+        self.assertEqual(by_id, self.customers[1])
+        self.assertEqual(by_id.full_name, "Иванов Иван")
+        self.assertEqual(by_email, self.customers[0])
+        self.assertIsNone(self.xml_storage.find_customer("customer_id", "000000003"))
+
+    def test_find_all_by_index(self) -> None:
+        # GIVEN
+        self.xml_storage.insert_customer(Customer("000000003", "Adams Peter", "developer", "ABC", "vasyl@mail.ru",
+                                                  "79278763425"))
+
+        # WHEN
+        customers = self.xml_storage.find_all([Predicate("email", "eq", "vasyl@mail.ru"),
+                                               Predicate("full_name", "prefix", "Adams")])
+        by_ids = self.xml_storage.find_all([Predicate("customer_id", "in", ["000000002", "000000003"])])
+
+        # THEN
+        self.assertEqual([customer.customer_id for customer in customers], ["000000003"])
+        self.assertEqual([customer.customer_id for customer in by_ids], ["000000002", "000000003"])
+        self.assertEqual(len(self.xml_storage.index["email"]["vasyl@mail.ru"]), 2)
+
+    def test_index_is_maintained_on_writes(self) -> None:
+        # WHEN
+        self.xml_storage.delete_customer(self.customers[0])
+        self.xml_storage.update_customer(self.customers[1], {"customer_id": "000000002", "email": "new@mail.ru"})
+
+        # THEN
+        self.assertIsNone(self.xml_storage.find_customer("customer_id", "000000001"))
+        self.assertIsNone(self.xml_storage.find_customer("email", "ivan@mail.ru"))
+        self.assertEqual(self.xml_storage.find_customer("email", "new@mail.ru").customer_id, "000000002")
+
+    def test_index_file_is_reused_on_open(self) -> None:
+        # WHEN
+        xml_storage = IndexedXMLStorage(self.path_file, ("email",))
+
+        # THEN
+        self.assertEqual(xml_storage.index, self.xml_storage.index)
+        self.assertEqual(xml_storage.find_customer("customer_id", "000000001"), self.customers[0])
+
+    def test_index_is_rebuilt_after_outside_change(self) -> None:
+        # GIVEN
+        customer = Customer("000000003", "Adams Peter", "developer", "ABC", "peter@mail.ru", "79278763425")
+        XMLStorage(self.path_file).insert_customer(customer)
+
+        # WHEN
+        found_customer = self.xml_storage.find_customer("customer_id", "000000003")
+
+        # THEN
+        self.assertEqual(found_customer, customer)
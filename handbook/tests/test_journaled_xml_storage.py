@@ -0,0 +1,99 @@
+import os.path
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from handbook.customer_service import Customer, CustomerException, JournaledXMLStorage, XMLStorage
+
+
+class TestJournaledXMLStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path_file = "test_journaled_handbook.xml"
+        self.xml_storage = JournaledXMLStorage(self.path_file, fsync="never")
+        self.customer = Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423")
+
+    def tearDown(self) -> None:
+        self.xml_storage.close()
+        for file_name in (self.path_file, self.xml_storage.journal_file_name):
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    def reopen(self) -> None:
+        self.xml_storage.close()
+        self.xml_storage = JournaledXMLStorage(self.path_file, fsync="never")
+
+    def test_changes_are_appended_to_journal(self) -> None:
+        # WHEN
+        self.xml_storage.insert_customer(self.customer)
+        self.xml_storage.update_customer(self.customer, {"customer_id": "000000001", "position": "manager"})
+
+        # THEN
+        self.assertEqual(self.xml_storage.journal_entries, 2)
+        self.assertIsNone(XMLStorage(self.path_file).find_customer("customer_id", "000000001"))
+
+    def test_journal_is_replayed_on_start(self) -> None:
+        # GIVEN
+        self.xml_storage.insert_customer(self.customer)
+        self.xml_storage.insert_many([Customer("000000002", "Brown Ivan", "manager", "FGH", "ivan@mail.ru",
+                                               "79278763424")])
+        self.xml_storage.update_customer(self.customer, {"customer_id": "000000001", "position": "manager"})
+        self.xml_storage.delete_many(["000000002"])
+
+        # WHEN
+        self.reopen()
+
+        # THEN
+        customers = self.xml_storage.list_of_customer([])
+        self.assertEqual(len(customers), 1)
+        self.assertEqual(customers[0].position, "manager")
+
+    def test_compact_writes_snapshot_and_empties_journal(self) -> None:
+        # GIVEN
+        self.xml_storage.insert_customer(self.customer)
+
+        # WHEN
+        self.xml_storage.compact()
+
+        # THEN
+        self.assertEqual(self.xml_storage.journal_entries, 0)
+        self.assertEqual(os.path.getsize(self.xml_storage.journal_file_name), 0)
+        self.assertIsNotNone(XMLStorage(self.path_file).find_customer("customer_id", "000000001"))
+        self.reopen()
+        self.assertIsNotNone(self.xml_storage.find_customer("customer_id", "000000001"))
+
+    def test_torn_last_entry_is_ignored(self) -> None:
+        # GIVEN
+        self.xml_storage.insert_customer(self.customer)
+        self.xml_storage.close()
+        with open(self.xml_storage.journal_file_name, "ab") as journal:
+            journal.write(b'{"op": "delete", "custo')
+
+        # WHEN
+        self.xml_storage = JournaledXMLStorage(self.path_file, fsync="never")
+        self.xml_storage.delete_customer(self.customer)
+        self.reopen()
+
+        # THEN
+        self.assertEqual(self.xml_storage.journal_entries, 2)
+        self.assertIsNone(self.xml_storage.find_customer("customer_id", "000000001"))
+
+    @patch('handbook.customer_service.os.fsync')
+    def test_interval_fsync_without_later_writes(self, mock_fsync: Mock) -> None:
+        # GIVEN
+        self.xml_storage.close()
+        self.xml_storage = JournaledXMLStorage(self.path_file, fsync="interval", fsync_interval=0.05)
+
+        # WHEN
+        self.xml_storage.insert_customer(self.customer)
+        synced_at_once = mock_fsync.called
+        time.sleep(0.3)
+
+        # THEN
+        self.assertFalse(synced_at_once)
+        mock_fsync.assert_called_once()
+        self.assertFalse(self.xml_storage._unsynced)
+
+    def test_unknown_fsync_policy(self) -> None:
+        # THEN
+        with self.assertRaises(CustomerException):
+            JournaledXMLStorage(self.path_file, fsync="sometimes")
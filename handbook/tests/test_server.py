@@ -0,0 +1,93 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from handbook.command_parser import InsertCommand, FindCommand
+from handbook.customer_service import CustomerService, InMemoryStorage
+from handbook.server import CustomerServer
+
+
+class TestCustomerServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        commands = {'insert': InsertCommand, 'find': FindCommand}
+        self.server = CustomerServer(CustomerService(InMemoryStorage()), commands, max_workers=2)
+        self.serve_task = asyncio.create_task(self.server.serve(host="127.0.0.1", port=0))
+        while not self.server.addresses:
+            await asyncio.sleep(0.01)
+        self.host, self.port = self.server.addresses[0][:2]
+
+    async def asyncTearDown(self) -> None:
+        self.server.shutdown()
+        await asyncio.wait_for(self.serve_task, 5)
+
+    async def send(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: dict) -> dict:
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    async def test_serve_commands(self) -> None:
+        # GIVEN
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        customer = {"customer_id": "000000001", "full_name": "Ivanov Vasyl", "position": "developer",
+                    "name_of_the_organization": "FGH", "email": "vasyl@mail.ru", "phone": "79278763423"}
+
+        # WHEN
+        inserted = await self.send(reader, writer, {"id": 1, "command": "insert", "arguments": customer})
+        found = await self.send(reader, writer, {"id": 2, "command": "find", "arguments": {"email": "vasyl@mail.ru"}})
+        writer.close()
+
+        # THEN
+        self.assertEqual(inserted, {"id": 1, "result": None, "status": "ok"})
+        self.assertEqual(found["result"], customer)
+
+    async def test_serve_concurrent_clients(self) -> None:
+        # GIVEN
+        connections = [await asyncio.open_connection(self.host, self.port) for _ in range(5)]
+
+        # WHEN
+        responses = await asyncio.gather(*(self.send(reader, writer, {"command": "find",
+                                                                      "arguments": {"customer_id": "000000001"}})
+                                           for reader, writer in connections))
+        for _, writer in connections:
+            writer.close()
+
+        # THEN
+        self.assertEqual([response["status"] for response in responses], ["ok"] * 5)
+
+    async def test_shutdown_with_idle_client(self) -> None:
+        # GIVEN
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        await self.send(reader, writer, {"command": "find", "arguments": {"customer_id": "000000001"}})
+
+        wait_closed = asyncio.base_events.Server.wait_closed
+        open_clients = []
+
+        async def record_open_clients(server) -> None:
+            open_clients.append(len(self.server._clients))
+            await wait_closed(server)
+
+        # WHEN
+        with patch.object(asyncio.base_events.Server, "wait_closed", record_open_clients):
+            self.server.shutdown()
+            await asyncio.wait_for(self.serve_task, 5)
+
+        # THEN
+        self.assertEqual(open_clients, [0])
+        self.assertEqual(await reader.read(), b"")
+        writer.close()
+
+    async def test_serve_unknown_command(self) -> None:
+        # GIVEN
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+
+        # WHEN
+        response = await self.send(reader, writer, {"command": "exit"})
+        writer.close()
+
+        # THEN
+        self.assertEqual(response["status"], "error")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os.path
+import sqlite3
+import unittest
+
+from handbook.customer_service import Customer, CustomerException, Predicate, SQLiteStorage
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path_file = "test_handbook.sqlite"
+        self.storage = SQLiteStorage(self.path_file)
+        self.customers = [
+            Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423"),
+            Customer("000000002", "Brown Ivan", "manager", "FGH", "ivan@mail.ru", "79278763424"),
+            Customer("000000003", "Adams Peter", "developer", "ABC", "peter@mail.ru", "79278763425"),
+        ]
+        self.storage.import_customers(self.customers)
+
+    def tearDown(self) -> None:
+        self.storage.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path_file + suffix):
+                os.remove(self.path_file + suffix)
+
+    def test_wal_mode(self) -> None:
+        # WHEN
+        journal_mode = self.storage.connection.execute("PRAGMA journal_mode;").fetchone()[0]
+
+        # THEN
+        self.assertEqual(journal_mode, "wal")
+
+    def test_find_customer(self) -> None:
+        # WHEN
+        customer = self.storage.find_customer("email", "ivan@mail.ru")
+
+        # THEN
+        self.assertEqual(customer, self.customers[1])
+        self.assertIsNone(self.storage.find_customer("customer_id", "000000009"))
+        with self.assertRaises(CustomerException):
+            self.storage.find_customer("email = email OR 1", "1")
+
+    def test_find_all(self) -> None:
+        # WHEN
+        developers = self.storage.find_all([Predicate("position", "eq", "developer"),
+                                            Predicate("email", "prefix", "pe")])
+        by_ids = self.storage.find_all([Predicate("customer_id", "in", ["000000003", "000000001"])])
+
+        # THEN
+        self.assertEqual(developers, [self.customers[2]])
+        self.assertEqual(by_ids, [self.customers[0], self.customers[2]])
+        self.assertEqual(self.storage.find_all([]), self.customers)
+
+    def test_update_and_delete_by_id(self) -> None:
+        # WHEN
+        updated = self.storage.update_customer_by_id({"customer_id": "000000002", "position": "developer"})
+        deleted = self.storage.delete_customer_by_id("000000001")
+
+        # THEN
+        self.assertTrue(updated)
+        self.assertTrue(deleted)
+        self.assertFalse(self.storage.delete_customer_by_id("000000001"))
+        self.assertEqual(self.storage.find_customer("customer_id", "000000002").position, "developer")
+
+    def test_insert_new_customer(self) -> None:
+        # THEN
+        self.assertFalse(self.storage.insert_new_customer(self.customers[0]))
+        self.assertTrue(self.storage.insert_new_customer(
+            Customer("000000004", "Green Alexandr", "manager", "FGH", "alexandr@mail.ru", "79056987458")))
+
+    def test_batch_writes_are_all_or_nothing(self) -> None:
+        # GIVEN
+        new_customer = Customer("000000004", "Green Alexandr", "manager", "FGH", "alexandr@mail.ru", "79056987458")
+
+        # WHEN
+        existing_ids = self.storage.insert_many([new_customer, self.customers[0]])
+        missing_ids = self.storage.update_many([{"customer_id": "000000001", "phone": "79000000000"},
+                                                {"customer_id": "000000009", "phone": "79000000000"}])
+        deleted_missing_ids = self.storage.delete_many(["000000002", "000000009"])
+
+        # THEN
+        self.assertEqual(existing_ids, ["000000001"])
+        self.assertEqual(missing_ids, ["000000009"])
+        self.assertEqual(deleted_missing_ids, ["000000009"])
+        self.assertEqual(self.storage.list_of_customer([]), self.customers)
+        self.assertEqual(self.storage.find_customer("customer_id", "000000001").phone, "79278763423")
+
+    def test_failed_batch_write_is_rolled_back(self) -> None:
+        # GIVEN
+        self.storage.connection.execute("""
+        CREATE TRIGGER reject_phone BEFORE UPDATE ON customers WHEN NEW.phone = '0'
+        BEGIN SELECT RAISE(ABORT, 'rejected'); END;
+        """)
+
+        # WHEN
+        with self.assertRaises(sqlite3.Error):
+            self.storage.update_many([{"customer_id": "000000001", "phone": "79278763447"},
+                                      {"customer_id": "000000002", "phone": "0"}])
+        self.storage.insert_customer(Customer("000000004", "Brown Ivan", "manager", "FGH", "brown@mail.ru",
+                                              "79278763426"))
+
+        # THEN
+        self.assertFalse(self.storage.connection.in_transaction)
+        self.assertEqual(self.storage.find_customer("customer_id", "000000001").phone, "79278763423")
+
+    def test_list_page(self) -> None:
+        # WHEN
+        first_page = self.storage.list_page(["position"], 2)
+        second_page = self.storage.list_page(["position"], 2, after=("developer", "000000003"))
+
+        # THEN
+        self.assertEqual(first_page, [self.customers[0], self.customers[2]])
+        self.assertEqual(second_page, [self.customers[1]])
+
+    def test_reopen_keeps_customers(self) -> None:
+        # GIVEN
+        self.storage.close()
+
+        # WHEN
+        self.storage = SQLiteStorage(self.path_file)
+
+        # THEN
+        self.assertEqual(list(self.storage.iter_customers(["full_name"])),
+                         [self.customers[2], self.customers[1], self.customers[0]])
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import MagicMock
+
+from handbook.customer_service import Customer, TieredStorage
+
+
+class TestTieredStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.customers = [
+            Customer("000000001", "Ivanov Vasyl", "developer", "FGH", "vasyl@mail.ru", "79278763423"),
+            Customer("000000002", "Brown Ivan", "manager", "FGH", "ivan@mail.ru", "79278763424"),
+        ]
+        self.database_storage = MagicMock()
+        self.database_storage.change_retention.return_value = 86400.0
+        self.database_storage.snapshot.return_value.__enter__.return_value = (100, iter(self.customers))
+        self.tiered_storage = TieredStorage(self.database_storage, refresh_interval=None)
+
+    def test_reads_are_served_from_memory(self) -> None:
+        # WHEN
+        customer = self.tiered_storage.find_customer("email", "ivan@mail.ru")
+        customers = self.tiered_storage.list_of_customer(["full_name"])
+
+        # THEN
+        self.assertEqual(customer, self.customers[1])
+        self.assertEqual(customers, [self.customers[1], self.customers[0]])
+        self.database_storage.find_customer.assert_not_called()
+        self.database_storage.list_of_customer.assert_not_called()
+
+    def test_writes_go_through_to_database(self) -> None:
+        # GIVEN
+        self.database_storage.update_customer_by_id.return_value = True
+        self.database_storage.delete_customer_by_id.return_value = False
+
+        # WHEN
+        self.tiered_storage.update_customer_by_id({"customer_id": "000000001", "position": "manager"})
+        self.tiered_storage.delete_customer_by_id("000000002")
+
+        # THEN
+        self.database_storage.update_customer_by_id.assert_called_once()
+        self.assertEqual(self.tiered_storage.find_customer("customer_id", "000000001").position, "manager")
+        self.assertIsNotNone(self.tiered_storage.find_customer("customer_id", "000000002"))
+
+    def test_refresh_applies_changes(self) -> None:
+        # GIVEN
+        changed_customer = Customer("000000001", "Ivanov Vasyl", "manager", "ABC", "vasyl@mail.ru", "79278763423")
+        self.database_storage.changes_since.return_value = (105, [changed_customer], ["000000002"])
+
+        # WHEN
+        self.tiered_storage.refresh()
+
+        # THEN
+        self.database_storage.changes_since.assert_called_once_with(100)
+        self.assertEqual(self.tiered_storage.find_customer("name_of_the_organization", "ABC"), changed_customer)
+        self.assertIsNone(self.tiered_storage.find_customer("customer_id", "000000002"))
+        self.tiered_storage.refresh()
+        self.database_storage.changes_since.assert_called_with(105)
+
+    def test_refresh_after_retention_reloads_all_customers(self) -> None:
+        # GIVEN
+        self.tiered_storage.change_retention = 0
+        self.database_storage.snapshot.return_value.__enter__.return_value = (200, iter(self.customers[:1]))
+
+        # WHEN
+        self.tiered_storage.refresh()
+
+        # THEN
+        self.database_storage.changes_since.assert_not_called()
+        self.assertEqual(self.tiered_storage.list_of_customer([]), self.customers[:1])
@@ -82,5 +82,75 @@ class TestXMLStorage(unittest.TestCase):
         self.assertGreaterEqual(len(customers), 1)
 
 
+    def test_list_page(self) -> None:
+        # GIVEN
+        for number, full_name in enumerate(["Ivanov Vasyl", "Brown Ivan", "Adams Peter"], 1):
+            self.xml_storage.insert_customer(Customer(f"00000000{number}", full_name, "developer", "FGH",
+                                                      "vasyl@mail.ru", "79278763423"))
+
+        # WHEN
+        customers = self.xml_storage.list_page(["full_name"], 2, after=("Adams Peter", "000000003"))
+
+        # THEN
+        self.assertEqual([customer.customer_id for customer in customers], ["000000002", "000000001"])
+
+    def test_iter_customers(self) -> None:
+        # GIVEN
+        arguments = "000000004,Green Alexandr,manager,FGH,alexandr@mail.ru,79056987458".split(",")
+        self.xml_storage.insert_customer(Customer(*arguments))
+
+        # WHEN
+        customers = list(self.xml_storage.iter_customers([]))
+
+        # THEN
+        self.assertEqual(customers, [Customer(*arguments)])
+
+
+    def test_find_customer_stops_at_first_match(self) -> None:
+        # GIVEN
+        arguments = "000000005,Green Alexandr,manager,FGH,alexandr@mail.ru,79056987458".split(",")
+        self.xml_storage.insert_customer(Customer(*arguments))
+        with open(self.path_file, "rb") as file:
+            content = file.read()
+        with open(self.path_file, "wb") as file:
+            file.write(content.replace(b"</data>", b"<customer><customer_id>"))
+
+        # WHEN
+        customer = self.xml_storage.find_customer("email", "alexandr@mail.ru")
+
+        # THEN
+        self.assertEqual(customer, Customer(*arguments))
+
+    def test_import_customers(self) -> None:
+        # GIVEN
+        arguments = "000000004,Green Alexandr,manager,FGH,alexandr@mail.ru,79056987458".split(",")
+        self.xml_storage.insert_customer(Customer(*arguments))
+        customers = [Customer(*arguments),
+                     Customer(*"000000005,Green Ivan,manager,FGH,ivan@mail.ru,79056987459".split(","))]
+
+        # WHEN
+        inserted = self.xml_storage.import_customers(customers)
+
+        # THEN
+        self.assertEqual(inserted, 1)
+        self.assertEqual(len(self.xml_storage.list_of_customer([])), 2)
+
+
+    def test_insert_update_delete_many(self) -> None:
+        # GIVEN
+        customers = [Customer(*"000000006,Green Ivan,manager,FGH,ivan@mail.ru,79056987459".split(",")),
+                     Customer(*"000000007,Green Oleg,manager,FGH,oleg@mail.ru,79056987460".split(","))]
+
+        # WHEN
+        self.xml_storage.insert_many(customers)
+        self.xml_storage.update_many([{"customer_id": "000000006", "position": "director"}])
+        missing_ids = self.xml_storage.delete_many(["000000007", "000000008"])
+
+        # THEN
+        self.assertEqual(missing_ids, ["000000008"])
+        self.assertEqual(self.xml_storage.find_customer("customer_id", "000000006").position, "director")
+        self.assertIsNotNone(self.xml_storage.find_customer("customer_id", "000000007"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,15 @@
 import argparse
+import asyncio
+import sys
 from os import environ
 
+from handbook.batch_runner import run_batch
+
 from handbook.command_parser import ExitCommand, HelpCommand, InsertCommand, FindCommand, UpdateCommand, \
-    DeleteCommand, ListCommand, CommandException
-from handbook.customer_service import CustomerException, CustomerService, StorageFactory
+    DeleteCommand, ListCommand, ImportCommand, CommandException
+from handbook.customer_service import CachingStorage, CustomerException, CustomerService, StorageFactory
+from handbook.database_connection import ChangeListener
+from handbook.server import CustomerServer
 from handbook.validator import ValidateException
 
 EXPECTED_COMMANDS = {
@@ -14,22 +20,91 @@ EXPECTED_COMMANDS = {
     'update': UpdateCommand,
     'delete': DeleteCommand,
     'list': ListCommand,
+    'import': ImportCommand,
 }
 
 
 def main():
     arg_parser = argparse.ArgumentParser(description='The program is designed to store, view and edit customer data')
     arg_parser.add_argument('--path', type=str, default=environ.get('path'), help='XML file path')
+    arg_parser.add_argument('--xml-flush-interval', type=float, default=environ.get('xml_flush_interval'),
+                            help='keep XML data in memory and write changes every given number of seconds')
+    arg_parser.add_argument('--xml-index', type=str, nargs='?', const='customer_id', default=environ.get('xml_index'),
+                            help='keep an index of customer IDs and the given comma-separated arguments '
+                                 'next to the XML file')
+    arg_parser.add_argument('--xml-journal', action='store_true',
+                            help='append XML changes to a journal file and rewrite the XML file on compaction')
+    arg_parser.add_argument('--xml-fsync', type=str, choices=('always', 'interval', 'never'),
+                            default=environ.get('xml_fsync', 'always'),
+                            help='when journal writes are synced to disk')
+    arg_parser.add_argument('--xml-compact-after', type=int, default=environ.get('xml_compact_after', 10000),
+                            help='number of journal entries after which the XML file is rewritten')
+    arg_parser.add_argument('--columnar', action='store_true',
+                            help='keep customers in internal memory as attribute columns')
+    arg_parser.add_argument('--sqlite', type=str, default=environ.get('sqlite'), help='SQLite database file path')
+    arg_parser.add_argument('--binary-path', type=str, default=environ.get('binary_path'),
+                            help='fixed-width record file path')
     arg_parser.add_argument('--db', type=str, default=environ.get('db'), help='database name')
     arg_parser.add_argument('--user', type=str, default=environ.get('user'), help='user name')
     arg_parser.add_argument('--password', type=str, default=environ.get('password'), help='password user')
     arg_parser.add_argument('--host', type=str, default=environ.get('host'), help='host')
     arg_parser.add_argument('--port', type=str, default=environ.get('port'), help='port')
+    arg_parser.add_argument('--db-itersize', type=int, default=environ.get('db_itersize', 2000),
+                            help='number of rows fetched at a time when streaming customers from the database')
+    arg_parser.add_argument('--db-hot-tier', action='store_true',
+                            help='keep a copy of the database in memory for reads and write through to the database')
+    arg_parser.add_argument('--db-hot-tier-refresh', type=float, default=environ.get('db_hot_tier_refresh', 5.0),
+                            help='seconds after which the in-memory copy is refreshed with changed customers')
+    arg_parser.add_argument('--db-listen', action='store_true',
+                            help='refresh cached customers as soon as the database notifies about changes')
+    arg_parser.add_argument('--pool-size', type=int, default=environ.get('pool_size'),
+                            help='maximum number of pooled database connections')
+    arg_parser.add_argument('--pool-max-lifetime', type=float, default=environ.get('pool_max_lifetime', 3600.0),
+                            help='seconds after which a pooled connection is recycled')
+    arg_parser.add_argument('--cache-size', type=int, default=environ.get('cache_size'),
+                            help='cache up to the given number of found customers in memory')
+    arg_parser.add_argument('--cache-ttl', type=float, default=environ.get('cache_ttl'),
+                            help='seconds after which a cached customer is searched for again')
+    arg_parser.add_argument('--import', dest='import_file', type=str,
+                            help='insert customers from a CSV or JSON Lines file and exit')
+    arg_parser.add_argument('--batch', type=str,
+                            help="execute JSON Lines commands from a file ('-' for stdin) without prompts and exit")
+    arg_parser.add_argument('--serve', type=str, default=environ.get('serve'),
+                            help="serve batch mode commands on 'HOST:PORT' or 'unix:PATH' instead of the console")
+    arg_parser.add_argument('--server-workers', type=int, default=environ.get('server_workers', 8),
+                            help='number of threads executing storage calls in server mode')
+    arg_parser.add_argument('--server-max-requests', type=int, default=environ.get('server_max_requests', 64),
+                            help='maximum number of commands executed at the same time in server mode')
     args = arg_parser.parse_args()
 
     storage = StorageFactory.get_storage(args)
+    if args.cache_size is not None:
+        storage = CachingStorage(storage, args.cache_size, args.cache_ttl)
+    if args.db_listen and args.db is not None:
+        listener = ChangeListener(args.db, args.user, args.password, args.host, args.port)
+        listener.subscribe(storage.on_change)
+        listener.start()
     customer_service = CustomerService(storage)
 
+    if args.import_file is not None:
+        try:
+            ImportCommand(args.import_file).execute(customer_service)
+        except (ValidateException, CustomerException, OSError) as e:
+            print("ERROR:", e)
+        return
+
+    if args.batch is not None:
+        if args.batch == '-':
+            failed = run_batch(sys.stdin, sys.stdout, customer_service, EXPECTED_COMMANDS)
+        else:
+            with open(args.batch, encoding='utf-8') as batch_file:
+                failed = run_batch(batch_file, sys.stdout, customer_service, EXPECTED_COMMANDS)
+        sys.exit(1 if failed else 0)
+
+    if args.serve is not None:
+        serve(args, storage.thread_safe, customer_service)
+        return
+
     while True:
         input_command = input("Please enter the command:").split(maxsplit=1)
 
@@ -52,5 +127,22 @@ def main():
             print(e)
 
 
+def serve(args: argparse.Namespace, thread_safe: bool, customer_service: CustomerService) -> None:
+    """
+    Runs the server until SIGINT or SIGTERM, the 'exit' and 'help' commands are not served,
+    neither is 'import' so that clients can not make the server read files by path
+    """
+    commands = {name: command for name, command in EXPECTED_COMMANDS.items()
+                if name not in ('exit', 'help', 'import')}
+    server = CustomerServer(customer_service, commands, args.server_workers, args.server_max_requests, thread_safe)
+    if args.serve.startswith('unix:'):
+        address = dict(unix_path=args.serve[len('unix:'):])
+    else:
+        host, _, port = args.serve.rpartition(':')
+        address = dict(host=host or None, port=int(port))
+    print(f"Serving on {args.serve}")
+    asyncio.run(server.serve(**address))
+
+
 if __name__ == '__main__':
     main()